@@ -1,18 +1,50 @@
+import atexit
 import logging
+import math
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List
+from functools import partial
+from typing import List, Dict, Set
 
-import multitasking
+from requests import Timeout
 
-from constants import DEFAULT_CURRENCY
+from api.engine import FetchCycle
+from api.exchange_rates import ExchangeRates
+from api.provider import DataProvider, default_provider
+from api.scheduler import UpdateScheduler, SYMBOL_FAILURES
+from api.stream import QuoteStream, SSEQuoteStream
+from constants import DEFAULT_CURRENCY, SNAPSHOT_FILE, PREFETCH_LEAD, STARTUP_TIMEOUT, \
+    DEFAULT_FETCH_CONCURRENCY, SNAPSHOT_SAVE_INTERVAL
 from matrix.matrix_config import MatrixConfig
 from data.crypto import Crypto
 from data.forex import Forex
 from data.status import Status
 from data.stock import Stock
 from data.ticker import Ticker
-from util.utils import fetch_exchange_rate
+from util.session import connection_summary
+from util.upstream import upstream_summary
+from util.utils import chunks, read_compressed_json, write_compressed_json
+
+SNAPSHOT_VERSION = 3
+
+
+def fetch_quotes(provider: DataProvider, symbols: List[str], batch_size: int) -> Dict[str, dict]:
+    """
+    Fetch price data for multiple symbols, with a single request per chunk of symbols.
+    :param provider: Provider to fetch from
+    :param symbols: Symbols to fetch
+    :param batch_size: Maximum number of symbols per request
+    :return: quotes: (dict) Price data keyed by symbol. Symbols without data are not included.
+    """
+    quotes = {}
+    for chunk in chunks(symbols, batch_size):
+        try:
+            quotes.update(provider.quotes(chunk))
+        except Timeout:
+            logging.warning(f'Timed out fetching quotes for {", ".join(chunk)}.')
+    return quotes
 
 
 @dataclass
@@ -26,112 +58,432 @@ class Data:
     currency: str = DEFAULT_CURRENCY
     currency_exchange_rate: float = 1
     valid_tickers: int = 0
+    max_concurrency: int = 1
     status: Status = Status.SUCCESS
     last_updated: float = None
+    last_cycle: FetchCycle = None
+    snapshot_saved: float = 0.0
+    snapshot_pending: bool = False  # Whether updates were not saved to the snapshot yet
+    exchange_rates: ExchangeRates = field(init=False, repr=False)
+    executor: ThreadPoolExecutor = field(init=False, repr=False)
+    scheduler: UpdateScheduler = field(init=False)
+    stream: QuoteStream = field(init=False, default=None, repr=False)
+    provider: DataProvider = field(default=None, repr=False)
+    invalid: Set[str] = field(default_factory=set)
+    progress: List[int] = field(default_factory=lambda: [0, 0])
+    page: int = 0
+    started: float = field(init=False)
+    time_to_first_ticker: float = None
+    time_to_first_frame: float = None
+    ready: threading.Event = field(init=False, repr=False)
+    initialized: threading.Event = field(init=False, repr=False)
+    lock: threading.Lock = field(init=False, repr=False)
+    snapshot_lock: threading.Lock = field(init=False, repr=False)
 
     def __post_init__(self):
+        self.started = time.monotonic()
+        self.ready = threading.Event()
+        self.initialized = threading.Event()
+        self.update_clock()
         self.currency = self.config.currency
-        self.currency_exchange_rate = fetch_exchange_rate(self.currency)
         self.valid_tickers = len(self.config.stocks + self.config.cryptos + self.config.forex)
+        self.max_concurrency = max(1, min(self.valid_tickers, DEFAULT_FETCH_CONCURRENCY))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='fetch')
         self.last_updated = time.time()
+        self.scheduler = UpdateScheduler(self.config.update_rate)
+        self.lock = threading.Lock()
+        self.snapshot_lock = threading.Lock()
+        self.provider = self.provider or default_provider()
+        self.exchange_rates = ExchangeRates(provider=self.provider)
 
-        threads = min([self.valid_tickers, multitasking.cpu_count() * 2])
-        multitasking.set_max_threads(threads)
+        if self.load_snapshot():
+            self.set_ready()
+            threading.Thread(target=self.revalidate, name='revalidate', daemon=True).start()
+        else:
+            if not self.exchange_rates.rates:  # First start
+                self.exchange_rates.refresh()
+            self.exchange_rates.refresh_async()
+            self.currency_exchange_rate = self.exchange_rates.rate(self.currency)
+            threading.Thread(target=self.startup, name='startup', daemon=True).start()
+        if self.config.stream_url:
+            self.stream = SSEQuoteStream(self.config.stream_url, self.on_quote)
+            self.stream.start(self.config.stocks + self.config.cryptos + self.config.forex)
+        atexit.register(self.save_pending_snapshot)
 
+    def startup(self):
+        """Initialize tickers on first start, handing each one to the tickers lists as soon as it is ready"""
         self.initialize()
+        self.save_snapshot()
+        self.set_ready()
+        self.initialized.set()
+        self.turn_page()
 
     def initialize(self) -> Status:
         """
-        Initialize Ticker instances, and append those which are valid to tickers list.
+        Initialize Ticker instances, and append those which are valid to tickers list, in the configured order.
+        Tickers are appended as soon as they are initialized, so that they can be displayed while others are not yet.
+        Tickers already available (i.e. restored from a snapshot) are kept as they are, and invalid or quarantined
+        symbols are not initialized again.
+        Tickers not initialized within STARTUP_TIMEOUT are left out, and retried along with the next update.
+        History is only fetched for the tickers of the page displayed and of the next one.
         :return: status: (data.Status) Update status
-        :exception Timeout: If the request timed out
         """
         logging.info('Initializing data...')
+        cycle = FetchCycle(self.max_concurrency, STARTUP_TIMEOUT, executor=self.executor)
+        with self.lock:
+            self.initialize_missing(cycle)
+        logging.info(cycle.summary())
 
-        for stock in self.config.stocks:  # Initialize stocks
-            self.fetch_stock(stock, self.currency, self.currency_exchange_rate)
-        for crypto in self.config.cryptos:  # Initialize cryptos
-            self.fetch_crypto(crypto, self.currency, self.currency_exchange_rate)
-        for forex in self.config.forex:  # Initialize forex
-            self.fetch_forex(forex)
-        # Wait until all tickers are initialized
-        while len(self.stocks + self.cryptos + self.forex) < self.valid_tickers:
-            time.sleep(0.1)
+        self.update_clock()
+        return cycle.status
 
-        self.date = self.get_date()
-        self.time = self.get_time()
-        return Status.SUCCESS
+    def initialize_missing(self, cycle: FetchCycle):
+        """
+        Initialize the missing tickers as part of an update cycle. Called with the lock held.
+        Tickers are only kept once fully initialized. Symbols whose initialization failed (i.e. Timed out) are left
+        missing, to be retried on the next cycle.
+        :param cycle: Update cycle to run the jobs on
+        """
+        def on_result(symbol: str, ticker: Ticker):
+            self.progress[0] += 1
+            if ticker is not None and ticker.status is Status.SUCCESS:
+                tickers[symbol] = ticker
+                self.publish(tickers)
 
-    def update(self) -> Status:
+        tickers = {ticker.symbol: ticker for ticker in self.stocks + self.cryptos + self.forex}
+        missing = set(self.missing())
+        stocks = [symbol for symbol in self.config.stocks if symbol in missing]
+        cryptos = [symbol for symbol in self.config.cryptos if symbol in missing]
+        forex = [symbol for symbol in self.config.forex if symbol in missing]
+        quotes = self.get_quotes(cycle, stocks + cryptos + forex)
+        jobs = {}
+        width = self.config.layout.width
+        active = self.active(self.config.stocks + self.config.cryptos + self.config.forex)
+        for stock in stocks:  # Initialize stocks
+            jobs[stock] = partial(Stock, stock, self.currency, self.currency_exchange_rate,
+                                  price_data=quotes.get(stock), chart_width=width, charted=stock in active,
+                                  provider=self.provider)
+        for crypto in cryptos:  # Initialize cryptos
+            jobs[crypto] = partial(Crypto, crypto, self.currency, self.currency_exchange_rate,
+                                   price_data=quotes.get(crypto), chart_width=width, charted=crypto in active,
+                                   provider=self.provider)
+        for pair in forex:  # Initialize forex. Rates are not converted.
+            jobs[pair] = partial(Forex, pair, price_data=quotes.get(pair), chart_width=width, charted=pair in active,
+                                 provider=self.provider)
+        self.progress[:] = [0, len(jobs)]
+        initialized = cycle.run(jobs, on_result)
+        now = time.time()
+        for symbol in jobs:
+            ticker, result = initialized.get(symbol), cycle.results.get(symbol)
+            if ticker is not None and not ticker.valid:
+                logging.warning(f'{symbol} may not be valid.')
+                self.invalid.add(symbol)
+            elif ticker is not None and ticker.status is Status.SUCCESS:
+                tickers[symbol] = ticker
+                self.scheduler.recover(symbol)
+            elif result and result.status in SYMBOL_FAILURES:
+                self.scheduler.fail(symbol, now)
+
+        self.publish(tickers)
+        self.valid_tickers = len(self.stocks + self.cryptos + self.forex)
+        self.last_cycle = cycle
+
+    def publish(self, tickers: Dict[str, Ticker]):
         """
-        Update tickers' prices, date, and time.
-        :return: status: (data.Status) Update status
+        Hand the tickers ready to be displayed to the tickers lists, in the configured order
+        :param tickers: Tickers initialized so far, keyed by symbol
+        """
+        self.stocks[:] = self.ready_tickers(tickers, self.config.stocks)
+        self.cryptos[:] = self.ready_tickers(tickers, self.config.cryptos)
+        self.forex[:] = self.ready_tickers(tickers, self.config.forex)
+        if self.stocks or self.cryptos or self.forex:
+            self.set_ready()
+
+    def set_ready(self):
+        """Mark data as ready to be displayed, once any ticker is ready, or initialization is over"""
+        if self.ready.is_set():
+            return
+        if self.stocks or self.cryptos or self.forex:
+            self.time_to_first_ticker = time.monotonic() - self.started
+            logging.info(f'First tickers ready after {self.time_to_first_ticker:.2f}s.')
+        self.ready.set()
+
+    def frame_shown(self):
+        """Record the time it took to display the first ticker frame since startup. Called on each ticker frame."""
+        if self.time_to_first_frame is None:
+            self.time_to_first_frame = time.monotonic() - self.started
+            logging.info(f'First ticker frame shown after {self.time_to_first_frame:.2f}s.')
+
+    def update(self, tickers: List[Ticker] = None, horizons: Dict[str, float] = None) -> Status:
+        """
+        Update prices of the tickers due for an update. Skipped if tickers are already being updated.
+        Tickers are due according to the update scheduler. Those which fail to update are retried on the next update.
+        Those whose failures are their own (i.e. Invalid price data, rather than network errors) are quarantined once
+        they failed too many times in a row.
+        Configured symbols still missing (i.e. Not initialized in time on startup) are initialized as part of the same
+        cycle, under the same deadline, and quarantined alike. Only on updates of all tickers.
+        Quotes of tickers kept up-to-date by the quote stream are not fetched again.
+        Per-ticker results of the update cycle are kept in last_cycle.
+        Successful updates are saved to the snapshot, at most every SNAPSHOT_SAVE_INTERVAL, and on exit.
+        :param tickers: Tickers to consider. Defaults to all tickers.
+        :param horizons: Time by which each ticker may become due to be updated (epoch), keyed by symbol
+        :return: status: (data.Status) Update cycle's status. SKIPPED if tickers were already being updated.
         """
         logging.debug('Checking for update')
-        if time.time() - self.last_updated >= 3600:
-            self.currency_exchange_rate = fetch_exchange_rate(self.currency)
+        if not self.lock.acquire(blocking=False):
+            logging.debug('Update already in progress')
+            return Status.SKIPPED
+        try:
+            self.exchange_rates.refresh_async()
+            self.currency_exchange_rate = self.exchange_rates.rate(self.currency)
+            now = time.time()
+            cycle = FetchCycle(self.max_concurrency, executor=self.executor)
+            plan = self.scheduler.plan(tickers or self.stocks + self.cryptos + self.forex, now, horizons)
+            live = self.live_quotes([ticker for ticker, _ in plan])
+            quotes = self.get_quotes(cycle, [ticker.symbol for ticker, _ in plan if ticker.symbol not in live])
+            quotes.update(live)
+            jobs = {}
+            for ticker, fetch_history in plan:
+                ticker.currency_exchange_rate = self.exchange_rates.rate(ticker.currency)
+                jobs[ticker.symbol] = partial(ticker.update, quotes.get(ticker.symbol), fetch_history, cycle.deadline)
+            cycle.run(jobs)
+            for ticker, _ in plan:
+                result = cycle.results.get(ticker.symbol)
+                if result and result.status is Status.SUCCESS:
+                    self.scheduler.schedule(ticker, now)
+                elif result and result.status in SYMBOL_FAILURES:
+                    self.scheduler.fail(ticker.symbol, now)
+            if tickers is None and self.missing():
+                self.initialize_missing(cycle)
+            self.last_cycle = cycle
+            self.last_updated = time.time()
+        finally:
+            self.lock.release()
+        logging.info(cycle.summary())
+        logging.info(self.scheduler.summary(now))
+        logging.info(connection_summary())
+        logging.info(upstream_summary())
+
+        if cycle.count(Status.SUCCESS):
+            self.autosave_snapshot()
+        return cycle.status
+
+    def update_async(self):
+        """
+        Update tickers in the background, so that the render thread never waits on the network.
+        Skipped if tickers are already being updated.
+        """
+        if not self.lock.locked():
+            threading.Thread(target=self.update, name='update', daemon=True).start()
+
+    def missing(self) -> List[str]:
+        """
+        Configured symbols without a ticker, other than invalid or quarantined ones
+        :return: symbols: (list) Missing symbols
+        """
+        now = time.time()
+        tickers = {ticker.symbol for ticker in self.stocks + self.cryptos + self.forex}
+        return [symbol for symbol in self.config.stocks + self.config.cryptos + self.config.forex
+                if symbol not in tickers and symbol not in self.invalid
+                and not self.scheduler.is_quarantined(symbol, now)]
+
+    def prefetch(self, ticker: Ticker):
+        """
+        Update, in the background, the tickers shown within the next PREFETCH_LEAD seconds after the given one,
+        if they become due closer to their upcoming showing than to the one after it.
+        Once the ticker starts a new page of a watchlist spanning more than two pages, the page is turned.
+        Meant to be called as a ticker starts being displayed.
+        :param ticker: Ticker being displayed
+        """
+        order = self.stocks + self.cryptos + self.forex
+        symbols = [t.symbol for t in order]
+        if ticker.symbol not in symbols:
+            return
+        index = symbols.index(ticker.symbol)
+        page = index // self.config.page_size
+        if page != self.page and len(order) > 2 * self.config.page_size:
+            self.page = page
+            threading.Thread(target=self.turn_page, name='page', daemon=True).start()
+        rotation_rate = self.config.rotation_rate
+        period = (len(order) + 1) * rotation_rate  # Clock included
+        lookahead = min(len(order) - 1, math.ceil(PREFETCH_LEAD / rotation_rate))
+
+        now = time.time()
+        upcoming, horizons = [], {}
+        for i in range(1, lookahead + 1):
+            position = index + i
+            shown_at = now + (i + (position >= len(order))) * rotation_rate  # Clock is shown after the last ticker
+            upcoming.append(order[position % len(order)])
+            horizons[upcoming[-1].symbol] = shown_at + period / 2  # Closer to this showing than to the next one
+        if any(self.scheduler.is_due(t, horizons[t.symbol]) for t in upcoming):
+            threading.Thread(target=self.update, args=(upcoming, horizons), name='prefetch', daemon=True).start()
+
+    def on_quote(self, symbol: str, quote: dict):
+        """
+        Apply a quote pushed by the quote stream to its ticker
+        :param symbol: Quote's symbol
+        :param quote: Price data
+        """
         for ticker in self.stocks + self.cryptos + self.forex:
-            ticker.currency_exchange_rate = self.currency_exchange_rate
-            self.update_ticker(ticker)
-        self.last_updated = time.time()
+            if ticker.symbol == symbol:
+                ticker.currency_exchange_rate = self.exchange_rates.rate(ticker.currency)
+                ticker.apply_quote(quote)
+                return
 
-        return Status.SUCCESS
+    def live_quotes(self, tickers: List[Ticker]) -> Dict[str, dict]:
+        """
+        Last price data of the tickers whose quotes were pushed by the quote stream within the last update_rate
+        :param tickers: Tickers to consider
+        :return: quotes: (dict) Price data keyed by symbol
+        """
+        if self.stream is None:
+            return {}
+        return {ticker.symbol: ticker.price_data for ticker in tickers
+                if ticker.price_data and self.stream.is_live(ticker.symbol, self.config.update_rate)}
 
-    def update_clock(self):
-        """Update date & time"""
-        self.date = self.get_date()
-        self.time = self.get_time()
+    def revalidate(self):
+        """Bring data restored from a snapshot up-to-date, and initialize tickers missing from it"""
+        logging.info('Revalidating snapshot...')
+        self.exchange_rates.refresh_async()
+        self.initialize()
+        self.initialized.set()
+        self.turn_page()
+        self.update()
 
-    @multitasking.task
-    def fetch_stock(self, symbol: str, currency: str, exchange_rate: float):
+    def active(self, symbols: List[str]) -> Set[str]:
         """
-        Fetch stock's data
-        :param symbol: Stock symbol
-        :param currency: Stock's prices currency
-        :param exchange_rate: Exchange rate to use for currency conversion
+        Symbols whose chart data is kept: those of the page displayed, and of the next one.
+        Every symbol, unless the watchlist spans more than two pages.
+        :param symbols: Symbols in display order
+        :return: symbols: (set) Active symbols
         """
-        stock = Stock(symbol, currency, exchange_rate)
-        if stock.valid:
-            self.stocks.append(stock)
-        else:
-            self.valid_tickers -= 1
-            logging.warning(f'Stock: {stock.symbol} may not be valid.')
+        size = self.config.page_size
+        if len(symbols) <= 2 * size:
+            return set(symbols)
+        start = self.page * size % len(symbols)
+        return {symbols[(start + i) % len(symbols)] for i in range(2 * size)}
 
-    @multitasking.task
-    def fetch_crypto(self, symbol: str, currency: str, exchange_rate: float):
+    def turn_page(self):
         """
-        Fetch crypto's data
-        :param symbol: Crypto symbol
-        :param currency: Crypto's prices currency
-        :param exchange_rate: Exchange rate to use for currency conversion
+        Keep chart data only for the tickers of the page displayed, and of the next one.
+        Chart data of the tickers left behind is released, and history is fetched for the tickers coming up.
         """
-        crypto = Crypto(symbol, currency, exchange_rate)
-        if crypto.valid:
-            self.cryptos.append(crypto)
-        else:
-            self.valid_tickers -= 1
-            logging.warning(f'Crypto: {crypto.symbol} may not be valid.')
+        with self.lock:
+            order = self.stocks + self.cryptos + self.forex
+            active = self.active([ticker.symbol for ticker in order])
+            cycle = FetchCycle(self.max_concurrency, executor=self.executor)
+            jobs = {}
+            for ticker in order:
+                if ticker.symbol not in active and ticker.charted:
+                    ticker.release_chart()
+                elif ticker.symbol in active and (not ticker.charted or not len(ticker.chart_prices)):
+                    jobs[ticker.symbol] = partial(ticker.load_chart, cycle.deadline)
+            if jobs:
+                cycle.run(jobs)
+                logging.info(f'Page {self.page + 1}: {cycle.summary()}')
 
-    @multitasking.task
-    def fetch_forex(self, symbol: str):
+    def to_snapshot(self) -> dict:
         """
-        Fetch forex rates
-        :param symbol: Forex pair
+        Compact, JSON-serializable state of all tickers, from which data can be restored without network access.
+        :return: snapshot: (dict) Data state
         """
-        forex = Forex(symbol)
-        if forex.valid:
-            self.forex.append(forex)
-        else:
-            self.valid_tickers -= 1
-            logging.warning(f'Forex: {forex.symbol} may not be valid.')
+        return {
+            'version': SNAPSHOT_VERSION,
+            'saved': time.time(),
+            'currency': self.currency,
+            'currency_exchange_rate': self.currency_exchange_rate,
+            'stocks': [stock.to_snapshot() for stock in self.stocks],
+            'cryptos': [crypto.to_snapshot() for crypto in self.cryptos],
+            'forex': [pair.to_snapshot() for pair in self.forex]
+        }
+
+    def save_snapshot(self):
+        """Save tickers' state to disk"""
+        with self.snapshot_lock:
+            self.snapshot_saved, self.snapshot_pending = time.time(), False
+            try:
+                write_compressed_json(SNAPSHOT_FILE, self.to_snapshot())
+            except OSError as e:
+                logging.warning(f'Unable to save snapshot: {e}')
+
+    def autosave_snapshot(self):
+        """Save tickers' state to disk after an update, if it was not saved recently. Otherwise, it is saved later."""
+        self.snapshot_pending = True
+        if time.time() - self.snapshot_saved >= SNAPSHOT_SAVE_INTERVAL:
+            self.save_snapshot()
+
+    def save_pending_snapshot(self):
+        """Save tickers' state to disk if updates were not saved yet. i.e. On exit."""
+        if self.snapshot_pending:
+            self.save_snapshot()
+
+    def load_snapshot(self) -> bool:
+        """
+        Restore configured tickers from the snapshot on disk, in the configured order.
+        Snapshots from a different version, or using a different currency are ignored.
+        :return: restored: (bool) True if any ticker was restored
+        """
+        snapshot = read_compressed_json(SNAPSHOT_FILE)
+        if not snapshot or snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('currency') != self.currency:
+            return False
+
+        try:
+            width = self.config.layout.width
+            self.stocks[:] = self.restore(Stock, snapshot['stocks'], self.config.stocks, width, self.provider)
+            self.cryptos[:] = self.restore(Crypto, snapshot['cryptos'], self.config.cryptos, width, self.provider)
+            self.forex[:] = self.restore(Forex, snapshot['forex'], self.config.forex, width, self.provider)
+        except (KeyError, TypeError, ValueError) as e:
+            logging.warning(f'Unable to restore snapshot: {e}')
+            self.stocks[:], self.cryptos[:], self.forex[:] = [], [], []
+            return False
+        self.currency_exchange_rate = snapshot['currency_exchange_rate']
+        logging.info(f'Restored {len(self.stocks + self.cryptos + self.forex)} tickers from snapshot.')
+        return len(self.stocks + self.cryptos + self.forex) > 0
+
+    @staticmethod
+    def restore(ticker_class, snapshots: List[dict], symbols: List[str], chart_width: int,
+                provider: DataProvider = None) -> List[Ticker]:
+        """
+        Restore tickers from their snapshots
+        :param ticker_class: Ticker class to restore
+        :param snapshots: Tickers' snapshots
+        :param symbols: Symbols to restore, in display order
+        :param chart_width: Chart width (in pixels)
+        :param provider: Provider to fetch updates from
+        :return: tickers: (list) Restored tickers
+        """
+        snapshots = {snapshot['symbol']: snapshot for snapshot in snapshots}
+        return [ticker_class.from_snapshot(snapshots[symbol], chart_width, provider)
+                for symbol in symbols if symbol in snapshots]
+
+    def update_clock(self):
+        """Update date & time"""
+        self.date = self.get_date()
+        self.time = self.get_time()
+
+    def get_quotes(self, cycle: FetchCycle, symbols: List[str]) -> Dict[str, dict]:
+        """
+        Fetch price data for symbols as part of an update cycle, with one job per chunk of symbols.
+        :param cycle: Update cycle to run the jobs on
+        :param symbols: Symbols to fetch
+        :return: quotes: (dict) Price data keyed by symbol
+        """
+        jobs = {f'quotes[{i}]': partial(fetch_quotes, self.provider, chunk, self.config.batch_size)
+                for i, chunk in enumerate(chunks(symbols, self.config.batch_size))}
+        quotes = {}
+        for result in cycle.run(jobs).values():
+            quotes.update(result)
+        return quotes
 
-    @multitasking.task
-    def update_ticker(self, ticker: Ticker):
+    @staticmethod
+    def ready_tickers(tickers: Dict[str, Ticker], symbols: List[str]) -> List[Ticker]:
         """
-        Update ticker's data
-        :param ticker: Ticker object to update
+        Select the valid tickers initialized so far, in the given symbols' order
+        :param tickers: Initialized tickers keyed by symbol
+        :param symbols: Symbols in display order
+        :return: tickers: (list) Valid tickers
         """
-        ticker.update()
+        return [tickers[symbol] for symbol in symbols if symbol in tickers and tickers[symbol].valid]
 
     def get_time(self) -> str:
         """
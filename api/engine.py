@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Tuple
+
+from constants import DEFAULT_FETCH_CONCURRENCY, DEFAULT_FETCH_TIMEOUT
+from data.status import Status
+from util.session import NETWORK_ERRORS
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a single fetch job"""
+    key: str
+    status: Status
+    latency: float
+
+
+@dataclass
+class FetchCycle:
+    """
+    Update cycle. Jobs run through the cycle share a single deadline.
+    Jobs not started by the deadline are cancelled. Jobs still running cannot be interrupted: they are abandoned, and
+    their results discarded. Jobs which apply their results themselves (i.e. Ticker.update) are given the deadline, so
+    that they do not apply results once it has passed.
+    Jobs run on the given executor, which is kept between cycles so that its threads' connections stay open.
+    Otherwise, on an executor of the cycle's own.
+
+    Arguments:
+        max_concurrency (int):                  Maximum number of jobs running at once
+        timeout (float):                        Time allowed for the whole cycle (in seconds)
+        executor (ThreadPoolExecutor):          Shared executor
+
+    Attributes:
+        started (float):                        Cycle start time (monotonic)
+        deadline (float):                       Cycle deadline (monotonic)
+        finished (float):                       Time at which the last job of the cycle ended (monotonic)
+        results (Dict[str, FetchResult]):       Results of every job, keyed by job
+        abandoned (List[Future]):               Jobs still running when the deadline was reached
+    """
+    max_concurrency: int = DEFAULT_FETCH_CONCURRENCY
+    timeout: float = DEFAULT_FETCH_TIMEOUT
+    executor: ThreadPoolExecutor = field(default=None, repr=False)
+    started: float = field(init=False)
+    deadline: float = field(init=False)
+    finished: float = field(init=False)
+    results: Dict[str, FetchResult] = field(default_factory=dict)
+    abandoned: List[Future] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        self.started = time.monotonic()
+        self.deadline = self.started + self.timeout
+        self.finished = self.started
+
+    def run(self, jobs: Dict[str, Callable[[], Any]],
+            on_result: Callable[[str, Any], None] = None) -> Dict[str, Any]:
+        """
+        Run jobs concurrently until all of them are completed, or the cycle's deadline is reached.
+        A job's status is the Status it returns, or the status attribute of the value it returns. Otherwise, SUCCESS.
+        :param jobs: Blocking callables keyed by job
+        :param on_result: Called with each job's key and value as soon as it completes. Value is None if it failed.
+        :return: values: (dict) Values returned by completed jobs, keyed by job
+        """
+        if not jobs:
+            return {}
+        if self.expired:
+            for key in jobs:
+                self.results[key] = FetchResult(key, Status.TIMEOUT, 0.0)
+            return {}
+        return asyncio.run(self._run(jobs, on_result))
+
+    async def _run(self, jobs: Dict[str, Callable[[], Any]],
+                   on_result: Callable[[str, Any], None] = None) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        executor = self.executor or ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='fetch')
+        futures = {key: executor.submit(self._call, key, job, self.deadline) for key, job in jobs.items()}
+        tasks = {asyncio.wrap_future(future, loop=loop): key for key, future in futures.items()}
+        if on_result is not None:
+            for task, key in tasks.items():
+                task.add_done_callback(partial(self._notify, on_result, key))
+        done, pending = await asyncio.wait(tasks, timeout=max(self.deadline - time.monotonic(), 0))
+
+        for task in pending:  # Stragglers
+            key = tasks[task]
+            if not futures[key].cancel():  # Already running
+                self.abandoned.append(futures[key])
+            task.cancel()
+            logging.warning(f'Fetch for {key} did not complete before the update deadline.')
+            self.results[key] = FetchResult(key, Status.TIMEOUT, time.monotonic() - self.started)
+        if executor is not self.executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        values = {}
+        for task in done:
+            key = tasks[task]
+            status, value, latency = task.result()
+            self.results[key] = FetchResult(key, status, latency)
+            if value is not None:
+                values[key] = value
+        self.finished = time.monotonic()
+        return values
+
+    @staticmethod
+    def _notify(on_result: Callable[[str, Any], None], key: str, task: asyncio.Future):
+        if task.cancelled():
+            return
+        try:
+            on_result(key, task.result()[1])
+        except Exception as e:
+            logging.exception(f'Handling result of {key} failed: {e}')
+
+    @staticmethod
+    def _call(key: str, job: Callable[[], Any], deadline: float) -> Tuple[Status, Any, float]:
+        start = time.monotonic()
+        if start >= deadline:  # Started too late. i.e. Queued behind stragglers.
+            return Status.TIMEOUT, None, 0.0
+        try:
+            value = job()
+            status = value if isinstance(value, Status) else getattr(value, 'status', Status.SUCCESS)
+        except NETWORK_ERRORS:
+            value, status = None, Status.NETWORK_ERROR
+        except Exception as e:
+            logging.exception(f'Fetch for {key} failed: {e}')
+            value, status = None, Status.FAIL
+        return status, value, time.monotonic() - start
+
+    @property
+    def expired(self) -> bool:
+        """
+        Determine if the cycle's deadline has passed
+        :return: expired: (bool)
+        """
+        return time.monotonic() >= self.deadline
+
+    @property
+    def duration(self) -> float:
+        """
+        Time elapsed between the start of the cycle, and the end of its last job
+        :return: duration: (float) Duration in seconds
+        """
+        return self.finished - self.started
+
+    @property
+    def status(self) -> Status:
+        """
+        Overall cycle status. SUCCESS if at least one job succeeded, or if no job was run.
+        Otherwise, the status of the first failed job.
+        :return: status: (data.Status) Cycle status
+        """
+        statuses = [result.status for result in self.results.values()]
+        if not statuses or Status.SUCCESS in statuses:
+            return Status.SUCCESS
+        return statuses[0]
+
+    def count(self, status: Status) -> int:
+        """
+        Count jobs that ended with the given status
+        :param status: (data.Status) Status to count
+        :return: count: (int) Number of jobs
+        """
+        return sum(1 for result in self.results.values() if result.status is status)
+
+    def summary(self) -> str:
+        """
+        One-line summary of the cycle, for logging
+        :return: summary: (str) Cycle summary
+        """
+        latencies = sorted(result.latency for result in self.results.values())
+        slowest = f', slowest {latencies[-1]:.2f}s' if latencies else ''
+        running = sum(not future.done() for future in self.abandoned)
+        abandoned = f' ({running} abandoned, still running)' if running else ''
+        return (f'Update cycle took {self.duration:.2f}s: {self.count(Status.SUCCESS)}/{len(self.results)} succeeded, '
+                f'{self.count(Status.TIMEOUT)} timed out{abandoned}{slowest}')
@@ -0,0 +1,117 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict
+
+from requests import Timeout, ConnectionError
+
+from api.provider import DataProvider, default_provider
+from constants import EXCHANGE_RATES_FILE, EXCHANGE_RATE_TTL
+from util.utils import read_compressed_json, write_compressed_json
+
+
+@dataclass
+class ExchangeRates:
+    """
+    Table of exchange rates from USD to every currency, kept in memory and on disk.
+    Rates older than the TTL are refreshed in the background, while the previous rates remain in use.
+    Conversions between any two currencies of the table are done without further requests.
+
+    Arguments:
+        filename (str):                 File the table is persisted to
+        ttl (float):                    Time after which rates should be refreshed (in seconds)
+        provider (DataProvider):        Provider to fetch rates from
+
+    Attributes:
+        rates (Dict[str, float]):       Exchange rates from USD, keyed by currency
+        updated (float):                Time rates were fetched (epoch)
+    """
+    filename: str = EXCHANGE_RATES_FILE
+    ttl: float = EXCHANGE_RATE_TTL
+    provider: DataProvider = field(default=None, repr=False)
+    rates: Dict[str, float] = field(default_factory=dict)
+    updated: float = 0
+    lock: threading.Lock = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.provider = self.provider or default_provider()
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self) -> bool:
+        """
+        Load rates from disk
+        :return: loaded: (bool) True if rates were loaded
+        """
+        table = read_compressed_json(self.filename)
+        if not table or not isinstance(table.get('rates'), dict):
+            return False
+        self.rates = table['rates']
+        self.updated = table.get('updated', 0)
+        return True
+
+    def save(self):
+        """Save rates to disk"""
+        try:
+            write_compressed_json(self.filename, {'updated': self.updated, 'rates': self.rates})
+        except OSError as e:
+            logging.warning(f'Unable to save exchange rates: {e}')
+
+    def is_stale(self) -> bool:
+        """
+        Determine if rates should be refreshed
+        :return: is_stale: (bool)
+        """
+        return time.time() - self.updated >= self.ttl
+
+    def refresh(self) -> bool:
+        """
+        Fetch rates, and save them to disk. Previous rates are kept if they could not be fetched.
+        :return: refreshed: (bool) True if rates were fetched
+        """
+        try:
+            rates = self.provider.exchange_rates()
+        except (Timeout, ConnectionError):
+            rates = {}
+        if not rates:
+            logging.warning('Unable to fetch exchange rates. Using previous rates.')
+            return False
+        self.rates, self.updated = rates, time.time()
+        self.save()
+        return True
+
+    def refresh_async(self):
+        """Refresh rates in the background if they are stale, unless they are already being refreshed"""
+        if self.is_stale() and self.lock.acquire(blocking=False):
+            threading.Thread(target=self._refresh_and_release, name='exchange-rates', daemon=True).start()
+
+    def _refresh_and_release(self):
+        try:
+            self.refresh()
+        finally:
+            self.lock.release()
+
+    def rate(self, currency_to: str, currency_from: str = 'USD') -> float:
+        """
+        Exchange rate between two currencies
+        :param currency_to: (str) Currency to convert to
+        :param currency_from: (str) Currency to convert from
+        :return: rate: (float) Exchange rate. 1 if either currency's rate is unknown.
+        """
+        if currency_to == currency_from:
+            return 1.0
+        rate_to, rate_from = self.rates.get(currency_to), self.rates.get(currency_from)
+        if not rate_to or not rate_from:
+            return 1.0
+        return rate_to / rate_from
+
+    def convert(self, amount: float, currency_from: str, currency_to: str) -> float:
+        """
+        Convert an amount from one currency to another
+        :param amount: (float) Amount to convert
+        :param currency_from: (str) Currency to convert from
+        :param currency_to: (str) Currency to convert to
+        :return: amount: (float) Converted amount
+        """
+        return amount * self.rate(currency_to, currency_from)
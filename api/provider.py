@@ -0,0 +1,323 @@
+import atexit
+import copy
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import yahooquery
+
+from constants import RECORDING_SAVE_INTERVAL
+from util.session import yahoo_session
+from util.utils import fetch_exchange_rates, read_compressed_json, write_compressed_json
+
+CASSETTE_VERSION = 1
+
+
+class DataProvider(ABC):
+    """
+    Source of market data. Tickers, update cycles and exchange rates fetch through a provider, so that the source can be
+    swapped. i.e. Recorded responses, to run without network access.
+    Price data follows Yahoo Finance's price module (i.e. regularMarketPrice), with percent changes as a fraction.
+    """
+
+    @abstractmethod
+    def price(self, symbol: str) -> Optional[dict]:
+        """
+        Fetch a single symbol's price data
+        :param symbol: Symbol
+        :return: price_data: (dict) Price data. None if the symbol has no data. i.e. Not valid.
+        :exception Timeout: If the request timed out
+        """
+        ...
+
+    @abstractmethod
+    def quotes(self, symbols: List[str]) -> Dict[str, dict]:
+        """
+        Fetch price data for multiple symbols, with a single request
+        :param symbols: Symbols
+        :return: quotes: (dict) Price data keyed by symbol. Symbols without data are not included.
+        :exception Timeout: If the request timed out
+        """
+        ...
+
+    @abstractmethod
+    def profile(self, symbol: str) -> Optional[dict]:
+        """
+        Fetch a company's profile
+        :param symbol: Stock symbol
+        :return: profile: (dict) Profile (i.e. website). None if unavailable.
+        :exception Timeout: If the request timed out
+        """
+        ...
+
+    @abstractmethod
+    def history(self, symbol: str, period: str = None, start: datetime = None) -> Tuple[List[int], List[float]]:
+        """
+        Fetch 1-minute bars
+        :param symbol: Symbol
+        :param period: Period of the bars to fetch. i.e. 1d
+        :param start: Start of the bars to fetch, instead of a period
+        :return: timestamps, prices: Bars' timestamps and close prices, oldest first. Empty if unavailable.
+        :exception Timeout: If the request timed out
+        """
+        ...
+
+    @abstractmethod
+    def exchange_rates(self) -> Dict[str, float]:
+        """
+        Fetch the exchange rates from USD to every currency
+        :return: rates: (dict) Exchange rates keyed by currency, or an empty dict if they could not be fetched
+        """
+        ...
+
+
+class YahooProvider(DataProvider):
+    """
+    Yahoo Finance, through yahooquery, with exchange rates from the Exchange Rate API.
+    A single yahooquery ticker is kept per fetching thread, and pointed at the symbols of each request, so that it is
+    only set up once, and no yahooquery ticker is kept per symbol.
+    """
+
+    def __init__(self):
+        self.local: threading.local = threading.local()
+
+    def ticker(self, symbols: List[str]) -> yahooquery.Ticker:
+        """
+        Fetching thread's yahooquery ticker, pointed at the given symbols
+        :param symbols: Symbols to request
+        :return: ticker: (yahooquery.Ticker) Thread's ticker
+        """
+        yq_ticker = getattr(self.local, 'ticker', None)
+        if yq_ticker is None:
+            yq_ticker = self.local.ticker = yahooquery.Ticker(symbols, session=yahoo_session())
+        yq_ticker.symbols = symbols
+        return yq_ticker
+
+    def price(self, symbol: str) -> Optional[dict]:
+        price_data = self.ticker([symbol]).price.get(symbol.upper())
+        return price_data if isinstance(price_data, dict) else None
+
+    def quotes(self, symbols: List[str]) -> Dict[str, dict]:
+        if not symbols:
+            return {}
+        response = self.ticker(symbols).quotes
+        if not isinstance(response, dict):  # Error message
+            logging.warning(f'Unable to fetch quotes for {", ".join(symbols)}: {response}')
+            return {}
+        quotes = {}
+        for symbol in symbols:
+            price_data = response.get(symbol.upper())
+            if isinstance(price_data, dict):
+                price_data['regularMarketChangePercent'] = (price_data.get('regularMarketChangePercent') or 0.0) / 100
+                quotes[symbol] = price_data
+        return quotes
+
+    def profile(self, symbol: str) -> Optional[dict]:
+        profile = self.ticker([symbol]).summary_profile.get(symbol.upper())
+        return profile if isinstance(profile, dict) else None
+
+    def history(self, symbol: str, period: str = None, start: datetime = None) -> Tuple[List[int], List[float]]:
+        kwargs = {'start': start} if start else {'period': period}
+        try:
+            df = self.ticker([symbol]).history(interval='1m', **kwargs)
+            close = df['close']
+            timestamps = [int(date.timestamp()) for date in close.index.get_level_values('date')]
+            return timestamps, close.tolist()
+        except (KeyError, TypeError, AttributeError):
+            logging.warning(f'No history available for {symbol}.')
+            return [], []
+
+    def exchange_rates(self) -> Dict[str, float]:
+        return fetch_exchange_rates()
+
+
+class RecordingProvider(DataProvider):
+    """
+    Forward requests to another provider, and record its responses to a cassette file, to be replayed by a
+    ReplayProvider. The cassette keeps each symbol's latest price data and profile, and all of its bars.
+    It is saved at most every RECORDING_SAVE_INTERVAL, and on exit.
+
+    Arguments:
+        provider (DataProvider):        Provider to record
+        filename (str):                 Cassette file
+    """
+
+    def __init__(self, provider: DataProvider, filename: str):
+        self.provider: DataProvider = provider
+        self.filename: str = filename
+        self.cassette: dict = {'version': CASSETTE_VERSION, 'recorded': time.time(),
+                               'quotes': {}, 'profiles': {}, 'history': {}, 'exchange_rates': {}}
+        self.saved: float = time.time()
+        self.lock: threading.Lock = threading.Lock()
+        atexit.register(self.save)
+
+    def price(self, symbol: str) -> Optional[dict]:
+        price_data = self.provider.price(symbol)
+        if price_data:
+            self.record('quotes', {symbol: price_data})
+        return price_data
+
+    def quotes(self, symbols: List[str]) -> Dict[str, dict]:
+        quotes = self.provider.quotes(symbols)
+        self.record('quotes', quotes)
+        return quotes
+
+    def profile(self, symbol: str) -> Optional[dict]:
+        profile = self.provider.profile(symbol)
+        if profile:
+            self.record('profiles', {symbol: profile})
+        return profile
+
+    def history(self, symbol: str, period: str = None, start: datetime = None) -> Tuple[List[int], List[float]]:
+        timestamps, prices = self.provider.history(symbol, period, start)
+        with self.lock:
+            recorded = self.cassette['history'].get(symbol, {'timestamps': [], 'prices': []})
+            bars = dict(zip(recorded['timestamps'], recorded['prices']))
+            bars.update(zip(timestamps, prices))
+            self.cassette['history'][symbol] = {'timestamps': sorted(bars), 'prices': [bars[t] for t in sorted(bars)]}
+        self.autosave()
+        return timestamps, prices
+
+    def exchange_rates(self) -> Dict[str, float]:
+        rates = self.provider.exchange_rates()
+        if rates:
+            with self.lock:
+                self.cassette['exchange_rates'] = dict(rates)
+            self.autosave()
+        return rates
+
+    def record(self, section: str, responses: Dict[str, dict]):
+        """
+        Record responses, and save the cassette if it was not saved recently
+        :param section: Cassette section
+        :param responses: Responses keyed by symbol
+        """
+        with self.lock:
+            self.cassette[section].update(json.loads(json.dumps(responses, default=str)))  # i.e. Dates as strings
+        self.autosave()
+
+    def autosave(self):
+        """Save the cassette if it was not saved recently"""
+        with self.lock:
+            self.cassette['recorded'] = time.time()
+            due = time.time() - self.saved >= RECORDING_SAVE_INTERVAL
+        if due:
+            self.save()
+
+    def save(self):
+        """Save the cassette to disk"""
+        with self.lock:
+            self.saved = time.time()
+            try:
+                write_compressed_json(self.filename, self.cassette)
+            except OSError as e:
+                logging.warning(f'Unable to save recording: {e}')
+
+
+class ReplayProvider(DataProvider):
+    """
+    Serve responses recorded by a RecordingProvider, without network access. Each request waits for a fixed latency,
+    to simulate round trips, and is counted.
+    Bars are shifted in time by how long ago they were recorded, so that they are as recent as they were then.
+
+    Arguments:
+        cassette (dict):                Recorded responses
+        latency (float):                Time each request takes (in seconds)
+
+    Attributes:
+        requests (int):                 Number of requests served
+    """
+
+    def __init__(self, cassette: dict, latency: float = 0.0):
+        if cassette.get('version') != CASSETTE_VERSION:
+            raise ValueError(f'Unsupported cassette version: {cassette.get("version")}')
+        self.cassette: dict = cassette
+        self.latency: float = latency
+        self.offset: int = int(time.time() - cassette.get('recorded', time.time()))
+        self.requests: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, filename: str, latency: float = 0.0) -> 'ReplayProvider':
+        """
+        Load a cassette from disk
+        :param filename: Cassette file
+        :param latency: Time each request takes (in seconds)
+        :return: provider: (ReplayProvider) Replay provider
+        :exception ValueError: If the cassette could not be loaded
+        """
+        cassette = read_compressed_json(filename)
+        if not cassette:
+            raise ValueError(f'Unable to load cassette {filename}')
+        return cls(cassette, latency)
+
+    def request(self):
+        with self.lock:
+            self.requests += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def price(self, symbol: str) -> Optional[dict]:
+        self.request()
+        return copy.deepcopy(self.cassette['quotes'].get(symbol))
+
+    def quotes(self, symbols: List[str]) -> Dict[str, dict]:
+        self.request()
+        quotes = self.cassette['quotes']
+        return {symbol: copy.deepcopy(quotes[symbol]) for symbol in symbols if symbol in quotes}
+
+    def profile(self, symbol: str) -> Optional[dict]:
+        self.request()
+        return copy.deepcopy(self.cassette['profiles'].get(symbol))
+
+    def history(self, symbol: str, period: str = None, start: datetime = None) -> Tuple[List[int], List[float]]:
+        self.request()
+        bars = self.cassette['history'].get(symbol)
+        if not bars or not bars['timestamps']:
+            return [], []
+        timestamps = [timestamp + self.offset for timestamp in bars['timestamps']]
+        if start is not None:
+            first = start.timestamp()
+        else:  # Days before the last bar
+            first = timestamps[-1] - int(period.rstrip('d')) * 24 * 60 * 60 if period else timestamps[0]
+        bars = [(timestamp, price) for timestamp, price in zip(timestamps, bars['prices']) if timestamp >= first]
+        return [timestamp for timestamp, _ in bars], [price for _, price in bars]
+
+    def exchange_rates(self) -> Dict[str, float]:
+        self.request()
+        return dict(self.cassette.get('exchange_rates', {}))
+
+
+_lock = threading.Lock()
+_provider: DataProvider = None
+
+
+def default_provider() -> DataProvider:
+    """
+    Shared provider used when none is given
+    :return: provider: (YahooProvider) Shared provider
+    """
+    global _provider
+    with _lock:
+        if _provider is None:
+            _provider = YahooProvider()
+        return _provider
+
+
+def create_provider(record: str = None, replay: str = None, latency: float = 0.0) -> DataProvider:
+    """
+    Create the provider selected on the command line
+    :param record: Cassette file to record responses to
+    :param replay: Cassette file to replay responses from, instead of fetching them
+    :param latency: Time each replayed request takes (in seconds)
+    :return: provider: (DataProvider) Provider
+    """
+    if replay:
+        return ReplayProvider.from_file(replay, latency)
+    if record:
+        return RecordingProvider(default_provider(), record)
+    return default_provider()
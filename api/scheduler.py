@@ -0,0 +1,259 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone, date
+from typing import Dict, List, Optional, Tuple, Set
+
+from constants import DEFAULT_UPDATE_RATE, CLOSED_MARKET_UPDATE_RATE, MIN_PRIORITY, MAX_PRIORITY, \
+    VOLATILITY_SMOOTHING, QUARANTINE_THRESHOLD, QUARANTINE_BACKOFF, QUARANTINE_MAX_BACKOFF
+from data.crypto import Crypto
+from data.forex import Forex
+from data.status import Status
+from data.stock import Stock
+from data.ticker import Ticker
+from util.market_calendar import TradingHours, EXCHANGE_HOURS, FOREX_HOURS
+from util.market_status import MarketStatus
+
+# Statuses of failures specific to a symbol. i.e. Invalid or empty price data. Others (i.e. Network errors, open
+# circuits, or cycles timing out) affect every symbol alike, and are retried without penalty.
+SYMBOL_FAILURES = (Status.FAIL, Status.API_ERROR)
+
+
+@dataclass
+class UpdateScheduler:
+    """
+    Per-ticker update schedule, based on each ticker's asset class, market hours and volatility.
+    Cryptos, and tickers whose market is open, are updated every update_rate on average. Each ticker's interval is
+    scaled by its priority: tickers whose percent change moves fast are updated more often, and quiet ones less often,
+    so that the total number of requests stays the same.
+    Tickers whose market is closed are not updated again until their market opens, and their history is not fetched.
+    Markets are considered open according to their regular trading hours, and the last known market state of stocks.
+    e.g. A stock still closed after being updated during trading hours (i.e. Market state lagging behind the opening
+    bell, or holiday) is checked again every update_rate. Closed markets with unknown trading hours are checked every
+    closed_update_rate.
+    Tickers which fail to update QUARANTINE_THRESHOLD times in a row, for reasons of their own (SYMBOL_FAILURES), are
+    quarantined: they are not updated again until a backoff, doubled after each further failure, has passed.
+
+    Arguments:
+        update_rate (float):                    Average update interval of open markets (in seconds)
+        closed_update_rate (float):             Update interval of closed markets with unknown hours (in seconds)
+
+    Attributes:
+        next_update (Dict[str, float]):         Next update time of each ticker (epoch), keyed by symbol
+        last_update (Dict[str, float]):         Last update time of each ticker (epoch), keyed by symbol
+        was_open (Dict[str, bool]):             Whether each ticker's market was open when it was last updated
+        pct_changes (Dict[str, float]):         Percent change of each ticker at its last update, keyed by symbol
+        volatility (Dict[str, float]):          Smoothed rate of change of each ticker's percent change (in percentage
+                                                points per hour), keyed by symbol
+        failures (Dict[str, int]):              Consecutive failed updates of each ticker, keyed by symbol
+        quarantined (Dict[str, float]):         Time until which each quarantined ticker is left out (epoch), keyed by
+                                                symbol
+        symbols (Set[str]):                     Symbols of every ticker planned
+        requested (Dict[str, int]):             Quote lookups and history requests planned today
+        started (float):                        Time requests started being counted (epoch)
+        day (datetime.date):                    Day requests are counted for
+    """
+    update_rate: float = DEFAULT_UPDATE_RATE
+    closed_update_rate: float = CLOSED_MARKET_UPDATE_RATE
+    next_update: Dict[str, float] = field(default_factory=dict)
+    last_update: Dict[str, float] = field(default_factory=dict)
+    was_open: Dict[str, bool] = field(default_factory=dict)
+    pct_changes: Dict[str, float] = field(default_factory=dict)
+    volatility: Dict[str, float] = field(default_factory=dict)
+    failures: Dict[str, int] = field(default_factory=dict)
+    quarantined: Dict[str, float] = field(default_factory=dict)
+    symbols: Set[str] = field(default_factory=set)
+    requested: Dict[str, int] = field(default_factory=lambda: {'quotes': 0, 'history': 0})
+    started: float = None
+    day: date = None
+
+    def plan(self, tickers: List[Ticker], now: float, horizons: Dict[str, float] = None) -> List[Tuple[Ticker, bool]]:
+        """
+        Select the tickers due for an update, and whether their history should be fetched.
+        History is fetched while the market is open, and once more after it closes, to get its last bars. It is never
+        fetched for tickers whose chart data is not kept.
+        :param tickers: Tickers to consider
+        :param now: (float) Current time (epoch)
+        :param horizons: Time by which each ticker may become due to be included (epoch), keyed by symbol.
+        i.e. Ticker will be due before it is shown again. Defaults to now.
+        :return: plan: (list) Due tickers, and whether to fetch their history
+        """
+        self.roll_day(now)
+        horizons = horizons or {}
+        plan = []
+        for ticker in tickers:
+            self.symbols.add(ticker.symbol)
+            if not self.is_due(ticker, horizons.get(ticker.symbol, now)):
+                continue
+            fetch_history = ticker.charted and (self.is_open(ticker, now) or self.was_open.get(ticker.symbol, True))
+            self.requested['quotes'] += 1
+            self.requested['history'] += fetch_history
+            plan.append((ticker, fetch_history))
+        return plan
+
+    def is_due(self, ticker: Ticker, horizon: float) -> bool:
+        """
+        Determine if a ticker is due for an update
+        :param ticker: Ticker
+        :param horizon: (float) Time by which the ticker has to be due (epoch)
+        :return: is_due: (bool)
+        """
+        return self.next_update.get(ticker.symbol, 0) <= horizon
+
+    def schedule(self, ticker: Ticker, now: float):
+        """
+        Schedule the next update of a ticker that was just updated
+        :param ticker: Updated ticker
+        :param now: (float) Time of the update (epoch)
+        """
+        self.observe(ticker, now)
+        self.recover(ticker.symbol)
+        self.last_update[ticker.symbol] = now
+        is_open = self.is_open(ticker, now)
+        self.was_open[ticker.symbol] = is_open
+        if is_open:
+            self.next_update[ticker.symbol] = now + self.update_rate / self.priorities().get(ticker.symbol, 1.0)
+            return
+        hours = self.trading_hours(ticker)
+        utc_now = datetime.fromtimestamp(now, tz=timezone.utc)
+        if hours is None:
+            self.next_update[ticker.symbol] = now + self.closed_update_rate
+        elif hours.is_open(utc_now):  # Market state lagging behind the calendar
+            self.next_update[ticker.symbol] = now + self.update_rate
+        else:
+            self.next_update[ticker.symbol] = hours.next_open(utc_now).timestamp()
+
+    def fail(self, symbol: str, now: float):
+        """
+        Record a failed update of a ticker, and quarantine it once it failed too many times in a row
+        :param symbol: Symbol of the ticker which failed to update, or to initialize
+        :param now: (float) Time of the update (epoch)
+        """
+        failures = self.failures.get(symbol, 0) + 1
+        self.failures[symbol] = failures
+        if failures < QUARANTINE_THRESHOLD:
+            return  # Retried on the next update
+        backoff = min(QUARANTINE_BACKOFF * 2 ** (failures - QUARANTINE_THRESHOLD), QUARANTINE_MAX_BACKOFF)
+        self.quarantined[symbol] = now + backoff
+        self.next_update[symbol] = now + backoff
+        logging.warning(f'{symbol} failed to update {failures} times in a row. Quarantined for {backoff}s.')
+
+    def recover(self, symbol: str):
+        """
+        Clear the failures of a ticker which was just updated, or initialized
+        :param symbol: Ticker's symbol
+        """
+        self.failures.pop(symbol, None)
+        self.quarantined.pop(symbol, None)
+
+    def is_quarantined(self, symbol: str, now: float) -> bool:
+        """
+        Determine if a ticker is quarantined
+        :param symbol: Ticker's symbol
+        :param now: (float) Current time (epoch)
+        :return: is_quarantined: (bool)
+        """
+        return self.quarantined.get(symbol, 0) > now
+
+    def observe(self, ticker: Ticker, now: float):
+        """
+        Update a ticker's volatility with its new percent change
+        :param ticker: Updated ticker
+        :param now: (float) Time of the update (epoch)
+        """
+        try:
+            pct_change = float(ticker.pct_change.rstrip('%'))
+        except (AttributeError, ValueError):
+            return
+        previous, last_update = self.pct_changes.get(ticker.symbol), self.last_update.get(ticker.symbol)
+        self.pct_changes[ticker.symbol] = pct_change
+        if previous is None or last_update is None or now <= last_update:
+            return
+        rate = abs(pct_change - previous) / ((now - last_update) / 3600)
+        volatility = self.volatility.get(ticker.symbol)
+        self.volatility[ticker.symbol] = rate if volatility is None else \
+            VOLATILITY_SMOOTHING * rate + (1 - VOLATILITY_SMOOTHING) * volatility
+
+    def priorities(self) -> Dict[str, float]:
+        """
+        Update priority of each ticker with a known volatility, proportional to its volatility.
+        Priorities are bounded, and average to 1, which keeps the overall update rate unchanged.
+        :return: priorities: (dict) Priorities keyed by symbol
+        """
+        if not self.volatility:
+            return {}
+        mean = sum(self.volatility.values()) / len(self.volatility)
+        if mean <= 0:
+            return {symbol: 1.0 for symbol in self.volatility}
+        priorities = {symbol: min(max(volatility / mean, MIN_PRIORITY), MAX_PRIORITY)
+                      for symbol, volatility in self.volatility.items()}
+        scale = len(priorities) / sum(priorities.values())
+        return {symbol: priority * scale for symbol, priority in priorities.items()}
+
+    def is_open(self, ticker: Ticker, now: float) -> bool:
+        """
+        Determine if a ticker's market is open
+        :param ticker: Ticker
+        :param now: (float) Current time (epoch)
+        :return: is_open: (bool)
+        """
+        if isinstance(ticker, Crypto):
+            return True
+        hours = self.trading_hours(ticker)
+        if hours is None:
+            return getattr(ticker, 'market_status', MarketStatus.OPEN) is MarketStatus.OPEN
+        session_start = hours.session_start(datetime.fromtimestamp(now, tz=timezone.utc))
+        if session_start is None:
+            return False
+        if isinstance(ticker, Stock) and ticker.market_status is MarketStatus.CLOSED:
+            # Open, unless it was still closed when updated during this session
+            return self.last_update.get(ticker.symbol, 0) < session_start.timestamp()
+        return True
+
+    @staticmethod
+    def trading_hours(ticker: Ticker) -> Optional[TradingHours]:
+        """
+        Regular trading hours of a ticker's market
+        :param ticker: Ticker
+        :return: hours: (TradingHours) Trading hours. None if unknown, or if the market never closes.
+        """
+        if isinstance(ticker, Forex):
+            return FOREX_HOURS
+        if isinstance(ticker, Stock):
+            return EXCHANGE_HOURS.get(ticker.exchange)
+        return None
+
+    def avoided(self, now: float) -> Dict[str, int]:
+        """
+        Requests avoided today, compared to updating every ticker on start, and then every update_rate.
+        :param now: (float) Current time (epoch)
+        :return: avoided: (dict) Quote lookups and history requests avoided
+        """
+        if self.started is None:
+            return {'quotes': 0, 'history': 0}
+        baseline = (1 + int((now - self.started) // self.update_rate)) * len(self.symbols)
+        return {request: max(0, baseline - count) for request, count in self.requested.items()}
+
+    def roll_day(self, now: float):
+        """
+        Log and reset the count of requests once a day has passed
+        :param now: (float) Current time (epoch)
+        """
+        today = datetime.fromtimestamp(now).date()
+        if self.day is not None and today != self.day:
+            logging.info(f'{self.day}: {self.summary(now)}')
+            self.requested = {'quotes': 0, 'history': 0}
+            self.started = None
+        if self.started is None:
+            self.started = now
+        self.day = today
+
+    def summary(self, now: float) -> str:
+        """
+        One-line summary of the requests avoided today, for logging
+        :param now: (float) Current time (epoch)
+        :return: summary: (str) Avoided requests summary
+        """
+        avoided = self.avoided(now)
+        quarantined = sum(until > now for until in self.quarantined.values())
+        return f'Update scheduler avoided {avoided["history"]} history requests and {avoided["quotes"]} ' \
+               f'quote lookups, {quarantined} tickers quarantined'
@@ -0,0 +1,172 @@
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from requests import RequestException
+
+from constants import HTTP_TIMEOUT, STREAM_READ_TIMEOUT, STREAM_RECONNECT_DELAY, STREAM_MAX_RECONNECT_DELAY
+from util.session import http_session
+
+
+class QuoteStream(ABC):
+    """
+    Long-lived connection over which quotes are pushed as prices change, instead of being polled.
+    Quotes are received on a background thread, and passed on as they arrive. The connection is re-established after
+    it drops, waiting longer after each failed attempt.
+    Quotes use the same fields as Yahoo Finance's price data (i.e. regularMarketPrice), with percent changes as a
+    fraction. Fields that did not change may be left out.
+
+    Arguments:
+        on_quote (Callable[[str, dict], None]):     Called with each quote's symbol and price data
+
+    Attributes:
+        symbols (List[str]):                        Symbols subscribed to
+        received (Dict[str, float]):                Time each symbol's last quote was received (epoch)
+        connected (bool):                           Whether the stream is currently connected
+    """
+
+    def __init__(self, on_quote: Callable[[str, dict], None]):
+        self.on_quote: Callable[[str, dict], None] = on_quote
+        self.symbols: List[str] = []
+        self.received: Dict[str, float] = {}
+        self.connected: bool = False
+        self.stopped: threading.Event = threading.Event()
+        self.thread: threading.Thread = None
+
+    def start(self, symbols: List[str]):
+        """
+        Connect, and keep receiving quotes in the background until stopped
+        :param symbols: Symbols to subscribe to
+        """
+        self.symbols = list(symbols)
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name='quote-stream', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Disconnect, and stop receiving quotes"""
+        self.stopped.set()
+        self.disconnect()
+
+    def run(self):
+        delay = STREAM_RECONNECT_DELAY
+        while not self.stopped.is_set():
+            try:
+                for symbol, quote in self.quotes():
+                    delay = STREAM_RECONNECT_DELAY
+                    self.receive(symbol, quote)
+                    if self.stopped.is_set():
+                        break
+            except Exception as e:  # Keep streaming whatever went wrong. Polling covers for it meanwhile.
+                if not self.stopped.is_set():
+                    logging.warning(f'Quote stream disconnected: {e}')
+            self.connected = False
+            if self.stopped.wait(delay):
+                break
+            delay = min(delay * 2, STREAM_MAX_RECONNECT_DELAY)
+
+    def receive(self, symbol: str, quote: dict):
+        """
+        Pass on a received quote
+        :param symbol: Quote's symbol
+        :param quote: Price data
+        """
+        self.received[symbol] = time.time()
+        try:
+            self.on_quote(symbol, quote)
+        except Exception as e:
+            logging.error(f'Unable to apply streamed quote for {symbol}: {e}')
+
+    def is_live(self, symbol: str, max_age: float) -> bool:
+        """
+        Determine if a symbol's price is kept up-to-date by the stream, so that it need not be polled
+        :param symbol: Symbol
+        :param max_age: Time within which a quote must have been received (in seconds)
+        :return: is_live: (bool)
+        """
+        return self.connected and time.time() - self.received.get(symbol, 0) < max_age
+
+    @abstractmethod
+    def quotes(self) -> Iterator[Tuple[str, dict]]:
+        """
+        Connect, and yield quotes as they are received, until the connection drops
+        :return: quotes: Symbol and price data of each quote
+        """
+        ...
+
+    def disconnect(self):
+        """Close the connection, if open"""
+        pass
+
+
+class SSEQuoteStream(QuoteStream):
+    """
+    Quote stream over server-sent events. Subscribes with a GET request to the stream's URL, with a comma-separated
+    list of symbols as the symbols query parameter. Each quote is sent as a JSON object in the data of a quote event,
+    along with its symbol. Comments are ignored, and may be sent to keep the connection alive.
+
+    Arguments:
+        url (str):                                  Stream URL
+        on_quote (Callable[[str, dict], None]):     Called with each quote's symbol and price data
+    """
+
+    def __init__(self, url: str, on_quote: Callable[[str, dict], None]):
+        super().__init__(on_quote)
+        self.url: str = url
+        self.response = None
+
+    def quotes(self) -> Iterator[Tuple[str, dict]]:
+        self.response = http_session().get(self.url,
+                                           params={'symbols': ','.join(self.symbols)},
+                                           headers={'Accept': 'text/event-stream', 'Cache-Control': 'no-cache'},
+                                           timeout=(HTTP_TIMEOUT, STREAM_READ_TIMEOUT),
+                                           stream=True)
+        with self.response:
+            self.response.raise_for_status()
+            self.response.encoding = 'utf-8'
+            self.connected = True
+            logging.info(f'Quote stream connected to {self.url}')
+            for event, data in parse_events(self.response.iter_lines(chunk_size=None, decode_unicode=True)):
+                if event != 'quote':
+                    continue
+                try:
+                    quote = json.loads(data)
+                    symbol = quote.pop('symbol')
+                except (ValueError, KeyError, AttributeError):
+                    logging.warning(f'Invalid streamed quote: {data}')
+                    continue
+                yield symbol, quote
+
+    def disconnect(self):
+        response = self.response
+        if response is not None:
+            try:
+                response.close()
+            except (RequestException, OSError):
+                pass
+
+
+def parse_events(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Parse server-sent events
+    :param lines: Lines of the event stream, without line endings
+    :return: events: Type and data of each event
+    """
+    event, data = 'message', []
+    for line in lines:
+        if not line:  # Blank line dispatches the event
+            if data:
+                yield event, '\n'.join(data)
+            event, data = 'message', []
+        elif not line.startswith(':'):  # Not a comment
+            name, _, value = line.partition(':')
+            value = value[1:] if value.startswith(' ') else value
+            if name == 'event':
+                event = value
+            elif name == 'data':
+                data.append(value)
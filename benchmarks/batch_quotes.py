@@ -0,0 +1,51 @@
+"""
+Benchmark quote fetching for growing watchlists: one request per symbol vs. batched requests.
+Responses are replayed from a synthetic cassette with a fixed round-trip latency, so results are repeatable without a
+network.
+
+Usage: python3 -m benchmarks.batch_quotes [--latency 0.05] [--batch-size 50]
+"""
+import argparse
+import time
+
+from api import data
+from api.provider import ReplayProvider
+from benchmarks.cassette import synthetic_cassette
+from constants import DEFAULT_BATCH_SIZE
+
+WATCHLIST_SIZES = [5, 10, 20, 40, 60, 120, 240]
+
+
+def per_symbol(provider: ReplayProvider, symbols: list):
+    for symbol in symbols:
+        provider.price(symbol)
+
+
+def batched(provider: ReplayProvider, symbols: list, batch_size: int):
+    data.fetch_quotes(provider, symbols, batch_size)
+
+
+def measure(fn, provider: ReplayProvider, *args) -> tuple:
+    provider.requests = 0
+    start = time.perf_counter()
+    fn(provider, *args)
+    return provider.requests, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='batch_quotes')
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated round-trip time (in seconds)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Symbols per batch request')
+    args = parser.parse_args()
+
+    print(f'{"symbols":>8} | {"per-symbol reqs":>15} {"time (s)":>9} | {"batched reqs":>12} {"time (s)":>9}')
+    for size in WATCHLIST_SIZES:
+        symbols = [f'SYM{i}' for i in range(size)]
+        provider = ReplayProvider(synthetic_cassette(symbols, bars=1), latency=args.latency)
+        single_reqs, single_time = measure(per_symbol, provider, symbols)
+        batch_reqs, batch_time = measure(batched, provider, symbols, args.batch_size)
+        print(f'{size:>8} | {single_reqs:>15} {single_time:>9.3f} | {batch_reqs:>12} {batch_time:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
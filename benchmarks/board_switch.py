@@ -0,0 +1,62 @@
+"""
+Measure the latency of switching from one ticker's frame to the next, on an emulated matrix.
+Tickers of a synthetic watchlist are displayed in turn, with a short rotation rate. Each switch pushes a frame, so that
+the time between pushes, minus the rotation rate, is the time taken to switch frames once a rotation is over.
+Watchlists larger than BOARD_CACHE_SIZE have every frame composed from scratch.
+
+Usage: python3 -m benchmarks.board_switch [--symbols 100] [--rotation-rate 0.05] [--passes 2]
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+from unittest import mock
+
+from PIL import Image, ImageDraw
+
+from api.data import Data
+from api.provider import ReplayProvider
+from benchmarks.cassette import synthetic_cassette
+from matrix import matrix_config
+from matrix.emulator import EmulatedMatrix, EmulatedMatrixOptions
+from matrix.matrix_config import MatrixConfig
+from renderer.stock import StockRenderer
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='board_switch')
+    parser.add_argument('--symbols', type=int, default=100, help='Watchlist size')
+    parser.add_argument('--rotation-rate', type=float, default=0.05, help='Seconds each ticker is displayed for')
+    parser.add_argument('--passes', type=int, default=2, help='Times the watchlist is displayed')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    provider = ReplayProvider(synthetic_cassette([f'SYM{i}' for i in range(args.symbols)]), 0)
+    with mock.patch.object(matrix_config, 'CONFIG_FILE', 'matrix/config.json.example'):
+        config = MatrixConfig(64, 32)
+    config.stocks, config.cryptos, config.forex = list(provider.cassette['quotes']), [], []
+    config.rotation_rate = args.rotation_rate
+
+    options = EmulatedMatrixOptions()
+    options.cols = 64
+    matrix = EmulatedMatrix(options)
+    canvas = Image.new('RGB', (matrix.width, matrix.height))
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        data = Data(config, provider=provider)
+        data.initialized.wait()
+        renderer = StockRenderer(matrix, canvas, ImageDraw.Draw(canvas), config, data)
+        for _ in range(args.passes):
+            renderer.render()
+
+    times = list(matrix.frame_times)
+    latencies = sorted((later - earlier - args.rotation_rate) * 1000 for earlier, later in zip(times, times[1:]))
+    print(f'Switches: {len(latencies)}, {args.symbols} tickers, {args.rotation_rate * 1000:.0f}ms rotation')
+    print(f'Switch latency: p50 {statistics.median(latencies):.3f}ms, '
+          f'p99 {latencies[int(0.99 * (len(latencies) - 1))]:.3f}ms, max {latencies[-1]:.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Synthetic cassettes, replayed by ReplayProvider in place of recorded responses, for benchmarks of any watchlist size.
+Prices follow a seeded random walk, so that every run replays the same data.
+"""
+import random
+import time
+from typing import List
+
+from api.provider import CASSETTE_VERSION
+
+
+def synthetic_cassette(symbols: List[str], bars: int = 390, seed: int = 0) -> dict:
+    """
+    Generate a cassette with price data, a profile, and a trading day of 1-minute bars for each symbol
+    :param symbols: Symbols to include
+    :param bars: Bars per symbol
+    :param seed: Random seed
+    :return: cassette: (dict) Cassette, as recorded by RecordingProvider
+    """
+    rng = random.Random(seed)
+    now = int(time.time()) // 60 * 60
+    cassette = {'version': CASSETTE_VERSION, 'recorded': now, 'quotes': {}, 'profiles': {}, 'history': {},
+                'exchange_rates': {'USD': 1.0, 'EUR': 0.9, 'GBP': 0.8, 'JPY': 150.0}}
+    for symbol in symbols:
+        prev_close = round(rng.uniform(10, 500), 2)
+        prices = [prev_close]
+        for _ in range(bars - 1):
+            prices.append(round(prices[-1] * (1 + rng.gauss(0, 0.001)), 2))
+        cassette['quotes'][symbol] = {
+            'symbol': symbol,
+            'shortName': symbol,
+            'quoteType': 'EQUITY',
+            'exchange': 'NMS',
+            'marketState': 'REGULAR',
+            'regularMarketPrice': prices[-1],
+            'regularMarketPreviousClose': prev_close,
+            'regularMarketChange': round(prices[-1] - prev_close, 2),
+            'regularMarketChangePercent': (prices[-1] - prev_close) / prev_close
+        }
+        cassette['profiles'][symbol] = {'website': f'https://www.{symbol.lower()}.com'}
+        cassette['history'][symbol] = {'timestamps': [now - (bars - 1 - i) * 60 for i in range(bars)],
+                                       'prices': prices}
+    return cassette
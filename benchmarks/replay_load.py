@@ -0,0 +1,63 @@
+"""
+Load test of Data.initialize and Data.update with large watchlists, replayed without network access, along with the
+time it takes for the first tickers to be ready to be displayed.
+Responses come from a cassette recorded with --record, or from a synthetic one, with a fixed round-trip latency.
+Cache files are written to a temporary directory.
+
+Usage: python3 -m benchmarks.replay_load [--symbols 2000] [--latency 0.02] [--cassette recording.json.gz]
+       [--page-size 20]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from unittest import mock
+
+from api.data import Data
+from api.provider import ReplayProvider
+from benchmarks.cassette import synthetic_cassette
+from matrix import matrix_config
+from matrix.matrix_config import MatrixConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='replay_load')
+    parser.add_argument('--symbols', type=int, default=2000, help='Watchlist size, with a synthetic cassette')
+    parser.add_argument('--latency', type=float, default=0.02, help='Simulated round-trip time (in seconds)')
+    parser.add_argument('--cassette', help='Recorded cassette to replay, instead of a synthetic one')
+    parser.add_argument('--batch-size', type=int, help='Symbols per batch request')
+    parser.add_argument('--page-size', type=int, help='Tickers per page, of which two keep chart data')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.cassette:
+        provider = ReplayProvider.from_file(args.cassette, args.latency)
+    else:
+        symbols = [f'SYM{i}' for i in range(args.symbols)]
+        provider = ReplayProvider(synthetic_cassette(symbols), args.latency)
+    with mock.patch.object(matrix_config, 'CONFIG_FILE', 'matrix/config.json.example'):
+        config = MatrixConfig(64, 32)
+    config.stocks, config.cryptos, config.forex = list(provider.cassette['quotes']), [], []
+    config.batch_size = args.batch_size or config.batch_size
+    config.page_size = args.page_size or config.page_size
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        print(f'{"step":>10} | {"tickers":>7} {"requests":>8} {"time (s)":>9}')
+        start = time.perf_counter()
+        data = Data(config, provider=provider)
+        data.initialized.wait()
+        print(f'{"initialize":>10} | {data.valid_tickers:>7} {provider.requests:>8} {time.perf_counter() - start:>9.3f}')
+
+        provider.requests = 0
+        data.scheduler.next_update.clear()  # Every ticker due
+        start = time.perf_counter()
+        data.update()
+        print(f'{"update":>10} | {data.valid_tickers:>7} {provider.requests:>8} {time.perf_counter() - start:>9.3f}')
+        print(data.last_cycle.summary())
+        print(f'First tickers ready after {data.time_to_first_ticker:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Measure the CPU time taken per frame of scrolling text, and the jitter of the time between scroll frames.
+A name too wide for the matrix is scrolled on an emulated matrix while its frame is held, at an accelerated scroll
+speed, so that frame pacing is stressed. CPU time is that of the whole process, divided by the frames displayed.
+Jitter is the standard deviation of the time between frames while the text moves, i.e. Excluding its stops.
+The text is scrolled twice: from a pre-rendered strip, paced by deadlines, and as it was before (old), drawing and
+measuring the text and pushing the whole canvas at every step, then sleeping a pixel's scroll time, as with
+TEXT_SCROLL_SPEED.
+
+Usage: python3 -m benchmarks.scroll_frames [--duration 8] [--speed 0.01] [--pause 0.5]
+"""
+import argparse
+import statistics
+import time
+import warnings
+from types import SimpleNamespace
+from typing import List, Tuple
+
+from PIL import Image, ImageDraw
+
+from matrix.emulator import EmulatedMatrix, EmulatedMatrixOptions
+from renderer.renderer import Renderer
+from util.color import Color
+from util.glyph_atlas import GlyphAtlas
+from util.utils import load_font
+
+TEXT = 'Synthetic Holdings, Inc. Class A Common Stock'
+
+
+class ScrollRenderer(Renderer):
+    def render(self):
+        pass
+
+
+def scroll(matrix: EmulatedMatrix, canvas: Image.Image, args: argparse.Namespace):
+    """
+    Scroll the text from a pre-rendered strip, while its frame is held
+    :param matrix: Matrix to display frames on
+    :param canvas: Canvas associated with matrix
+    :param args: Benchmark's arguments
+    """
+    font = GlyphAtlas(load_font('7x13.ttf', 13))
+    config = SimpleNamespace(layout=SimpleNamespace(font=font), rotation_rate=args.duration)
+    renderer = ScrollRenderer(matrix, canvas, ImageDraw.Draw(canvas), config)
+    renderer.clear()
+    renderer.scroll_text(TEXT, font, Color.WHITE, Color.BLACK, (1, 0))
+    for scrolling in renderer.scrolling:
+        scrolling.speed, scrolling.pause = args.speed, args.pause
+    renderer.show()
+    renderer.hold(args.duration)
+
+
+def scroll_old(matrix: EmulatedMatrix, canvas: Image.Image, args: argparse.Namespace):
+    """
+    Scroll the text as it was before strips were pre-rendered: drawn and measured again, and the whole canvas pushed,
+    at every step, with a fixed sleep between steps
+    :param matrix: Matrix to display frames on
+    :param canvas: Canvas associated with matrix
+    :param args: Benchmark's arguments
+    """
+    warnings.simplefilter('ignore', DeprecationWarning)  # font.getsize, as it was used
+    font, draw = load_font('7x13.ttf', 13), ImageDraw.Draw(canvas)
+    x, y = 1, 0
+    begin = x
+    end = (matrix.width, y + font.getsize(TEXT)[1] - 1)
+    direction, new_direction = -1, True
+    started = time.monotonic()
+    while time.monotonic() - started < args.duration:
+        draw.rectangle(((x - 1, y), end), Color.BLACK)
+        draw.text((x, y), TEXT, Color.WHITE, font)
+        matrix.SetImage(canvas)
+        if font.getsize(TEXT)[0] + x < matrix.width:  # End of text is now visible
+            direction, new_direction = 1, True
+        elif x == begin:  # Text is back to starting position
+            direction, new_direction = -1, True
+        x += direction
+        time.sleep(args.pause if new_direction else args.speed)
+        new_direction = False
+
+
+def measure(mode, args: argparse.Namespace) -> Tuple[int, float, List[float]]:
+    """
+    Scroll the text on a new emulated matrix
+    :param mode: Function scrolling the text
+    :param args: Benchmark's arguments
+    :return: frames, cpu, moving: Frames displayed, CPU time (in seconds), and time between frames while the text
+    moves (in seconds)
+    """
+    options = EmulatedMatrixOptions()
+    options.cols = 64
+    matrix = EmulatedMatrix(options)
+    canvas = Image.new('RGB', (matrix.width, matrix.height))
+    cpu = time.process_time()
+    mode(matrix, canvas, args)
+    cpu = time.process_time() - cpu
+    times = list(matrix.frame_times)
+    intervals = [later - earlier for earlier, later in zip(times, times[1:])]
+    return matrix.frames, cpu, [interval for interval in intervals if interval < 2 * args.speed]
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='scroll_frames')
+    parser.add_argument('--duration', type=float, default=8, help='Seconds the frame is held for')
+    parser.add_argument('--speed', type=float, default=0.01, help='Seconds taken to scroll by a pixel')
+    parser.add_argument('--pause', type=float, default=0.5, help='Seconds the text stops for at either end')
+    args = parser.parse_args()
+
+    print(f'{args.duration:.0f}s, {args.speed * 1000:.0f}ms per pixel')
+    print(f'{"mode":>6} | {"frames":>6} {"CPU/frame (ms)":>14} {"mean (ms)":>10} {"jitter (ms)":>11} '
+          f'{"worst off (ms)":>14}')
+    for name, mode in (('old', scroll_old), ('strip', scroll)):
+        frames, cpu, moving = measure(mode, args)
+        print(f'{name:>6} | {frames:>6} {cpu / frames * 1000:>14.3f} {statistics.mean(moving) * 1000:>10.2f} '
+              f'{statistics.pstdev(moving) * 1000:>11.3f} '
+              f'{max(abs(interval - args.speed) for interval in moving) * 1000:>14.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Measure how long a price change takes to reach its ticker through a quote stream, compared to polling.
+Quotes are pushed by a local stand-in streaming server, and received by SSEQuoteStream, over loopback. Meanwhile, the
+same server is polled for its last quote every poll interval, which stands in for update_rate, scaled down. A price
+change is seen by polling once a poll returns it, or a later quote which overwrote it.
+
+Usage: python3 -m benchmarks.stream_latency [--quotes 1000] [--interval 0.005] [--poll-interval 0.05]
+"""
+import argparse
+import statistics
+import threading
+import time
+from typing import List, Tuple
+
+import requests
+
+from api.stream import SSEQuoteStream
+from benchmarks.stream_server import QuoteStreamServer
+
+
+def poll(url: str, symbol: str, interval: float, stopped: threading.Event, polls: List[Tuple[float, float]]):
+    """
+    Poll the server for a symbol's last quote
+    :param url: Server's quote URL
+    :param symbol: Symbol to poll
+    :param interval: Time between polls (in seconds)
+    :param stopped: Set to stop polling
+    :param polls: Time each poll returned at, and time its quote was published at (epoch)
+    """
+    session = requests.Session()
+    while not stopped.wait(interval):
+        quote = session.get(url, params={'symbols': symbol}, timeout=1).json().get(symbol)
+        if quote:
+            polls.append((time.time(), quote['time']))
+
+
+def polling_latencies(published: List[float], polls: List[Tuple[float, float]]) -> List[float]:
+    """
+    Delay until each published quote was seen by polling, i.e. Until a poll returned it, or a later quote
+    :param published: Time each quote was published at (epoch), in order
+    :param polls: Time each poll returned at, and time its quote was published at (epoch), in order
+    :return: latencies: (list) Delays of the quotes seen before polling stopped (in seconds)
+    """
+    latencies, index = [], 0
+    for seen, quote_time in polls:
+        while index < len(published) and published[index] <= quote_time:
+            latencies.append(seen - published[index])
+            index += 1
+    return latencies
+
+
+def row(source: str, latencies: List[float]) -> str:
+    latencies = sorted(latency * 1000 for latency in latencies)
+    return (f'{source:>15} | {len(latencies):>8} {statistics.mean(latencies):>10.2f} '
+            f'{latencies[int(len(latencies) * 0.95) - 1]:>10.2f} {latencies[-1]:>10.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='stream_latency')
+    parser.add_argument('--quotes', type=int, default=1000, help='Quotes to push')
+    parser.add_argument('--interval', type=float, default=0.005, help='Seconds between quotes')
+    parser.add_argument('--poll-interval', type=float, default=0.05, help='Seconds between polls')
+    args = parser.parse_args()
+
+    latencies, published, polls = [], [], []
+    done, stopped = threading.Event(), threading.Event()
+
+    def on_quote(symbol: str, quote: dict):
+        latencies.append(time.time() - quote['time'])
+        if len(latencies) == args.quotes:
+            done.set()
+
+    server = QuoteStreamServer().start()
+    stream = SSEQuoteStream(server.url, on_quote)
+    stream.start(['AMZN'])
+    while not stream.connected:
+        time.sleep(0.01)
+    poller = threading.Thread(target=poll, args=(server.url.replace('/quotes', '/quote'), 'AMZN', args.poll_interval,
+                                                 stopped, polls), daemon=True)
+    poller.start()
+    for i in range(args.quotes):
+        published.append(time.time())
+        server.publish('AMZN', {'regularMarketPrice': 100.0 + i / 100, 'time': published[-1]})
+        time.sleep(args.interval)
+    done.wait(5)
+    time.sleep(2 * args.poll_interval)  # Last quote polled
+    stopped.set()
+    poller.join()
+    stream.stop()
+    server.stop()
+
+    print(f'{"source":>15} | {"received":>8} {"mean (ms)":>10} {"p95 (ms)":>10} {"max (ms)":>10}')
+    print(row('stream', latencies))
+    print(row(f'polling ({args.poll_interval * 1000:.0f}ms)', polling_latencies(published, polls)))
+
+
+if __name__ == '__main__':
+    main()
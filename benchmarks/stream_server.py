@@ -0,0 +1,194 @@
+"""
+Local stand-in for a streaming quote source, pushing quotes as server-sent events, as expected by SSEQuoteStream.
+Clients subscribe with GET /quotes?symbols=AMZN,BTC-USD. Prices of subscribed symbols follow a random walk.
+The last quote published for each symbol can also be polled, with GET /quote?symbols=AMZN,BTC-USD.
+Used by tests, and by the stream latency benchmark.
+
+Usage: python3 -m benchmarks.stream_server [--port 8765] [--interval 1.0]
+Then set "stream_url" to "http://<host>:8765/quotes" in config.json.
+"""
+import argparse
+import json
+import queue
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Set, Tuple
+from urllib.parse import urlparse, parse_qs
+
+
+class StreamHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Chunked transfer encoding, so that each event is received as soon as it is sent
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        symbols = set(parse_qs(url.query).get('symbols', [''])[0].split(',')) - {''}
+        if url.path == '/quote':
+            self.send_quotes(symbols)
+            return
+        if url.path != '/quotes':
+            self.send_error(404)
+            return
+        subscription = self.server.subscribe(symbols)  # Before responding, so that no quote is missed
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            while True:
+                try:
+                    item = subscription.get(timeout=self.server.keepalive)
+                except queue.Empty:
+                    self.write_chunk(b': keep-alive\n\n')
+                    continue
+                if item is None:  # Disconnected by the server
+                    break
+                symbol, quote = item
+                self.write_chunk(f'event: quote\ndata: {json.dumps({"symbol": symbol, **quote})}\n\n'.encode())
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.server.unsubscribe(subscription)
+            self.close_connection = True
+
+    def send_quotes(self, symbols: Set[str]):
+        body = json.dumps(self.server.last_quotes(symbols)).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def write_chunk(self, data: bytes):
+        self.wfile.write(f'{len(data):X}\r\n'.encode() + data + b'\r\n')
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+class QuoteStreamServer(ThreadingHTTPServer):
+    """
+    Server-sent events server pushing published quotes to the clients subscribed to their symbol
+
+    Arguments:
+        address (Tuple[str, int]):      Address to listen on. Port 0 picks a free port.
+        keepalive (float):              Time without quotes after which a comment is sent (in seconds)
+    """
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int] = ('127.0.0.1', 0), keepalive: float = 15):
+        super().__init__(address, StreamHandler)
+        self.keepalive: float = keepalive
+        self.subscriptions: List[Tuple[Set[str], queue.Queue]] = []
+        self.quotes: Dict[str, dict] = {}
+        self.lock: threading.Lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/quotes'
+
+    def subscribe(self, symbols: Set[str]) -> queue.Queue:
+        subscription = queue.Queue()
+        with self.lock:
+            self.subscriptions.append((symbols, subscription))
+        return subscription
+
+    def unsubscribe(self, subscription: queue.Queue):
+        with self.lock:
+            self.subscriptions = [(s, q) for s, q in self.subscriptions if q is not subscription]
+
+    def subscribed(self) -> Set[str]:
+        """
+        Symbols subscribed to by any client
+        :return: symbols: (set)
+        """
+        with self.lock:
+            return set().union(*(symbols for symbols, _ in self.subscriptions))
+
+    def publish(self, symbol: str, quote: dict):
+        """
+        Push a quote to the clients subscribed to its symbol
+        :param symbol: Quote's symbol
+        :param quote: Price data
+        """
+        with self.lock:
+            self.quotes[symbol] = quote
+            for symbols, subscription in self.subscriptions:
+                if symbol in symbols:
+                    subscription.put((symbol, quote))
+
+    def last_quotes(self, symbols: Set[str]) -> Dict[str, dict]:
+        """
+        Last quote published for each of the given symbols
+        :param symbols: Symbols
+        :return: quotes: (dict) Price data keyed by symbol. Symbols without quotes are not included.
+        """
+        with self.lock:
+            return {symbol: self.quotes[symbol] for symbol in symbols if symbol in self.quotes}
+
+    def disconnect_all(self):
+        """Close every client's stream"""
+        with self.lock:
+            for _, subscription in self.subscriptions:
+                subscription.put(None)
+
+    def start(self) -> 'QuoteStreamServer':
+        threading.Thread(target=self.serve_forever, name='stream-server', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.disconnect_all()
+        self.shutdown()
+        self.server_close()
+
+
+def random_walk(server: QuoteStreamServer, interval: float, stopped: threading.Event):
+    """
+    Publish a quote for a random subscribed symbol every interval, with its price moved at random
+    :param server: Server to publish on
+    :param interval: Time between quotes (in seconds)
+    :param stopped: Set to stop publishing
+    """
+    prices = {}
+    while not stopped.wait(interval):
+        symbols = sorted(server.subscribed())
+        if not symbols:
+            continue
+        symbol = random.choice(symbols)
+        prev_close = 100.0
+        price = prices.get(symbol, prev_close) * (1 + random.gauss(0, 0.002))
+        prices[symbol] = price
+        server.publish(symbol, {
+            'regularMarketPrice': round(price, 2),
+            'regularMarketChange': round(price - prev_close, 2),
+            'regularMarketChangePercent': (price - prev_close) / prev_close,
+            'time': time.time()
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='stream_server')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    parser.add_argument('--interval', type=float, default=1.0, help='Seconds between quotes')
+    args = parser.parse_args()
+
+    server = QuoteStreamServer((args.host, args.port))
+    stopped = threading.Event()
+    threading.Thread(target=random_walk, args=(server, args.interval, stopped), daemon=True).start()
+    print(f'Streaming quotes on {server.url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        stopped.set()
+        server.disconnect_all()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
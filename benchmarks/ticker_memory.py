@@ -0,0 +1,113 @@
+"""
+Measure the memory held per ticker, once initialized, for a growing watchlist.
+Tickers are initialized from a synthetic cassette, whose quotes are padded with the other fields of Yahoo Finance's
+quote payloads, and decoded from JSON as a batch request's would be, so that raw payloads kept by tickers weigh what
+they would on a device. Memory is traced with tracemalloc, and includes each ticker's price data, history and
+published quote. Images are not loaded.
+Tickers are measured twice: as they are, and as they were before price data was parsed on arrival (baseline), keeping
+the raw payload, the full price data, and a yahooquery ticker of their own, with its own session. The requests made to
+set up yahooquery sessions are skipped.
+
+Usage: python3 -m benchmarks.ticker_memory [--bars 390]
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from unittest import mock
+
+import yahooquery
+from yahooquery import base, session_management
+
+from api.provider import ReplayProvider
+from benchmarks.cassette import synthetic_cassette
+from data.stock import Stock
+from data.ticker import Ticker
+
+WATCHLIST_SIZES = [10, 100, 500, 1000]
+
+# Fields of a quote payload, other than those of synthetic cassettes, with typical values
+YAHOO_FIELDS = {
+    'language': 'en-US', 'region': 'US', 'typeDisp': 'Equity', 'quoteSourceName': 'Nasdaq Real Time Price',
+    'triggerable': True, 'customPriceAlertConfidence': 'HIGH', 'currency': 'USD', 'exchangeTimezoneName':
+    'America/New_York', 'exchangeTimezoneShortName': 'EST', 'gmtOffSetMilliseconds': -18000000, 'market': 'us_market',
+    'esgPopulated': False, 'firstTradeDateMilliseconds': 863703000000, 'priceHint': 2, 'postMarketChangePercent':
+    0.1275, 'postMarketTime': 1700000000, 'postMarketPrice': 145.3, 'postMarketChange': 0.185,
+    'regularMarketTime': 1700000000, 'regularMarketDayHigh': 146.1, 'regularMarketDayRange': '143.5 - 146.1',
+    'regularMarketDayLow': 143.5, 'regularMarketVolume': 51234567, 'regularMarketOpen': 144.0, 'bid': 145.2,
+    'ask': 145.35, 'bidSize': 10, 'askSize': 12, 'fullExchangeName': 'NasdaqGS', 'financialCurrency': 'USD',
+    'averageDailyVolume3Month': 48000000, 'averageDailyVolume10Day': 52000000, 'fiftyTwoWeekLowChange': 57.2,
+    'fiftyTwoWeekLowChangePercent': 0.648, 'fiftyTwoWeekRange': '88.0 - 149.3', 'fiftyTwoWeekHighChange': -4.2,
+    'fiftyTwoWeekHighChangePercent': -0.028, 'fiftyTwoWeekLow': 88.0, 'fiftyTwoWeekHigh': 149.3,
+    'earningsTimestamp': 1698958800, 'earningsTimestampStart': 1706648340, 'earningsTimestampEnd': 1707163200,
+    'trailingAnnualDividendRate': 0.0, 'trailingPE': 105.2, 'trailingAnnualDividendYield': 0.0,
+    'epsTrailingTwelveMonths': 1.38, 'epsForward': 3.54, 'epsCurrentYear': 2.62, 'priceEpsCurrentYear': 55.4,
+    'sharesOutstanding': 10317000000,
+    'bookValue': 19.44, 'fiftyDayAverage': 133.2, 'fiftyDayAverageChange': 11.9, 'fiftyDayAverageChangePercent': 0.089,
+    'twoHundredDayAverage': 121.4, 'twoHundredDayAverageChange': 23.7, 'twoHundredDayAverageChangePercent': 0.195,
+    'marketCap': 1496000000000, 'forwardPE': 41.0, 'priceToBook': 7.46, 'sourceInterval': 15,
+    'exchangeDataDelayedBy': 0, 'averageAnalystRating': '1.8 - Buy', 'tradeable': False, 'cryptoTradeable': False,
+    'longName': 'Synthetic Holdings, Inc.', 'messageBoardId': 'finmb_18749', 'displayName': 'Synthetic'
+}
+
+
+def baseline_ticker(symbol: str, payload: str, provider: ReplayProvider) -> Stock:
+    """
+    Ticker as initialized before price data was parsed on arrival
+    :param symbol: Symbol
+    :param payload: Raw payload of the symbol's price data
+    :param provider: Provider to fetch through
+    :return: ticker: (Stock) Ticker keeping its raw payload, full price data and yahooquery ticker
+    """
+    with mock.patch.object(Ticker, 'parse', staticmethod(lambda price_data: price_data)):
+        ticker = Stock(symbol, price_data=json.loads(payload), provider=provider)
+    ticker.payload = payload
+    with mock.patch.object(session_management, 'setup_session', lambda session, url=None: session), \
+            mock.patch.object(base, 'get_crumb', return_value=None):
+        ticker.yq_ticker = yahooquery.Ticker(symbol, timeout=5)
+    return ticker
+
+
+def measure(cassette: dict, symbols: list, baseline: bool = False) -> int:
+    """
+    Memory held by tickers initialized from a cassette
+    :param cassette: Cassette to replay
+    :param symbols: Symbols to initialize
+    :param baseline: Initialize tickers as they were before price data was parsed on arrival
+    :return: size: (int) Bytes held by the tickers
+    """
+    provider = ReplayProvider(cassette)
+    payloads = {symbol: json.dumps(quote) for symbol, quote in cassette['quotes'].items()}
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    if baseline:
+        tickers = [baseline_ticker(symbol, payloads[symbol], provider) for symbol in symbols]
+    else:
+        tickers = [Stock(symbol, price_data=json.loads(payloads[symbol]), provider=provider) for symbol in symbols]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del tickers
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='ticker_memory')
+    parser.add_argument('--bars', type=int, default=390, help='1-minute bars per ticker')
+    args = parser.parse_args()
+
+    print(f'{"":>8} | {"baseline":^28} | {"compact":^28}')
+    print(f'{"tickers":>8} | {"total (KiB)":>12} {"per ticker (B)":>15} | {"total (KiB)":>12} {"per ticker (B)":>15}')
+    for size in WATCHLIST_SIZES:
+        symbols = [f'SYM{i}' for i in range(size)]
+        cassette = synthetic_cassette(symbols, bars=args.bars)
+        for quote in cassette['quotes'].values():
+            quote.update(YAHOO_FIELDS)
+        baseline, total = measure(cassette, symbols, baseline=True), measure(cassette, symbols)
+        print(f'{size:>8} | {baseline / 1024:>12.1f} {baseline // size:>15} | '
+              f'{total / 1024:>12.1f} {total // size:>15}')
+
+
+if __name__ == '__main__':
+    main()
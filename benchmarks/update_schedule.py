@@ -0,0 +1,79 @@
+"""
+Simulate a week of updates of the default watchlist, and count the requests avoided by the update scheduler compared
+to updating every ticker every update_rate. Stocks are assumed to be listed on NASDAQ, with no holidays. Their market
+state, as reported upstream, lags behind the opening bell.
+Requests are counted from the plans of the scheduler, which is only driven through plan() and schedule().
+
+Usage: python3 -m benchmarks.update_schedule [--update-rate 10] [--start 2024-01-08] [--state-lag 1]
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from api.scheduler import UpdateScheduler
+from constants import DEFAULT_STOCKS, DEFAULT_CRYPTOS, DEFAULT_FOREX
+from data.crypto import Crypto
+from data.forex import Forex
+from data.stock import Stock
+from matrix.matrix_config import MatrixConfig
+from util.market_calendar import EXCHANGE_HOURS
+from util.market_status import MarketStatus
+
+
+def snapshot(symbol: str) -> dict:
+    return {
+        'symbol': symbol,
+        'currency': 'USD',
+        'currency_exchange_rate': 1,
+        'name': symbol,
+        'price': 100.0,
+        'prev_close': 99.0,
+        'value_change': 1.0,
+        'pct_change': '1.01%',
+        'history': {'last_timestamp': None, 'bucket_size': 1, 'buckets': '', 'pending': ''},
+        'img': None,
+        'market_status': MarketStatus.OPEN.value,
+        'logo_url': None,
+        'exchange': 'NMS',
+        'img_url': None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='update_schedule')
+    parser.add_argument('--update-rate', type=int, default=10, help='Update rate (in minutes)')
+    parser.add_argument('--start', type=str, default='2024-01-08', help='First day simulated (YYYY-MM-DD)')
+    parser.add_argument('--state-lag', type=int, default=1, help='Market state lag after the opening bell (in minutes)')
+    args = parser.parse_args()
+
+    tickers = ([Stock.from_snapshot(snapshot(symbol)) for symbol in DEFAULT_STOCKS] +
+               [Crypto.from_snapshot(snapshot(symbol)) for symbol in MatrixConfig.format_cryptos(DEFAULT_CRYPTOS)] +
+               [Forex.from_snapshot(snapshot(symbol)) for symbol in MatrixConfig.format_forex(DEFAULT_FOREX)])
+    scheduler = UpdateScheduler(args.update_rate * 60)
+    start = datetime.strptime(args.start, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    hours, lag = EXCHANGE_HOURS['NMS'], timedelta(minutes=args.state_lag)
+
+    print(f'{"day":>10} | {"baseline reqs":>13} | {"quotes avoided":>14} {"history avoided":>15} | {"saved":>6}')
+    for day in range(7):
+        now, end = start + timedelta(days=day), start + timedelta(days=day + 1)
+        ticks, quotes, history = 0, 0, 0
+        while now < end:
+            for ticker in tickers:  # Market state as reported upstream
+                if isinstance(ticker, Stock):
+                    ticker.market_status = MarketStatus.OPEN if hours.is_open(now) and hours.is_open(now - lag) \
+                        else MarketStatus.CLOSED
+            plan = scheduler.plan(tickers, now.timestamp())
+            for ticker, _ in plan:
+                scheduler.schedule(ticker, now.timestamp())
+            quotes += len(plan)
+            history += sum(fetch_history for _, fetch_history in plan)
+            ticks += 1
+            now += timedelta(minutes=args.update_rate)
+        baseline = ticks * len(tickers)  # One quote lookup, and one history request per ticker and update
+        avoided = {'quotes': baseline - quotes, 'history': baseline - history}
+        print(f'{(start + timedelta(days=day)).strftime("%a %m/%d"):>10} | {2 * baseline:>13} | '
+              f'{avoided["quotes"]:>14} {avoided["history"]:>15} | '
+              f'{(avoided["quotes"] + avoided["history"]) / (2 * baseline):>6.1%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,10 @@ LOG_FILE = 'led-stock-ticker.log'
 LOADING_IMAGE = 'assets/img/logo.png'
 ERROR_IMAGE = 'assets/img/error.png'
 FONTS_DIR = 'assets/fonts/'
+CACHE_DIR = 'cache/'
+SNAPSHOT_FILE = CACHE_DIR + 'snapshot.json.gz'
+IMAGE_CACHE_DIR = CACHE_DIR + 'images/'
+EXCHANGE_RATES_FILE = CACHE_DIR + 'exchange_rates.json.gz'
 
 # Software Defaults
 DEFAULT_STOCKS = [
@@ -28,12 +32,50 @@ DEFAULT_FOREX = [
 DEFAULT_CURRENCY = 'USD'
 DEFAULT_DATE_FORMAT = '%a, %b %d'  # eg. Sun, Jan 5
 DEFAULT_UPDATE_RATE = 10 * 60  # 10 minutes
+CLOSED_MARKET_UPDATE_RATE = 60 * 60  # seconds between updates of a closed market with unknown trading hours
+PREFETCH_LEAD = 30  # seconds ahead of display at which tickers are refreshed
+MIN_PRIORITY = 0.5  # update rate multiplier of the quietest tickers
+MAX_PRIORITY = 2.0  # update rate multiplier of the most volatile tickers
+VOLATILITY_SMOOTHING = 0.3  # weight of the latest rate of change in a ticker's volatility
 DEFAULT_ROTATION_RATE = 10  # seconds
+DEFAULT_BATCH_SIZE = 50  # symbols per quote request
+DEFAULT_PAGE_SIZE = 20  # tickers per page. Only the page displayed and the next one keep chart data.
+DEFAULT_FETCH_CONCURRENCY = 8  # concurrent requests
+DEFAULT_FETCH_TIMEOUT = 60  # seconds per update cycle
+STARTUP_TIMEOUT = 30  # seconds after which tickers still initializing are left out until the next update
+LOADING_REFRESH_RATE = 0.2  # seconds between loading progress updates
+HTTP_TIMEOUT = 5  # seconds per request
+HTTP_POOL_HOSTS = 10  # hosts with pooled connections
+HTTP_POOL_SIZE = 8  # pooled connections per host
+UPSTREAM_RATE = 10  # requests per second per host, on average
+UPSTREAM_BURST = 20  # requests sent at once per host, at most
+CIRCUIT_FAILURE_THRESHOLD = 5  # consecutive failed requests after which requests to a host are stopped
+CIRCUIT_RESET_TIMEOUT = 30  # seconds after which a host whose requests were stopped is probed again
+QUARANTINE_THRESHOLD = 3  # consecutive failed updates after which a ticker is quarantined
+QUARANTINE_BACKOFF = 60  # seconds a ticker is first quarantined for, doubled after each failure
+QUARANTINE_MAX_BACKOFF = 60 * 60  # seconds a ticker is quarantined for at most
+STREAM_READ_TIMEOUT = 60  # seconds without any event after which a quote stream reconnects
+STREAM_RECONNECT_DELAY = 1  # seconds before the first reconnection attempt, doubled after each failure
+STREAM_MAX_RECONNECT_DELAY = 60  # seconds between reconnection attempts at most
+RECORDING_SAVE_INTERVAL = 30  # seconds between saves of recorded responses
+SNAPSHOT_SAVE_INTERVAL = 5 * 60  # seconds between saves of the snapshot, after updates
+CHART_MIN_POINTS = 100  # minimum price points for a history chart
+DEFAULT_CHART_WIDTH = 64  # pixels
+HISTORY_MAX_GAP = 12 * 60 * 60  # seconds without bars after which history is fetched again in full
+HISTORY_WINDOW = 24 * 60 * 60  # seconds of history kept
+IMAGE_PREFETCH_CONCURRENCY = 8  # concurrent image downloads
+IMAGE_CACHE_MAX_SIZE = 16 * 1024 * 1024  # bytes of cached images
+IMAGE_REVALIDATE_AGE = 7 * 24 * 60 * 60  # seconds after which a cached image is revalidated
 TEXT_SCROLL_DELAY = 0.5  # seconds
 TEXT_SCROLL_SPEED = 0.3  # seconds
+TEXT_SCROLL_PAUSE = 1.5  # seconds scrolling text stops for at either end
+TEXT_MASK_CACHE_SIZE = 256  # strings whose rasterized masks are kept per font
+BOARD_CACHE_SIZE = 64  # ticker boards kept per renderer, along with their layers
+EMULATOR_FRAME_HISTORY = 1000  # frame timestamps kept by an emulated matrix
 
 # Exchange Rate API
 CURRENCY_EXCHANGE_URL = 'https://open.er-api.com/v6/latest/USD'
+EXCHANGE_RATE_TTL = 60 * 60  # seconds after which exchange rates are refreshed
 
 # Image sources
 STOCK_LOGO_URL = 'https://logo.clearbit.com/{}'
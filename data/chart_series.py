@@ -0,0 +1,178 @@
+import math
+
+import numpy as np
+
+from constants import HISTORY_WINDOW
+
+
+class ChartSeries:
+    """
+    Fixed-capacity ring buffer of chart prices, downsampled at ingest.
+    Prices are grouped in buckets, each stored as its minimum and maximum price, in the order they occurred, which
+    preserves the series' shape. Buckets start with a single price. Once the buffer is full, adjacent buckets are
+    merged, doubling the bucket size, until the buffer spans at least HISTORY_WINDOW of 1-minute prices. From then
+    on, the oldest bucket is dropped for each new one. Memory used is constant.
+    Buffers can be released while the series is not needed (i.e. Ticker not about to be displayed), and are allocated
+    again once a price is appended.
+
+    Arguments:
+        width (int):                    Chart width (in pixels). Number of buckets kept.
+
+    Attributes:
+        bucket_size (int):              Number of prices per bucket
+        max_bucket_size (int):          Bucket size at which buckets stop being merged
+        version (int):                  Incremented on every change
+    """
+
+    def __init__(self, width: int):
+        self.width: int = width
+        self.max_bucket_size: int = 2 ** max(0, math.ceil(math.log2(HISTORY_WINDOW / 60 / width)))
+        self.bucket_size: int = 1
+        self.version: int = 0
+        self._buckets: np.ndarray = None
+        self._start: int = 0
+        self._count: int = 0
+        self._pending: np.ndarray = None
+        self._pending_count: int = 0
+        self._values: np.ndarray = None
+        self._allocate()
+
+    def __len__(self) -> int:
+        return len(self.values())
+
+    def append(self, price: float):
+        """
+        Append a new price
+        :param price: (float) Price
+        """
+        self._allocate()
+        if self._pending_count >= self.bucket_size:
+            self._push(self._extremes(self._pending[:self._pending_count]))
+            self._pending_count = 0
+        self._pending[self._pending_count] = price
+        self._pending_count += 1
+        self._changed()
+
+    def extend(self, prices: list):
+        """
+        Append new prices
+        :param prices: (list) Prices, oldest first
+        """
+        for price in prices:
+            self.append(price)
+
+    def replace_last(self, price: float):
+        """
+        Replace the last price appended. i.e. Price of a bar that was still forming.
+        :param price: (float) Price
+        """
+        if self._pending_count:
+            self._pending[self._pending_count - 1] = price
+            self._changed()
+        else:
+            self.append(price)
+
+    def clear(self):
+        """Remove all prices"""
+        self.bucket_size = 1
+        self._start, self._count, self._pending_count = 0, 0, 0
+        self._changed()
+
+    def release(self):
+        """Remove all prices, and free the series' buffers until a price is appended again"""
+        self.clear()
+        self._buckets, self._pending = None, None
+
+    @property
+    def released(self) -> bool:
+        """
+        Whether the series' buffers are released
+        :return: released: (bool)
+        """
+        return self._buckets is None
+
+    def values(self) -> np.ndarray:
+        """
+        Downsampled prices, oldest first. Includes the extremes of the bucket being filled.
+        :return: values: (np.ndarray) float32 prices. Must not be modified.
+        """
+        if self._values is None and self.released:
+            self._values = np.empty(0, dtype=np.float32)
+        elif self._values is None:
+            buckets = np.roll(self._buckets, -self._start, axis=0)[:self._count].reshape(-1)
+            if self._pending_count:
+                buckets = np.concatenate((buckets, self._extremes(self._pending[:self._pending_count])))
+            self._values = buckets
+        return self._values
+
+    def to_snapshot(self) -> dict:
+        """
+        Series' state
+        :return: snapshot: (dict) Buckets, pending prices and bucket size
+        """
+        if self.released:
+            return {'bucket_size': self.bucket_size, 'buckets': [], 'pending': []}
+        return {
+            'bucket_size': self.bucket_size,
+            'buckets': np.roll(self._buckets, -self._start, axis=0)[:self._count].reshape(-1).tolist(),
+            'pending': self._pending[:self._pending_count].tolist()
+        }
+
+    def restore(self, snapshot: dict):
+        """
+        Restore series' state from a snapshot
+        :param snapshot: (dict) Series' state, as returned by to_snapshot
+        """
+        self._allocate()
+        buckets = np.asarray(snapshot['buckets'], dtype=np.float32).reshape(-1, 2)[-self.width:]
+        pending = snapshot['pending'][:self.max_bucket_size]
+        self.bucket_size = min(max(snapshot['bucket_size'], len(pending), 1), self.max_bucket_size)
+        self._start, self._count = 0, len(buckets)
+        self._buckets[:self._count] = buckets
+        self._pending_count = len(pending)
+        self._pending[:self._pending_count] = pending
+        self._changed()
+
+    def _allocate(self):
+        if self.released:
+            self._buckets = np.empty((self.width, 2), dtype=np.float32)
+            self._pending = np.empty(self.max_bucket_size, dtype=np.float32)
+
+    def _push(self, bucket: np.ndarray):
+        if self._count == self.width:
+            if self.bucket_size * 2 <= self.max_bucket_size:
+                self._compact()
+            else:  # Drop oldest bucket
+                self._start = (self._start + 1) % self.width
+                self._count -= 1
+        self._buckets[(self._start + self._count) % self.width] = bucket
+        self._count += 1
+
+    def _compact(self):
+        """Merge adjacent buckets, halving the number of buckets and doubling the bucket size"""
+        buckets = np.roll(self._buckets, -self._start, axis=0)[:self._count]
+        pairs = buckets[:self._count // 2 * 2].reshape(-1, 4)
+        lo, hi = pairs.argmin(axis=1), pairs.argmax(axis=1)
+        rows = np.arange(len(pairs))
+        first = np.where(lo <= hi, pairs[rows, lo], pairs[rows, hi])
+        second = np.where(lo <= hi, pairs[rows, hi], pairs[rows, lo])
+        merged = np.stack((first, second), axis=1)
+        if self._count % 2:
+            merged = np.concatenate((merged, buckets[-1:]))
+        self._start, self._count = 0, len(merged)
+        self._buckets[:self._count] = merged
+        self.bucket_size *= 2
+
+    @staticmethod
+    def _extremes(prices: np.ndarray) -> np.ndarray:
+        """
+        Minimum and maximum of prices, in the order they occurred
+        :param prices: (np.ndarray) Prices
+        :return: extremes: (np.ndarray) Minimum and maximum prices
+        """
+        lo, hi = int(prices.argmin()), int(prices.argmax())
+        return prices[[lo, hi]] if lo <= hi else prices[[hi, lo]]
+
+    def _changed(self):
+        self.version += 1
+        self._values = None
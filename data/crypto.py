@@ -14,6 +14,14 @@ class Crypto(Ticker):
         self.name = self.name.replace(' USD', '')
         self.img_url = CRYPTO_LOGO_URL.format(self.symbol.replace('-USD', '').lower())
 
-    def update(self) -> Status:
-        super(Crypto, self).update()
-        return Status.SUCCESS
+    def update(self, price_data: dict = None, fetch_history: bool = True, deadline: float = None) -> Status:
+        return super(Crypto, self).update(price_data, fetch_history, deadline)
+
+    def to_snapshot(self) -> dict:
+        snapshot = super(Crypto, self).to_snapshot()
+        snapshot['img_url'] = self.img_url
+        return snapshot
+
+    def restore(self, snapshot: dict):
+        super(Crypto, self).restore(snapshot)
+        self.img_url = snapshot['img_url']
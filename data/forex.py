@@ -15,6 +15,14 @@ class Forex(Ticker):
         if self.valid:
             self.img_url = [FLAG_URL.format(i) for i in self.name.lower().split('/')]
 
-    def update(self) -> Status:
-        super(Forex, self).update()
-        return Status.SUCCESS
+    def update(self, price_data: dict = None, fetch_history: bool = True, deadline: float = None) -> Status:
+        return super(Forex, self).update(price_data, fetch_history, deadline)
+
+    def to_snapshot(self) -> dict:
+        snapshot = super(Forex, self).to_snapshot()
+        snapshot['img_url'] = self.img_url
+        return snapshot
+
+    def restore(self, snapshot: dict):
+        super(Forex, self).restore(snapshot)
+        self.img_url = snapshot['img_url']
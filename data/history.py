@@ -0,0 +1,102 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List
+
+from api.provider import DataProvider
+from constants import CHART_MIN_POINTS, HISTORY_MAX_GAP, DEFAULT_CHART_WIDTH
+from data.chart_series import ChartSeries
+from util.utils import expired
+
+
+@dataclass
+class History:
+    """
+    Intraday (1-minute) price history of a ticker.
+    After an initial backfill, only bars at or after the last known bar are fetched and merged in.
+    The last known bar is always refetched, as it may have still been forming.
+    Bars are fetched without holding the lock, and merged while holding it.
+
+    Arguments:
+        width (int):                    Chart width (in pixels)
+        lock (threading.RLock):         Lock guarding the history's changes. i.e. Its ticker's lock.
+
+    Attributes:
+        series (ChartSeries):           Downsampled close prices
+        last_timestamp (int):           Last bar's timestamp (epoch seconds)
+    """
+    width: int = DEFAULT_CHART_WIDTH
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+    series: ChartSeries = field(init=False)
+    last_timestamp: int = None
+
+    def __post_init__(self):
+        self.series = ChartSeries(self.width)
+
+    def needs_backfill(self) -> bool:
+        """
+        Determine if the whole history has to be fetched again.
+        i.e. No history yet, or the last bar is too old for an incremental fetch to be continuous with it.
+        :return: needs_backfill: (bool)
+        """
+        return self.last_timestamp is None or time.time() - self.last_timestamp > HISTORY_MAX_GAP
+
+    def update(self, provider: DataProvider, symbol: str, deadline: float = None) -> ChartSeries:
+        """
+        Fetch new bars and merge them into the history.
+        :param provider: Provider to fetch bars from
+        :param symbol: Symbol to fetch bars for
+        :param deadline: (float) Time after which fetched bars are discarded instead of merged (monotonic)
+        :return: series: (ChartSeries) Close prices
+        :exception Timeout: If the request timed out
+        """
+        if self.needs_backfill():
+            self.backfill(provider, symbol, deadline)
+        else:
+            start = datetime.fromtimestamp(self.last_timestamp, tz=timezone.utc)
+            bars = provider.history(symbol, start=start)
+            with self.lock:
+                if not expired(deadline):
+                    self.merge(*bars)
+        return self.series
+
+    def backfill(self, provider: DataProvider, symbol: str, deadline: float = None):
+        """
+        Replace history with the last trading day's bars.
+        Go back an additional day at a time, until there are enough bars for a chart.
+        :param provider: Provider to fetch bars from
+        :param symbol: Symbol to fetch bars for
+        :param deadline: (float) Time after which fetched bars are discarded instead of merged (monotonic)
+        """
+        period, attempts = 1, 0
+        timestamps, prices = [], []
+        while len(prices) < CHART_MIN_POINTS and attempts < 5 and not expired(deadline):
+            timestamps, prices = provider.history(symbol, period=f'{period}d')
+            period += 1
+            attempts += 1
+        with self.lock:
+            if prices and not expired(deadline):
+                self.series.clear()
+                self.last_timestamp = None
+                self.merge(timestamps, prices)
+
+    def release(self):
+        """Free the history's prices. The whole history is fetched again on next update."""
+        with self.lock:
+            self.series.release()
+            self.last_timestamp = None
+
+    def merge(self, timestamps: List[int], prices: List[float]):
+        """
+        Merge new bars into the history.
+        A bar at the last known bar's timestamp replaces it, and older bars are ignored.
+        :param timestamps: New bars' timestamps, oldest first
+        :param prices: New bars' close prices
+        """
+        for timestamp, price in zip(timestamps, prices):
+            if self.last_timestamp is None or timestamp > self.last_timestamp:
+                self.series.append(price)
+                self.last_timestamp = timestamp
+            elif timestamp == self.last_timestamp:
+                self.series.replace_last(price)
@@ -1,4 +1,10 @@
+from dataclasses import dataclass
 from enum import Enum, auto
+from typing import Optional
+
+import numpy as np
+
+from util.market_status import MarketStatus
 
 
 class QuoteType(Enum):
@@ -8,3 +14,48 @@ class QuoteType(Enum):
     CURRENCY = auto()
     ETF = auto()
     MUTUALFUND = auto()
+
+
+@dataclass(frozen=True, eq=False)
+class Quote:
+    """
+    Immutable, compact record of the data a ticker displays. Slotted, so that it holds its fields without a __dict__.
+    A ticker builds a new quote once it is done updating, and publishes it by swapping its reference to it. Renderers
+    read a ticker's quote once per frame, so that all of its fields come from the same update, without locking.
+    Quotes are equal if their displayed data is, regardless of their generation.
+
+    Arguments:
+        generation (int):                       Incremented each time a ticker publishes a quote that changed
+        name (str):                             Ticker's name
+        price (float):                          Current price
+        prev_close (float):                     Previous day close price
+        value_change (float):                   Change since previous close
+        pct_change (str):                       Percent change since previous close
+        chart (np.ndarray):                     Chart prices, oldest first. Read-only.
+        chart_version (int):                    Version of the chart series the chart prices were taken from
+        market_status (MarketStatus):           Market status. None if not applicable.
+    """
+    __slots__ = ('generation', 'name', 'price', 'prev_close', 'value_change', 'pct_change', 'chart', 'chart_version',
+                 'market_status')
+    generation: int
+    name: str
+    price: float
+    prev_close: float
+    value_change: float
+    pct_change: str
+    chart: np.ndarray
+    chart_version: int
+    market_status: Optional[MarketStatus]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Quote):
+            return NotImplemented
+        return self.displayed() == other.displayed()
+
+    def displayed(self) -> tuple:
+        """
+        Displayed data, which quotes are compared on
+        :return: data: (tuple) Quote's fields, other than its generation and chart prices
+        """
+        return self.name, self.price, self.prev_close, self.value_change, self.pct_change, self.chart_version, \
+            self.market_status
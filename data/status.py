@@ -7,3 +7,5 @@ class Status(Enum):
     SUCCESS = 'SUCCESS'
     API_ERROR = 'API ERROR'
     NETWORK_ERROR = 'NETWORK ERROR'
+    TIMEOUT = 'TIMEOUT'
+    SKIPPED = 'SKIPPED'
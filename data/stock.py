@@ -1,7 +1,9 @@
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
-from data.quote import QuoteType
+from requests import Timeout
+
+from data.quote import QuoteType, Quote
 from data.status import Status
 from data.ticker import Ticker
 from constants import STOCK_LOGO_URL
@@ -12,17 +14,17 @@ from util.market_status import MarketStatus
 class Stock(Ticker):
     market_status: MarketStatus = MarketStatus.OPEN
     logo_url: str = None
+    exchange: str = None
 
     def initialize(self):
         super(Stock, self).initialize()
-        if self.price_data.get('quoteType') == QuoteType.EQUITY.name:
-            self.logo_url = STOCK_LOGO_URL.format(self.yq_ticker.summary_profile
-                                                  .get(self.symbol.upper())
-                                                  .get('website'))
-        else:
+        if self.price_data.get('quoteType') != QuoteType.EQUITY.name:
             logging.warning(f'Unable to get logo for {self.symbol}.')
+        elif self.charted:  # Otherwise, fetched along with its chart
+            self.logo_url = self.get_logo_url()
         self.market_status = MarketStatus.OPEN if self.price_data.get('marketState') == 'REGULAR' \
             else MarketStatus.CLOSED
+        self.exchange = self.price_data.get('exchange')
         self.name = self.name\
             .replace('Company', '')\
             .replace('Corporation', '')\
@@ -35,9 +37,42 @@ class Stock(Ticker):
             .rstrip('. ')\
             .rstrip(', ')\
             .rstrip()
-        
-    def update(self) -> Status:
-        super(Stock, self).update()
-        self.market_status = MarketStatus.OPEN if self.price_data.get('marketState') == 'REGULAR' \
-            else MarketStatus.CLOSED
-        return Status.SUCCESS
+
+    def load_chart(self, deadline: float = None) -> Status:
+        if self.logo_url is None and self.price_data.get('quoteType') == QuoteType.EQUITY.name:
+            try:
+                self.logo_url = self.get_logo_url()
+            except Timeout:
+                return Status.NETWORK_ERROR
+        return super(Stock, self).load_chart(deadline)
+
+    def get_logo_url(self) -> str:
+        """
+        Fetch the URL of the company's logo
+        :return: logo_url: (str) Logo URL
+        :exception Timeout: If the request timed out
+        """
+        return STOCK_LOGO_URL.format(self.provider.profile(self.symbol).get('website'))
+
+    def set_prices(self):
+        super(Stock, self).set_prices()
+        if 'marketState' in self.price_data:  # Left out of partial quotes
+            self.market_status = MarketStatus.OPEN if self.price_data['marketState'] == 'REGULAR' \
+                else MarketStatus.CLOSED
+        self.exchange = self.price_data.get('exchange', self.exchange)
+
+    def build_quote(self, generation: int) -> Quote:
+        return replace(super(Stock, self).build_quote(generation), market_status=self.market_status)
+
+    def to_snapshot(self) -> dict:
+        snapshot = super(Stock, self).to_snapshot()
+        snapshot['market_status'] = self.market_status.value
+        snapshot['logo_url'] = self.logo_url
+        snapshot['exchange'] = self.exchange
+        return snapshot
+
+    def restore(self, snapshot: dict):
+        super(Stock, self).restore(snapshot)
+        self.market_status = MarketStatus(snapshot['market_status'])
+        self.logo_url = snapshot['logo_url']
+        self.exchange = snapshot['exchange']
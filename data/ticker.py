@@ -1,14 +1,21 @@
 import logging
-from dataclasses import dataclass, field
-from typing import List
+import threading
+from dataclasses import dataclass, field, InitVar
 
-import yahooquery
 from PIL import Image
 from requests import Timeout
 
-from constants import DEFAULT_CURRENCY
+from api.provider import DataProvider, default_provider
+from constants import DEFAULT_CURRENCY, DEFAULT_CHART_WIDTH
+from data.chart_series import ChartSeries
+from data.history import History
+from data.quote import Quote
 from data.status import Status
-from util.utils import convert_currency
+from util.utils import expired, convert_currency, encode_array, decode_array, encode_image, decode_image
+
+# Price data fields kept once price data is parsed. Others are dropped on arrival.
+PRICE_FIELDS = ('shortName', 'quoteType', 'exchange', 'marketState', 'regularMarketPrice', 'regularMarketChange',
+                'regularMarketChangePercent', 'regularMarketPreviousClose')
 
 
 @dataclass
@@ -16,62 +23,173 @@ class Ticker:
     symbol: str
     currency: str = DEFAULT_CURRENCY
     currency_exchange_rate: float = 1
-    yq_ticker: yahooquery.Ticker = field(init=False)
-    price_data: dict = field(init=False)
+    price_data: dict = None
     name: str = field(init=False)
     price: float = field(init=False)
     prev_close: float = field(init=False)
     value_change: float = field(init=False)
     pct_change: str = field(init=False)
-    chart_prices: List[float] = field(default_factory=list)
+    chart_width: int = DEFAULT_CHART_WIDTH
+    chart_prices: ChartSeries = field(init=False)
+    history: History = field(init=False)
     img: Image = None
     valid: bool = True
     status: Status = Status.SUCCESS
+    charted: bool = True  # Whether chart data is kept. i.e. Ticker is about to be displayed.
+    quote: Quote = field(init=False, default=None, repr=False)
+    provider: DataProvider = field(default=None, repr=False)
+    lock: threading.RLock = field(init=False, default_factory=threading.RLock, repr=False, compare=False)
+    snapshot: InitVar[dict] = None
 
-    def __post_init__(self):
+    def __post_init__(self, snapshot: dict = None):
+        self.provider = self.provider or default_provider()
+        self.history = History(self.chart_width, self.lock)
+        self.chart_prices = self.history.series
+        if snapshot:  # Restore without network access
+            self.restore(snapshot)
+            self.publish()
+            return
         try:
             self.initialize()
         except (AttributeError, KeyError, TypeError):
             logging.error(f'No data available for {self.symbol}.')
             self.valid = False
-            return Status.FAIL
+            self.status = Status.FAIL
         except Timeout:
-            return Status.NETWORK_ERROR
+            self.status = Status.NETWORK_ERROR
+        else:
+            self.publish()
 
     def initialize(self):
         """
         Setup ticker's initial data.
+        If price data was already fetched in a batch request, the symbol is not validated nor fetched again.
         :return status: Update status
         :exception KeyError: If incorrect data type is provided as an argument. Can occur when a ticker is not valid.
         :exception Timeout: If the request timed out
         """
         logging.debug(f'Fetching initial data for {self.symbol}.')
-        self.yq_ticker = yahooquery.Ticker(self.symbol, timeout=5, validate=True)
-        self.price_data = self.yq_ticker.price.get(self.symbol.upper())
+        if self.price_data is None:
+            self.price_data = self.provider.price(self.symbol)
+        self.price_data = self.parse(self.price_data)
         self.name = self.price_data.get('shortName')
-        self.price = self.get_price(self.price_data.get('regularMarketPrice'))
         self.prev_close = self.price_data.get('regularMarketPreviousClose')
-        self.value_change = float(format(self.price_data.get('regularMarketChange'), '.2f'))
-        self.pct_change = f'{float(self.price_data.get("regularMarketChangePercent")) * 100:.2f}%'
-        self.chart_prices = self.get_chart_prices()
+        self.set_prices()
+        if self.charted:
+            self.chart_prices = self.get_chart_prices()
 
-    def update(self) -> Status:
+    def update(self, price_data: dict = None, fetch_history: bool = True, deadline: float = None) -> Status:
         """
         Update only the data that may have changed since last update.
         i.e. Exclude the ticker's name and previous day close price.
+        Data fetched once the deadline has passed is discarded, as its update cycle already gave up on the ticker.
+        Data is fetched without holding the ticker's lock, and applied while holding it.
+        :param price_data: Price data from a batch request. Fetched for this ticker alone if not provided.
+        :param fetch_history: Fetch new history bars. i.e. Not needed while the market is closed. Never fetched while
+        chart data is not kept.
+        :param deadline: (float) Update cycle's deadline (monotonic)
         :return status: Update status
         :exception Timeout: If the request timed out
         """
         logging.debug(f'Fetching new data for {self.symbol}.')
 
         try:
-            self.price_data = self.yq_ticker.price.get(self.symbol.upper())
-            self.price = self.get_price(self.price_data.get('regularMarketPrice'))
-            self.value_change = float(format(self.price_data.get('regularMarketChange'), '.2f'))
-            self.pct_change = f'{float(self.price_data.get("regularMarketChangePercent")) * 100:.2f}%'
-            self.chart_prices = self.get_chart_prices()
+            price_data = self.parse(price_data or self.provider.price(self.symbol))
+            if expired(deadline):
+                return Status.TIMEOUT
+            with self.lock:
+                self.price_data = price_data
+                self.set_prices()
+            if fetch_history and self.charted:
+                self.chart_prices = self.get_chart_prices(deadline)
         except Timeout:
             return Status.NETWORK_ERROR
+        finally:
+            self.publish()
+        return Status.SUCCESS
+
+    def apply_quote(self, quote: dict) -> Status:
+        """
+        Apply a quote pushed by a quote stream, without any request.
+        Fields left out of the quote keep their last value. History is only fetched on regular updates.
+        :param quote: Price data, possibly partial
+        :return status: Update status
+        """
+        with self.lock:  # Not interleaved with a regular update
+            previous = self.price_data
+            self.price_data = {**(previous or {}), **self.parse(quote)}
+            try:
+                self.set_prices()
+            except (TypeError, ValueError):  # Incomplete price data. i.e. Restored from snapshot.
+                self.price_data = previous
+                return Status.FAIL
+            self.publish()
+        return Status.SUCCESS
+
+    def load_chart(self, deadline: float = None) -> Status:
+        """
+        Keep chart data again, and fetch the ticker's history, once it is about to be displayed
+        :param deadline: (float) Update cycle's deadline (monotonic)
+        :return status: Update status
+        """
+        self.charted = True
+        try:
+            self.history.update(self.provider, self.symbol, deadline)
+        except Timeout:
+            return Status.NETWORK_ERROR
+        finally:
+            self.publish()
+        return Status.SUCCESS
+
+    def release_chart(self):
+        """Free the ticker's chart data while it is not about to be displayed. No history is fetched meanwhile."""
+        with self.lock:
+            self.charted = False
+            self.history.release()
+            self.publish()
+
+    @staticmethod
+    def parse(price_data: dict) -> dict:
+        """
+        Keep only the price data fields a ticker uses, so that the rest of the payload can be freed
+        :param price_data: Price data, as fetched
+        :return: price_data: (dict) PRICE_FIELDS found in price data
+        :exception TypeError: If price data is missing. Can occur when a ticker is not valid.
+        """
+        return {key: price_data[key] for key in PRICE_FIELDS if key in price_data}
+
+    def set_prices(self):
+        """
+        Set the ticker's current price, and its change since previous close, from its price data
+        :exception TypeError: If price data is missing. Can occur when a ticker is not valid.
+        """
+        price = self.get_price(self.price_data.get('regularMarketPrice'))
+        value_change = float(format(self.price_data.get('regularMarketChange'), '.2f'))
+        pct_change = f'{float(self.price_data.get("regularMarketChangePercent")) * 100:.2f}%'
+        self.price, self.value_change, self.pct_change = price, value_change, pct_change
+
+    def publish(self):
+        """
+        Publish the ticker's current data as a new quote, with a single reference swap.
+        The quote's generation is only incremented if its data changed since the last one was published.
+        Quotes are published one at a time, so that no two quotes share a generation.
+        """
+        with self.lock:
+            generation = self.quote.generation if self.quote else 0
+            quote = self.build_quote(generation + 1)
+            if quote != self.quote:
+                self.quote = quote
+
+    def build_quote(self, generation: int) -> Quote:
+        """
+        Build an immutable quote from the ticker's current data
+        :param generation: Quote's generation
+        :return: quote: (Quote) Ticker's quote
+        """
+        chart = self.chart_prices.values()
+        chart.flags.writeable = False
+        return Quote(generation, self.name, self.price, self.prev_close, self.value_change, self.pct_change, chart,
+                     self.chart_prices.version, None)
 
     def get_price(self, price: float) -> float:
         """
@@ -84,18 +202,79 @@ class Ticker:
             price = convert_currency(self.currency_exchange_rate, price)
         return float(format(price, '.3f')) if price < 1.0 else float(format(price, '.2f'))
 
-    def get_chart_prices(self) -> List[float]:
+    def get_chart_prices(self, deadline: float = None) -> ChartSeries:
         """
         Fetch historical market data for chart.
-        :return: chart_prices: List of historical prices
-        """
-        period, attempts = 1, 0
-        prices = []
-        while len(prices) < 100 and attempts < 5:
-            prices = self.yq_ticker.history(interval='1m', period=f'{period}d')['close'].tolist()
-            period += 1  # Go back an additional day
-            attempts += 1
-        if not prices:
+        Only bars newer than the last one fetched are requested, unless history has to be backfilled.
+        :param deadline: (float) Update cycle's deadline (monotonic)
+        :return: chart_prices: (ChartSeries) Historical prices, downsampled to the chart's width
+        """
+        prices = self.history.update(self.provider, self.symbol, deadline)
+        if not len(prices) and not expired(deadline):
             self.valid = False
             prices.append(0.0)
         return prices
+
+    def to_snapshot(self) -> dict:
+        """
+        Compact, JSON-serializable state of the ticker, from which it can be restored without network access.
+        :return: snapshot: (dict) Ticker state
+        """
+        return {
+            'symbol': self.symbol,
+            'currency': self.currency,
+            'currency_exchange_rate': self.currency_exchange_rate,
+            'name': self.name,
+            'price': self.price,
+            'prev_close': self.prev_close,
+            'value_change': self.value_change,
+            'pct_change': self.pct_change,
+            'history': self.history_snapshot(),
+            'img': encode_image(self.img)
+        }
+
+    def restore(self, snapshot: dict):
+        """
+        Restore ticker's state from a snapshot.
+        :param snapshot: (dict) Ticker state, as returned by to_snapshot
+        """
+        logging.debug(f'Restoring {self.symbol} from snapshot.')
+        self.price_data = {}
+        self.name = snapshot['name']
+        self.price = snapshot['price']
+        self.prev_close = snapshot['prev_close']
+        self.value_change = snapshot['value_change']
+        self.pct_change = snapshot['pct_change']
+        self.history.last_timestamp = snapshot['history']['last_timestamp']
+        self.history.series.restore({
+            'bucket_size': snapshot['history']['bucket_size'],
+            'buckets': decode_array(snapshot['history']['buckets'], 'f'),
+            'pending': decode_array(snapshot['history']['pending'], 'f')
+        })
+        self.img = decode_image(snapshot['img'])
+
+    def history_snapshot(self) -> dict:
+        """
+        Compact state of the ticker's history
+        :return: snapshot: (dict) History state
+        """
+        series = self.history.series.to_snapshot()
+        return {
+            'last_timestamp': self.history.last_timestamp,
+            'bucket_size': series['bucket_size'],
+            'buckets': encode_array(series['buckets'], 'f'),
+            'pending': encode_array(series['pending'], 'f')
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict, chart_width: int = DEFAULT_CHART_WIDTH,
+                      provider: DataProvider = None) -> 'Ticker':
+        """
+        Create ticker from a snapshot, without network access.
+        :param snapshot: (dict) Ticker state, as returned by to_snapshot
+        :param chart_width: Chart width (in pixels)
+        :param provider: Provider to fetch updates from
+        :return: ticker: Restored ticker
+        """
+        return cls(snapshot['symbol'], snapshot['currency'], snapshot['currency_exchange_rate'],
+                   chart_width=chart_width, provider=provider, snapshot=snapshot)
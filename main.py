@@ -4,9 +4,10 @@ from logging.handlers import RotatingFileHandler
 from logging import Formatter
 
 from PIL import Image, ImageDraw
-from rgbmatrix import RGBMatrix
 
 from api.data import Data
+from api.provider import create_provider
+from matrix.emulator import EmulatedMatrix, log_summary
 from matrix.matrix_config import MatrixConfig
 from constants import LOG_FILE
 from renderer.loading import Loading
@@ -18,8 +19,9 @@ from version import __version__
 def main():
     print(f'\U0001F4CA LED-Stock-Ticker - v{__version__} ({matrix.width}x{matrix.height})')
     config = MatrixConfig(matrix.width, matrix.height)
-    Loading(matrix, canvas, draw, config)
-    data = Data(config)
+    loading = Loading(matrix, canvas, draw, config)
+    data = Data(config, provider=create_provider(options.record, options.replay, options.replay_latency))
+    loading.wait(data)  # Until the first tickers are ready
     MainRenderer(matrix, canvas, draw, config, data)
 
 
@@ -39,7 +41,12 @@ if __name__ == '__main__':
                                    datefmt='%m/%d/%Y %I:%M:%S %p'))
     logger.addHandler(handler)
 
-    matrix = RGBMatrix(options=led_matrix_options(args()))
+    options = args()
+    if options.emulator or options.emulator_dump:
+        matrix = EmulatedMatrix(led_matrix_options(options), options.emulator_dump)
+    else:
+        from rgbmatrix import RGBMatrix
+        matrix = RGBMatrix(options=led_matrix_options(options))
     canvas = Image.new('RGB', (matrix.width, matrix.height))
     draw = ImageDraw.Draw(canvas)
     matrix.SetImage(canvas)
@@ -50,3 +57,4 @@ if __name__ == '__main__':
         logging.exception(SystemExit(e))
     finally:
         matrix.Clear()
+        log_summary(matrix)
@@ -0,0 +1,154 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque
+
+import numpy as np
+from PIL import Image
+
+from constants import EMULATOR_FRAME_HISTORY
+
+
+class EmulatedMatrixOptions:
+    """
+    Options of an emulated matrix, with the same attributes as rgbmatrix.RGBMatrixOptions.
+    Only the panel's dimensions (i.e. rows, cols, chain_length, parallel) affect the emulated matrix.
+    """
+
+    def __init__(self):
+        self.rows: int = 32
+        self.cols: int = 32
+        self.chain_length: int = 1
+        self.parallel: int = 1
+
+
+class EmulatedCanvas:
+    """
+    Software canvas, backed by a NumPy framebuffer, with the same surface as rgbmatrix's FrameCanvas
+
+    Arguments:
+        width (int):                            Canvas width (in pixels)
+        height (int):                           Canvas height (in pixels)
+
+    Attributes:
+        buffer (np.ndarray):                    uint8 RGB framebuffer of shape (height, width, 3)
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width: int = width
+        self.height: int = height
+        self.buffer: np.ndarray = np.zeros((height, width, 3), dtype=np.uint8)
+        self.brightness: int = 100
+
+    def SetImage(self, image: Image.Image, offset_x: int = 0, offset_y: int = 0, unsafe: bool = True):
+        """
+        Draw an image on the canvas. Parts falling outside of the canvas are clipped.
+        :param image: (PIL.Image) Image
+        :param offset_x: (int) Image's left edge
+        :param offset_y: (int) Image's top edge
+        :param unsafe: (bool) Unused. Images are always converted to RGB.
+        """
+        pixels = np.asarray(image if image.mode == 'RGB' else image.convert('RGB'))
+        left, top = max(offset_x, 0), max(offset_y, 0)
+        right, bottom = min(offset_x + pixels.shape[1], self.width), min(offset_y + pixels.shape[0], self.height)
+        if left < right and top < bottom:
+            self.buffer[top:bottom, left:right] = pixels[top - offset_y:bottom - offset_y,
+                                                         left - offset_x:right - offset_x]
+
+    def SetPixel(self, x: int, y: int, red: int, green: int, blue: int):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.buffer[y, x] = (red, green, blue)
+
+    def Fill(self, red: int, green: int, blue: int):
+        self.buffer[:] = (red, green, blue)
+
+    def Clear(self):
+        self.buffer[:] = 0
+
+    def image(self) -> Image.Image:
+        """
+        Copy of the canvas, as an image
+        :return: image: (PIL.Image) RGB image
+        """
+        return Image.fromarray(self.buffer.copy(), 'RGB')
+
+
+class EmulatedMatrix(EmulatedCanvas):
+    """
+    Software LED matrix, with the same surface as rgbmatrix.RGBMatrix, so that the whole render pipeline runs without
+    the hardware (i.e. To profile it, or benchmark it on a build box).
+    Each frame displayed, whether drawn with SetImage or swapped in with SwapOnVSync, is timestamped. Frames can also be
+    saved to disk, as numbered PNG images.
+
+    Arguments:
+        options (EmulatedMatrixOptions):        Matrix options. Only dimensions are used.
+        dump_dir (str):                         Directory to save frames to. Frames are not saved if None.
+
+    Attributes:
+        frames (int):                           Number of frames displayed
+        frame_times (Deque[float]):             Time each of the last EMULATOR_FRAME_HISTORY frames was displayed at
+                                                (monotonic)
+    """
+
+    def __init__(self, options=None, dump_dir: str = None):
+        options = options or EmulatedMatrixOptions()
+        super().__init__(options.cols * options.chain_length, options.rows * options.parallel)
+        self.dump_dir: str = dump_dir
+        self.frames: int = 0
+        self.frame_times: Deque[float] = deque(maxlen=EMULATOR_FRAME_HISTORY)
+        self.lock: threading.Lock = threading.Lock()
+        if dump_dir:
+            os.makedirs(dump_dir, exist_ok=True)
+
+    def SetImage(self, image: Image.Image, offset_x: int = 0, offset_y: int = 0, unsafe: bool = True):
+        with self.lock:
+            super().SetImage(image, offset_x, offset_y, unsafe)
+            self.displayed()
+
+    def CreateFrameCanvas(self) -> EmulatedCanvas:
+        """
+        Create an off-screen canvas, to be drawn on and swapped in with SwapOnVSync
+        :return: canvas: (EmulatedCanvas) Canvas of the matrix's size
+        """
+        return EmulatedCanvas(self.width, self.height)
+
+    def SwapOnVSync(self, canvas: EmulatedCanvas, framerate_fraction: int = 1) -> EmulatedCanvas:
+        """
+        Display an off-screen canvas
+        :param canvas: (EmulatedCanvas) Canvas to display
+        :param framerate_fraction: (int) Unused. Frames are displayed at once.
+        :return: canvas: (EmulatedCanvas) Canvas previously displayed, to be drawn on next
+        """
+        with self.lock:
+            self.buffer, canvas.buffer = canvas.buffer, self.buffer
+            self.displayed()
+        return canvas
+
+    def displayed(self):
+        """Record a frame that was just displayed, and save it if frames are dumped"""
+        self.frames += 1
+        self.frame_times.append(time.monotonic())
+        if self.dump_dir:
+            Image.fromarray(self.buffer, 'RGB').save(os.path.join(self.dump_dir, f'{self.frames:06d}.png'))
+
+    def summary(self) -> str:
+        """
+        One-line summary of the frames displayed, for logging
+        :return: summary: (str) Frames summary
+        """
+        times = list(self.frame_times)
+        if len(times) < 2:
+            return f'Emulated matrix displayed {self.frames} frames'
+        rate = (len(times) - 1) / (times[-1] - times[0]) if times[-1] > times[0] else 0.0
+        return f'Emulated matrix displayed {self.frames} frames, {rate:.1f} frames/s over the last {len(times)}'
+
+
+def log_summary(matrix):
+    """
+    Log the frames displayed by a matrix, if it is emulated
+    :param matrix: Matrix
+    """
+    if isinstance(matrix, EmulatedMatrix):
+        logging.info(matrix.summary())
@@ -7,8 +7,8 @@ from jsonschema import Draft7Validator, ValidationError
 
 from matrix.layout import Layout
 from constants import DEFAULT_CURRENCY, TWELVE_HOURS_FORMAT, DEFAULT_DATE_FORMAT, DEFAULT_ROTATION_RATE, \
-    DEFAULT_UPDATE_RATE, CONFIG_SCHEMA, CONFIG_FILE, TWENTY_FOUR_HOURS_FORMAT
-from util.utils import read_json
+    DEFAULT_UPDATE_RATE, CONFIG_SCHEMA, CONFIG_FILE, TWENTY_FOUR_HOURS_FORMAT, DEFAULT_BATCH_SIZE, DEFAULT_PAGE_SIZE
+from util.utils import read_json, read_watchlist
 
 
 @dataclass
@@ -26,6 +26,9 @@ class MatrixConfig:
     date_format: str = DEFAULT_DATE_FORMAT
     rotation_rate: float = DEFAULT_ROTATION_RATE
     update_rate: float = DEFAULT_UPDATE_RATE
+    batch_size: int = DEFAULT_BATCH_SIZE
+    page_size: int = DEFAULT_PAGE_SIZE
+    stream_url: str = None
 
     def __post_init__(self):
         self.layout = Layout(self.width, self.height)
@@ -39,6 +42,8 @@ class MatrixConfig:
             v = Draft7Validator(self.schema)
             v.validate(self.config)
             self.stocks = self.config['tickers']['stocks']
+            if self.config['tickers'].get('watchlist'):
+                self.stocks = list(dict.fromkeys(self.stocks + read_watchlist(self.config['tickers']['watchlist'])))
             self.cryptos = self.format_cryptos(self.config['tickers']['cryptos'])
             self.forex = self.format_forex(self.config['tickers']['forex'])
             self.currency = self.config['options']['currency']
@@ -47,6 +52,9 @@ class MatrixConfig:
             self.rotation_rate = self.config['options']['rotation_rate']
             self.update_rate = self.config['options']['update_rate'] * 60  # convert to minutes
             self.layout.show_logos = self.config['options']['show_logos'] if self.height > 16 else False
+            self.batch_size = self.config['options'].get('batch_size', DEFAULT_BATCH_SIZE)
+            self.page_size = self.config['options'].get('page_size', DEFAULT_PAGE_SIZE)
+            self.stream_url = self.config['options'].get('stream_url')
         except ValidationError:
             errors = sorted(v.iter_errors(self.config), key=lambda e: e.path)
             logging.error('Invalid config.json file:')
@@ -0,0 +1,97 @@
+import threading
+from typing import Dict, Tuple
+
+from PIL import Image
+
+Box = Tuple[int, int, int, int]  # left, top, right, bottom. Right and bottom are excluded.
+
+
+class FrameOutput:
+    """
+    Double-buffered output of frames to a matrix.
+    Frames are drawn on an off-screen canvas, then swapped in on the matrix's next vertical sync, so that a frame is
+    never displayed half drawn. Frames are pushed under a lock, so that renderers drawing from different threads (i.e.
+    Scrolling text) never interleave their pushes.
+    Only a region of a frame may be pushed, if the rest of it is unchanged. As the off-screen canvas is the one that was
+    displayed before the last swap, the region pushed last is copied along with it, to bring the canvas up to date.
+
+    Arguments:
+        matrix (rgbmatrix.RGBMatrix):           Matrix to display frames on
+
+    Attributes:
+        offscreen (rgbmatrix.FrameCanvas):      Off-screen canvas, which the next frame is drawn on
+        stale (Box):                            Region of the off-screen canvas behind the matrix's. None if none of it.
+        frames (int):                           Number of frames pushed
+        pixels (int):                           Number of pixels copied to the off-screen canvas
+    """
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.width: int = matrix.width
+        self.height: int = matrix.height
+        self.offscreen = matrix.CreateFrameCanvas()
+        self.stale: Box = self.full
+        self.frames: int = 0
+        self.pixels: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+    def show(self, image: Image.Image, box: Box = None):
+        """
+        Display a frame
+        :param image: (PIL.Image) Frame, the size of the matrix
+        :param box: (Box) Region of the frame which changed since it was last shown. All of it if None.
+        """
+        with self.lock:
+            changed = self.full if box is None else self.clip(box)
+            region = union(changed, self.stale)
+            if region == self.full:
+                self.offscreen.SetImage(image)
+            elif region:
+                self.offscreen.SetImage(image.crop(region), region[0], region[1])
+            if region:
+                self.pixels += (region[2] - region[0]) * (region[3] - region[1])
+            self.offscreen = self.matrix.SwapOnVSync(self.offscreen)
+            self.stale = changed
+            self.frames += 1
+
+    @property
+    def full(self) -> Box:
+        return 0, 0, self.width, self.height
+
+    def clip(self, box: Box) -> Box:
+        """
+        Clip a region to the matrix
+        :param box: (Box) Region
+        :return: box: (Box) Region within the matrix. None if empty.
+        """
+        left, top = max(box[0], 0), max(box[1], 0)
+        right, bottom = min(box[2], self.width), min(box[3], self.height)
+        return (left, top, right, bottom) if left < right and top < bottom else None
+
+
+def union(box: Box, other: Box) -> Box:
+    """
+    Smallest region containing two regions
+    :param box: (Box) Region. Empty if None.
+    :param other: (Box) Region. Empty if None.
+    :return: box: (Box) Bounding region. None if both are empty.
+    """
+    if box is None or other is None:
+        return box or other
+    return min(box[0], other[0]), min(box[1], other[1]), max(box[2], other[2]), max(box[3], other[3])
+
+
+_lock = threading.Lock()
+_outputs: Dict[int, FrameOutput] = {}
+
+
+def frame_output(matrix) -> FrameOutput:
+    """
+    Shared output of a matrix, so that every renderer swaps the same pair of canvases
+    :param matrix: (rgbmatrix.RGBMatrix) Matrix
+    :return: output: (FrameOutput) Matrix's output
+    """
+    with _lock:
+        if id(matrix) not in _outputs:
+            _outputs[id(matrix)] = FrameOutput(matrix)
+        return _outputs[id(matrix)]
@@ -0,0 +1,100 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from PIL import Image
+
+from data.quote import Quote
+from data.ticker import Ticker
+from renderer.scroller import ScrollingText
+
+
+@dataclass
+class Layer:
+    """
+    Layer of a board, cropped to what was drawn on it
+
+    Arguments:
+        key (tuple):                            Values the layer was drawn from
+        image (PIL.Image):                      RGBA image, transparent where nothing was drawn. None if empty.
+        position (Tuple[int, int]):             Top-left corner of the image on the board
+    """
+    key: tuple
+    image: Image.Image = None
+    position: Tuple[int, int] = (0, 0)
+
+
+@dataclass
+class Board:
+    """
+    Frame of a ticker, composed of cached layers (i.e. Name, chart, price, symbol).
+    Each frame, layers are declared in drawing order, along with a key of the values they are drawn from. A layer is
+    only drawn again if its key changed, and the board is only composed again if one of its layers changed.
+
+    Arguments:
+        size (Tuple[int, int]):                 Board size (in pixels)
+
+    Attributes:
+        layers (Dict[str, Layer]):              Layers, keyed by name
+        declared (List[str]):                   Names of the layers declared for the next frame, in drawing order
+        image (PIL.Image):                      Composed board. None until composed.
+        changed (bool):                         Whether the layers changed since the board was last composed
+    """
+    size: Tuple[int, int]
+    layers: Dict[str, Layer] = field(default_factory=dict)
+    declared: List[str] = field(default_factory=list)
+    image: Image.Image = None
+    changed: bool = False
+
+    def layer(self, name: str, key: tuple, render: Callable, *args):
+        """
+        Declare a layer for the next frame, drawing it again if its key changed
+        :param name: (str) Layer name
+        :param key: (tuple) Values the layer is drawn from
+        :param render: (Callable) Draws the layer on the image passed as its first argument
+        :param args: Other arguments to render
+        """
+        self.declared.append(name)
+        layer = self.layers.get(name)
+        if layer is not None and layer.key == key:
+            return
+        image = Image.new('RGBA', self.size)
+        render(image, *args)
+        box = image.getbbox()
+        self.layers[name] = Layer(key, image.crop(box), box[:2]) if box else Layer(key)
+        self.changed = True
+
+    def compose(self) -> Image.Image:
+        """
+        Compose the layers declared for this frame, if any of them changed
+        :return: image: (PIL.Image) RGB board
+        """
+        for name in [name for name in self.layers if name not in self.declared]:
+            del self.layers[name]
+            self.changed = True
+        if self.changed or self.image is None or list(self.layers) != self.declared:
+            self.image = Image.new('RGB', self.size)
+            for name in self.declared:
+                layer = self.layers[name]
+                if layer.image:
+                    self.image.paste(layer.image, layer.position, layer.image)
+            self.layers = {name: self.layers[name] for name in self.declared}
+            self.changed = False
+        self.declared = []
+        return self.image
+
+
+@dataclass
+class Frame:
+    """
+    Ticker frame, composed ahead of being displayed
+
+    Arguments:
+        ticker (data.Ticker):                   Ticker
+        quote (data.Quote):                     Quote the frame was composed from
+        image (PIL.Image):                      Composed board
+        scrolling (List[ScrollingText]):        Text scrolling over the board
+    """
+    ticker: Ticker
+    quote: Quote
+    image: Image.Image
+    scrolling: List[ScrollingText] = field(default_factory=list)
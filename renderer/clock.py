@@ -25,7 +25,7 @@ class ClockRenderer(Renderer):
         if self.coords['options']['date']:
             self.render_date()
         self.render_time()
-        self.matrix.SetImage(self.canvas)
+        self.show()
         time.sleep(self.config.rotation_rate)
 
     def render_date(self):
@@ -33,11 +33,11 @@ class ClockRenderer(Renderer):
                        self.matrix.width,
                        self.matrix.height)[0]
         y = self.coords['date']['y']
-        self.draw.text((x, y), self.data.date, self.text_color, self.font)
+        self.font.draw(self.canvas, (x, y), self.data.date, self.text_color)
 
     def render_time(self):
         x = align_text(self.config.layout.clock_font.getsize(self.data.time),
                        self.matrix.width,
                        self.matrix.height)[0]
         y = self.coords['time']['y']
-        self.draw.text((x, y), self.data.time, self.text_color, self.config.layout.clock_font)
+        self.config.layout.clock_font.draw(self.canvas, (x, y), self.data.time, self.text_color)
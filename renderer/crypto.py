@@ -1,5 +1,8 @@
-import time
+from PIL import Image
 
+from data.crypto import Crypto
+from data.quote import Quote
+from renderer.board import Board
 from renderer.ticker import TickerRenderer
 from util.utils import load_image_url, align_text, Position
 
@@ -12,33 +15,37 @@ class CryptoRenderer(TickerRenderer):
         cryptos (list):         List of Crypto objects
     """
 
-    def __init__(self, matrix, canvas, draw, config, data):
-        super().__init__(matrix, canvas, draw, config, data)
+    def __init__(self, matrix, canvas, draw, config, data, images=None):
+        super().__init__(matrix, canvas, draw, config, data, images)
         self.cryptos: list = self.data.cryptos
-
-        if self.config.layout.show_logos:
-            for crypto in self.cryptos:
-                crypto.img = load_image_url(crypto.img_url, tuple(self.coords['crypto']['logo']['size']))
-
-    def render(self):
-        for crypto in self.cryptos:
-            self.clear()
-            if self.coords['options']['full_names']:
-                self.render_name(crypto.name)
-            if self.coords['options']['image'] and self.config.layout.show_logos:
-                self.render_image(crypto.img)
-            elif self.coords['options']['history_chart']:
-                self.render_chart(crypto.prev_close, crypto.chart_prices, crypto.value_change)
-            self.render_price(self.format_price(self.currency, crypto.price), 'crypto')
-            self.render_symbol(crypto.symbol.replace('-USD', ''))  # Remove currency exchange
-            self.render_percentage_change(crypto.pct_change, crypto.value_change)
-            self.matrix.SetImage(self.canvas)
-            time.sleep(self.config.rotation_rate)
-
-    def render_symbol(self, symbol: str):
+        self.prefetch_images(self.cryptos)
+
+    @property
+    def tickers(self) -> list:
+        return self.cryptos
+
+    def compose(self, board: Board, crypto: Crypto, quote: Quote):
+        if self.coords['options']['full_names']:
+            self.render_name(board, quote.name)
+        if self.coords['options']['image'] and self.config.layout.show_logos:
+            self.render_image(board, self.image(crypto))
+        elif self.coords['options']['history_chart']:
+            self.render_chart(board, quote)
+        self.render_price(board, self.format_price(self.currency, quote.price), 'crypto')
+        self.render_symbol(board, crypto.symbol.replace('-USD', ''))  # Remove currency exchange
+        self.render_percentage_change(board, quote.pct_change, quote.value_change)
+
+    def submit_image(self, crypto: Crypto):
+        size = tuple(self.coords['crypto']['logo']['size'])
+        self.images.submit((crypto.img_url, size), load_image_url, crypto.img_url, size, self.images)
+
+    def loaded_image(self, crypto: Crypto) -> Image:
+        return self.images.result((crypto.img_url, tuple(self.coords['crypto']['logo']['size'])))
+
+    def render_symbol(self, board: Board, symbol: str):
         x = align_text(self.font.getsize(symbol),
                        col_width=self.matrix.width,
                        x=Position(self.coords['crypto']['symbol']['x']))[0]
         x += self.coords['crypto']['symbol']['offset']
         y = self.coords['crypto']['symbol']['y']
-        self.draw.text((x, y), symbol, self.text_color, self.font)
+        board.layer('symbol', (symbol,), self.font.draw, (x, y), symbol, self.text_color)
@@ -29,7 +29,7 @@ class ErrorRenderer(Renderer):
         self.clear()
         self.render_image()
         self.render_error_msg()
-        self.matrix.SetImage(self.canvas)
+        self.show()
         time.sleep(self.config.rotation_rate)
 
     def render_error_msg(self):
@@ -37,7 +37,7 @@ class ErrorRenderer(Renderer):
         x, y = align_text(self.font.getsize(self.msg),
                           self.matrix.width,
                           self.matrix.height)
-        self.draw.text((x, y), self.msg, Color.RED, self.font)
+        self.font.draw(self.canvas, (x, y), self.msg, Color.RED)
 
     def render_image(self):
         img = load_image(ERROR_IMAGE, tuple(self.coords['image']['size']))
@@ -1,9 +1,12 @@
-import time
 from typing import List
 
+from PIL import Image
+
 from data.forex import Forex
+from data.quote import Quote
+from renderer.board import Board
 from renderer.ticker import TickerRenderer
-from util.utils import build_forex_img
+from util.utils import load_image_url, forex_flag_size, combine_flags
 
 
 class ForexRenderer(TickerRenderer):
@@ -14,23 +17,32 @@ class ForexRenderer(TickerRenderer):
         forex (list):           List of forex
     """
 
-    def __init__(self, matrix, canvas, draw, config, data):
-        super().__init__(matrix, canvas, draw, config, data)
+    def __init__(self, matrix, canvas, draw, config, data, images=None):
+        super().__init__(matrix, canvas, draw, config, data, images)
         self.forex: List[Forex] = data.forex
+        self.prefetch_images(self.forex)
+
+    @property
+    def tickers(self) -> List[Forex]:
+        return self.forex
+
+    def compose(self, board: Board, pair: Forex, quote: Quote):
+        self.render_name(board, quote.name)
+        self.render_price(board, str(quote.price), 'forex')
+        self.render_percentage_change(board, quote.pct_change, quote.value_change)
+        if self.coords['options']['image'] and self.config.layout.show_logos:
+            self.render_image(board, self.image(pair))
+        elif self.coords['options']['history_chart']:
+            self.render_chart(board, quote)
+
+    def submit_image(self, pair: Forex):
+        flag_size = forex_flag_size(tuple(self.coords['forex']['image']['size']))
+        for url in pair.img_url:  # Flags are loaded separately, and shared between pairs
+            self.images.submit((url, flag_size), load_image_url, url, flag_size, self.images)
 
-        if self.config.layout.show_logos:
-            for pair in self.forex:
-                pair.img = build_forex_img(pair.img_url, tuple(self.coords['forex']['image']['size']))
-
-    def render(self):
-        for pair in self.forex:
-            self.clear()
-            self.render_name(pair.name)
-            self.render_price(str(pair.price), 'forex')
-            self.render_percentage_change(pair.pct_change, pair.value_change)
-            if self.coords['options']['image'] and self.config.layout.show_logos:
-                self.render_image(pair.img)
-            elif self.coords['options']['history_chart']:
-                self.render_chart(pair.prev_close, pair.chart_prices, pair.value_change)
-            self.matrix.SetImage(self.canvas)
-            time.sleep(self.config.rotation_rate)
+    def loaded_image(self, pair: Forex) -> Image:
+        size = tuple(self.coords['forex']['image']['size'])
+        keys = [(url, forex_flag_size(size)) for url in pair.img_url]
+        if all(self.images.done(key) for key in keys):
+            return combine_flags([self.images.result(key) for key in keys], size)
+        return None
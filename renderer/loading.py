@@ -1,4 +1,4 @@
-from constants import LOADING_IMAGE
+from constants import LOADING_IMAGE, LOADING_REFRESH_RATE
 from renderer.renderer import Renderer
 from util.color import Color
 from util.position import Position
@@ -7,7 +7,9 @@ from version import __version__
 
 
 class Loading(Renderer):
-    """Render a splash screen while tickers' data is being fetched"""
+    """
+    Render a splash screen while tickers' data is being fetched, with a progress bar along the bottom edge
+    """
 
     def __init__(self, matrix, canvas, draw, config):
         super().__init__(matrix, canvas, draw, config)
@@ -17,7 +19,28 @@ class Loading(Renderer):
     def render(self):
         self.render_logo()
         self.render_version()
-        self.matrix.SetImage(self.canvas)
+        self.show()
+
+    def wait(self, data):
+        """
+        Show initialization progress until the first tickers are ready to be displayed
+        :param data: (api.Data) Data being initialized
+        """
+        while not data.ready.wait(LOADING_REFRESH_RATE):
+            self.render_progress(*data.progress)
+
+    def render_progress(self, done: int, total: int):
+        """
+        Render a progress bar on the bottom row
+        :param done: Tickers initialized
+        :param total: Tickers to initialize
+        """
+        y = self.matrix.height - 1
+        width = self.matrix.width * done // total if total else 0
+        self.draw.line(((0, y), (self.matrix.width - 1, y)), Color.BLACK)
+        if width:
+            self.draw.line(((0, y), (width - 1, y)), Color.GREEN)
+        self.show((0, y, self.matrix.width, y + 1))
 
     def render_version(self):
         x, y = align_text(self.font.getsize(__version__),
@@ -25,7 +48,7 @@ class Loading(Renderer):
                           self.matrix.height,
                           Position.CENTER,
                           Position.BOTTOM)
-        self.draw.text((x, y), __version__, Color.ORANGE, self.font)
+        self.font.draw(self.canvas, (x, y), __version__, Color.ORANGE)
 
     def render_logo(self):
         img = load_image(LOADING_IMAGE, tuple(self.coords['image']['size']))
@@ -5,6 +5,7 @@ from renderer.error import ErrorRenderer
 from renderer.forex import ForexRenderer
 from renderer.renderer import Renderer
 from renderer.stock import StockRenderer
+from util.image_prefetch import ImagePrefetcher
 
 
 class MainRenderer(Renderer):
@@ -16,6 +17,7 @@ class MainRenderer(Renderer):
 
     Attributes:
         status (data.Status):                   Update status
+        images (util.ImagePrefetcher):          Image prefetcher shared by ticker renderers
         clock (renderer.ClockRenderer):         Clock renderer instance
         stocks (renderer.StockRenderer):        Stocks renderer instance
         crypto (renderer.CryptoRenderer):       Crypto renderer instance
@@ -27,10 +29,11 @@ class MainRenderer(Renderer):
         super().__init__(matrix, canvas, draw, config)
         self.data = data
         self.status = self.data.status
+        self.images = ImagePrefetcher()  # Images are loaded concurrently, in the background, as renderers start
         self.clock = ClockRenderer(self.matrix, self.canvas, self.draw, self.config, self.data)
-        self.stocks = StockRenderer(self.matrix, self.canvas, self.draw, self.config, self.data)
-        self.crypto = CryptoRenderer(self.matrix, self.canvas, self.draw, self.config, self.data)
-        self.forex = ForexRenderer(self.matrix, self.canvas, self.draw, self.config, self.data)
+        self.stocks = StockRenderer(self.matrix, self.canvas, self.draw, self.config, self.data, self.images)
+        self.crypto = CryptoRenderer(self.matrix, self.canvas, self.draw, self.config, self.data, self.images)
+        self.forex = ForexRenderer(self.matrix, self.canvas, self.draw, self.config, self.data, self.images)
         self.error = ErrorRenderer(self.matrix, self.canvas, self.draw, self.config, self.data)
         self.render()
 
@@ -38,11 +41,12 @@ class MainRenderer(Renderer):
         while self.status is Status.SUCCESS:
             try:
                 self.clock.render()
-                self.stocks.render()
-                self.crypto.render()
+                self.stocks.render(self.crypto)  # Each composes the first frame of the next while its last is shown
+                self.crypto.render(self.forex)
                 self.forex.render()
                 if self.data.should_update():
-                    self.status = self.data.update()
+                    self.data.update_async()  # Never waits on the network
+                self.status = self.data.status
                 self.data.update_clock()
             except KeyboardInterrupt as e:
                 raise SystemExit(' Exiting...') from e
@@ -1,15 +1,19 @@
 import time
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Tuple, List
 
-import multitasking
-from PIL import Image, ImageDraw, ImageFont
-from rgbmatrix import RGBMatrix
+from PIL import Image, ImageDraw
 
 from matrix.matrix_config import MatrixConfig
-from constants import TEXT_SCROLL_SPEED
+from matrix.output import FrameOutput, Box, frame_output, union
+from renderer.scroller import ScrollingText
+from util.glyph_atlas import GlyphAtlas
 from util.color import Color
-from util.direction import Direction
+
+try:
+    from rgbmatrix import RGBMatrix
+except ImportError:
+    from matrix.emulator import EmulatedMatrix as RGBMatrix
 
 
 class Renderer(ABC):
@@ -22,7 +26,9 @@ class Renderer(ABC):
         config (config.MatrixConfig):              MatrixConfig instance
 
     Attributes:
-        font (PIL.ImageFont):                   Primary font
+        output (matrix.FrameOutput):            Matrix's double-buffered output, shared by every renderer
+        scrolling (List[ScrollingText]):        Text scrolling on the frame being displayed
+        font (util.GlyphAtlas):                 Primary font
         text_color (util.Color):                Default text color
     """
 
@@ -31,8 +37,10 @@ class Renderer(ABC):
         self.canvas: Image = canvas
         self.draw: ImageDraw = draw
         self.config: MatrixConfig = config
-        self.font: ImageFont = self.config.layout.font
-        self.text_color: ImageFont = Color.WHITE
+        self.output: FrameOutput = frame_output(matrix)
+        self.scrolling: List[ScrollingText] = []
+        self.font: GlyphAtlas = self.config.layout.font
+        self.text_color: tuple = Color.WHITE
 
     @abstractmethod
     def render(self):
@@ -40,48 +48,51 @@ class Renderer(ABC):
 
     def clear(self):
         self.draw.rectangle(((0, 0), (self.matrix.width, self.matrix.height)), fill=Color.BLACK)
+        self.scrolling.clear()
+
+    def show(self, box: Box = None):
+        """
+        Display the frame drawn on canvas
+        :param box: (Box) Region of the canvas drawn on since the last frame. All of it if None.
+        """
+        self.output.show(self.canvas, box)
 
-    @multitasking.task
-    def scroll_text(self, text: str, font: ImageFont, text_color: tuple, bg_color: tuple, start_pos: Tuple[int, int]):
+    def scroll_text(self, text: str, font: GlyphAtlas, text_color: tuple, bg_color: tuple, start_pos: Tuple[int, int]):
         """
-        Scroll string of text on canvas
+        Scroll string of text on canvas.
+        The text is rasterized once. It is drawn, from its start, and scrolled while the frame is held.
         :param text: (str) text to scroll
-        :param font: (ImageFont) text font
+        :param font: (GlyphAtlas) text font
         :param text_color: (tuple) text font color
         :param bg_color: (tuple) text background color
         :param start_pos: (int) text starting x-position
         """
-        x, begin = start_pos[0], start_pos[0]
-        end = (self.matrix.width, start_pos[1] + font.getsize(text)[1] - 1)
-        direction = Direction.LEFT
-        new_direction = True
-        time_started = time.time()
-        finished = False
-
-        while not finished:
-            self.draw.rectangle(((x - 1, start_pos[1]), end), bg_color)
-            self.draw.text((x, start_pos[1]), text, text_color, font)
-            self.matrix.SetImage(self.canvas)
-
-            length = font.getsize(text)[0] + x
+        scrolling = ScrollingText.rasterize(text, font, text_color, bg_color, start_pos,
+                                            self.matrix.width - start_pos[0])
+        self.scrolling.append(scrolling)
 
-            if length < self.matrix.width:  # End of text is now visible
-                direction = Direction.RIGHT
-                new_direction = True
-            elif x == begin:  # Text is back to starting position
-                direction = Direction.LEFT
-                new_direction = True
-
-            if direction is Direction.LEFT:
-                x -= 1
-            else:
-                x += 1
-
-            if new_direction:
-                time.sleep(1.5)
-                new_direction = False
-            else:
-                time.sleep(TEXT_SCROLL_SPEED)
-
-            if time.time() - time_started >= self.config.rotation_rate - 1.5:
-                finished = True
+    def hold(self, duration: float, started: float = None):
+        """
+        Keep the frame displayed, scrolling its text meanwhile.
+        Scroll frames are paced by deadlines, set a pixel's scroll time apart from the start, rather than by sleeping
+        between frames, so that the time taken to draw a frame does not add up.
+        :param duration: (float) Time to keep the frame displayed for (in seconds)
+        :param started: (float) Time the frame was displayed at (monotonic). Now if None.
+        """
+        started = time.monotonic() if started is None else started
+        deadline = started + duration
+        if not self.scrolling:
+            time.sleep(max(deadline - time.monotonic(), 0))
+            return
+        speed = min(scrolling.speed for scrolling in self.scrolling)
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            box = None
+            for scrolling in self.scrolling:
+                box = union(box, scrolling.draw(self.canvas, now - started))
+            if box:
+                self.show(box)
+            next_frame = started + ((now - started) // speed + 1) * speed
+            time.sleep(max(min(next_frame, deadline) - time.monotonic(), 0))
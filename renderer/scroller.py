@@ -0,0 +1,93 @@
+from dataclasses import dataclass, field
+from typing import Tuple
+
+from PIL import Image
+
+from constants import TEXT_SCROLL_SPEED, TEXT_SCROLL_PAUSE
+from matrix.output import Box
+from util.glyph_atlas import GlyphAtlas
+
+
+@dataclass
+class ScrollingText:
+    """
+    Text too wide for the matrix, rasterized once into a strip, a window of which is drawn on canvas.
+    The text stops at its start, scrolls left until its end is visible, stops, then scrolls back. Its position is a
+    function of the time elapsed since it started, so that it keeps its pace whenever frames are drawn.
+
+    Arguments:
+        strip (PIL.Image):                      Rasterized text, on its background
+        position (Tuple[int, int]):             Top-left corner of the window on canvas
+        width (int):                            Window width (in pixels)
+        speed (float):                          Time taken to scroll by a pixel (in seconds)
+        pause (float):                          Time the text stops for at either end (in seconds)
+
+    Attributes:
+        offset (int):                           Column of the strip last drawn at the window's left edge
+    """
+    strip: Image.Image
+    position: Tuple[int, int]
+    width: int
+    speed: float = TEXT_SCROLL_SPEED
+    pause: float = TEXT_SCROLL_PAUSE
+    offset: int = field(init=False, default=None)
+
+    @classmethod
+    def rasterize(cls, text: str, font: GlyphAtlas, text_color: tuple, bg_color: tuple, position: Tuple[int, int],
+                  width: int) -> 'ScrollingText':
+        """
+        Rasterize text into a strip
+        :param text: (str) Text
+        :param font: (GlyphAtlas) Text font
+        :param text_color: (tuple) Text color
+        :param bg_color: (tuple) Background color
+        :param position: (Tuple[int, int]) Top-left corner of the window on canvas
+        :param width: (int) Window width (in pixels)
+        :return: text: (ScrollingText) Scrolling text
+        """
+        text_width, text_height = font.getsize(text)
+        strip = Image.new('RGB', (max(text_width, width), text_height), bg_color)
+        font.draw(strip, (0, 0), text, text_color)
+        return cls(strip, position, width)
+
+    @property
+    def travel(self) -> int:
+        """Distance scrolled from one end of the text to the other (in pixels)"""
+        return self.strip.width - self.width
+
+    @property
+    def box(self) -> Box:
+        x, y = self.position
+        return x, y, x + self.width, y + self.strip.height
+
+    def offset_at(self, elapsed: float) -> int:
+        """
+        Column of the strip shown at the window's left edge
+        :param elapsed: (float) Time since the text started scrolling (in seconds)
+        :return: offset: (int) Strip column
+        """
+        moving = self.travel * self.speed
+        if not moving:
+            return 0
+        elapsed %= 2 * (self.pause + moving)
+        if elapsed < self.pause:
+            return 0
+        if elapsed < self.pause + moving:
+            return int((elapsed - self.pause) / self.speed)
+        if elapsed < 2 * self.pause + moving:
+            return self.travel
+        return self.travel - int((elapsed - 2 * self.pause - moving) / self.speed)
+
+    def draw(self, canvas: Image.Image, elapsed: float) -> Box:
+        """
+        Draw the text on canvas, if it moved since it was last drawn
+        :param canvas: (PIL.Image) Canvas
+        :param elapsed: (float) Time since the text started scrolling (in seconds)
+        :return: box: (Box) Region drawn on. None if the text did not move.
+        """
+        offset = self.offset_at(elapsed)
+        if offset == self.offset:
+            return None
+        self.offset = offset
+        canvas.paste(self.strip.crop((offset, 0, offset + self.width, self.strip.height)), self.position)
+        return self.box
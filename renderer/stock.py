@@ -1,7 +1,10 @@
-import time
 from typing import List
 
+from PIL import Image, ImageDraw
+
+from data.quote import Quote
 from data.stock import Stock
+from renderer.board import Board
 from renderer.ticker import TickerRenderer
 from util.color import Color
 from util.market_status import MarketStatus
@@ -17,43 +20,56 @@ class StockRenderer(TickerRenderer):
         stocks (List[Stock]):          List of Stock objects
     """
 
-    def __init__(self, matrix, canvas, draw, config, data):
-        super().__init__(matrix, canvas, draw, config, data)
+    def __init__(self, matrix, canvas, draw, config, data, images=None):
+        super().__init__(matrix, canvas, draw, config, data, images)
         self.stocks: List[Stock] = self.data.stocks
-        self.symbol_x: int = 0
-
-        if self.config.layout.show_logos:
-            for stock in self.stocks:
-                stock.img = load_image_url(stock.logo_url, tuple(self.coords['stock']['logo']['size']))
-
-    def render(self):
-        for stock in self.stocks:
-            self.clear()
-            if self.coords['options']['full_names']:
-                self.render_name(stock.name)
-            if self.coords['options']['image'] and self.config.layout.show_logos:
-                self.render_image(stock.img)
-            elif self.coords['options']['history_chart']:
-                self.render_chart(stock.prev_close, stock.chart_prices, stock.value_change)
-            self.render_price(self.format_price(self.currency, stock.price), 'stock')
-            self.render_symbol(stock.symbol)
-            self.render_market_status(stock.market_status)
-            self.render_percentage_change(stock.pct_change, stock.value_change)
-            self.matrix.SetImage(self.canvas)
-            time.sleep(self.config.rotation_rate)
-
-    def render_symbol(self, symbol: str):
+        self.prefetch_images(self.stocks)
+
+    @property
+    def tickers(self) -> List[Stock]:
+        return self.stocks
+
+    def compose(self, board: Board, stock: Stock, quote: Quote):
+        if self.coords['options']['full_names']:
+            self.render_name(board, quote.name)
+        if self.coords['options']['image'] and self.config.layout.show_logos:
+            self.render_image(board, self.image(stock))
+        elif self.coords['options']['history_chart']:
+            self.render_chart(board, quote)
+        self.render_price(board, self.format_price(self.currency, quote.price), 'stock')
+        self.render_symbol(board, stock.symbol)
+        self.render_market_status(board, stock.symbol, quote.market_status)
+        self.render_percentage_change(board, quote.pct_change, quote.value_change)
+
+    def submit_image(self, stock: Stock):
+        size = tuple(self.coords['stock']['logo']['size'])
+        self.images.submit((stock.logo_url, size), load_image_url, stock.logo_url, size, self.images)
+
+    def loaded_image(self, stock: Stock) -> Image:
+        return self.images.result((stock.logo_url, tuple(self.coords['stock']['logo']['size'])))
+
+    def render_symbol(self, board: Board, symbol: str):
         pos = Position(self.coords['stock']['symbol']['x'])
         offset = self.coords['stock']['market_status']['width'] if pos is Position.CENTER else 0
-        self.symbol_x = align_text(self.font.getsize(symbol),
-                                   col_width=self.matrix.width,
-                                   x=pos)[0]
-        x = self.symbol_x + self.coords['stock']['symbol']['offset'] + offset
+        x = self.symbol_x(symbol) + self.coords['stock']['symbol']['offset'] + offset
         y = self.coords['stock']['symbol']['y']
-        self.draw.text((x, y), symbol, self.text_color, self.font)
+        board.layer('symbol', (symbol,), self.font.draw, (x, y), symbol, self.text_color)
 
-    def render_market_status(self, status: MarketStatus):
-        ms_coords = self.coords['stock']['market_status']
+    def render_market_status(self, board: Board, symbol: str, status: MarketStatus):
         color = Color.RED if status is MarketStatus.CLOSED else Color.GREEN
-        x = self.symbol_x + ms_coords['offset']
-        self.draw.line(((x, ms_coords['top']), (x, ms_coords['bottom'])), color, ms_coords['width'])
+        x = self.symbol_x(symbol) + self.coords['stock']['market_status']['offset']
+        board.layer('market_status', (x, color), self.draw_market_status, x, color)
+
+    def draw_market_status(self, canvas: Image.Image, x: int, color: tuple):
+        ms_coords = self.coords['stock']['market_status']
+        ImageDraw.Draw(canvas).line(((x, ms_coords['top']), (x, ms_coords['bottom'])), color, ms_coords['width'])
+
+    def symbol_x(self, symbol: str) -> int:
+        """
+        Symbol's x-position, before its offset. The market status bar is drawn along it.
+        :param symbol: (str) Symbol
+        :return: x: (int) x-position
+        """
+        return align_text(self.font.getsize(symbol),
+                          col_width=self.matrix.width,
+                          x=Position(self.coords['stock']['symbol']['x']))[0]
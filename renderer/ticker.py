@@ -1,38 +1,135 @@
-import logging
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 
-from PIL import Image
+import numpy as np
+from PIL import Image, ImageChops
 
+from constants import BOARD_CACHE_SIZE
 from data.currency import CURRENCIES
+from data.quote import Quote
+from matrix.output import union
+from renderer.board import Board, Frame
 from renderer.renderer import Renderer
 from util.color import Color
+from util.image_prefetch import ImagePrefetcher
 from util.position import Position
 from util.utils import align_text, off_screen, align_image
 
 
 class TickerRenderer(Renderer, ABC):
     """
-    Renderer for Ticker objects
+    Renderer for Ticker objects.
+    Each frame is drawn from a single quote of its ticker, so that a frame never mixes data from different updates.
+    Frames are composed on boards kept for each ticker, whose layers are only drawn again once the values they show
+    changed. Only the region of a frame which differs from the one displayed is pushed to the matrix.
+    Subclasses list the tickers to display, and declare the layers of their frames.
 
     Arguments:
-        data (data.Data):       Data instance
+        data (data.Data):                       Data instance
+        images (util.ImagePrefetcher):          Image prefetcher, shared between renderers
 
     Attributes:
-        coords (dict):          Coordinates dictionary
-        currency (str):         Currency to display prices on
+        coords (dict):                          Coordinates dictionary
+        currency (str):                         Currency to display prices on
+        boards (OrderedDict[str, Board]):       Boards of the last BOARD_CACHE_SIZE tickers displayed, keyed by symbol
+        pending (Frame):                        First frame, composed while the previous renderer was displayed
     """
 
-    def __init__(self, matrix, canvas, draw, config, data):
+    def __init__(self, matrix, canvas, draw, config, data, images: ImagePrefetcher = None):
         super().__init__(matrix, canvas, draw, config)
         self.data = data
+        self.images: ImagePrefetcher = images or ImagePrefetcher()
         self.coords: dict = self.config.layout.coords['ticker']
         self.currency: str = self.data.config.currency
+        self.boards: OrderedDict = OrderedDict()
+        self.pending: Frame = None
 
+    @property
     @abstractmethod
-    def render(self):
+    def tickers(self) -> list:
+        """Tickers to display, in order"""
         pass
 
-    def render_name(self, name: str):
+    @abstractmethod
+    def compose(self, board: Board, ticker, quote: Quote):
+        """
+        Declare the layers of a ticker's frame on its board
+        :param board: (Board) Ticker's board
+        :param ticker: Ticker
+        :param quote: (Quote) Ticker's quote
+        """
+        pass
+
+    def render(self, following: 'TickerRenderer' = None):
+        """
+        Display each ticker for a rotation.
+        Frames are pipelined: the next ticker's frame is composed while the current one is displayed, so that it only
+        has to be swapped in once the rotation ends. During the last rotation, the first frame of the following
+        renderer is composed instead.
+        :param following: (TickerRenderer) Renderer displayed next
+        """
+        tickers = list(self.tickers)  # Tickers may be added while rendering
+        frame, self.pending = self.pending, None
+        for index, ticker in enumerate(tickers):
+            self.data.prefetch(ticker)
+            if frame is None or frame.ticker is not ticker or frame.quote is not ticker.quote:  # Updated meanwhile
+                frame = self.prepare(ticker)
+            if frame is None:  # Not initialized
+                continue
+            shown = self.display(frame)
+            if index + 1 < len(tickers):
+                frame = self.prepare(tickers[index + 1])
+            elif following is not None:
+                following.pending = following.prepare(next(iter(following.tickers), None))
+            self.hold(self.config.rotation_rate, shown)
+
+    def prepare(self, ticker) -> Frame:
+        """
+        Compose a ticker's frame, off-screen
+        :param ticker: Ticker
+        :return: frame: (Frame) Ticker's frame. None if the ticker is not initialized.
+        """
+        quote = ticker.quote if ticker is not None else None  # Consistent for the whole frame
+        if quote is None:
+            return None
+        displayed, self.scrolling = self.scrolling, []  # Text scrolling on the frame being composed
+        board = self.board(ticker.symbol)
+        self.compose(board, ticker, quote)
+        frame = Frame(ticker, quote, board.compose(), self.scrolling)
+        self.scrolling = displayed
+        return frame
+
+    def display(self, frame: Frame) -> float:
+        """
+        Display a ticker's frame, pushing only the region which differs from the frame displayed
+        :param frame: (Frame) Ticker's frame
+        :return: shown: (float) Time the frame was displayed at (monotonic)
+        """
+        self.scrolling = frame.scrolling
+        box = ImageChops.difference(self.canvas, frame.image).getbbox()
+        if box:
+            self.canvas.paste(frame.image.crop(box), box[:2])
+        for scrolling in self.scrolling:
+            box = union(box, scrolling.draw(self.canvas, 0.0))
+        if box:
+            self.show(box)
+        self.data.frame_shown()
+        return time.monotonic()
+
+    def board(self, symbol: str) -> Board:
+        """
+        Board of a ticker, to declare the layers of its next frame on
+        :param symbol: (str) Ticker symbol
+        :return: board: (Board) Ticker's board
+        """
+        board = self.boards.pop(symbol, None) or Board((self.matrix.width, self.matrix.height))
+        self.boards[symbol] = board
+        if len(self.boards) > BOARD_CACHE_SIZE:
+            self.boards.popitem(last=False)
+        return board
+
+    def render_name(self, board: Board, name: str):
         x, y = align_text(self.font.getsize(name),
                           self.matrix.width,
                           self.matrix.height,
@@ -41,9 +138,9 @@ class TickerRenderer(Renderer, ABC):
         if off_screen(self.matrix.width, self.font.getsize(name)[0]):
             self.scroll_text(name, self.font, self.text_color, Color.BLACK, (1, y))
         else:
-            self.draw.text((x, y), name, self.text_color, self.font)
+            board.layer('name', (name,), self.font.draw, (x, y), name, self.text_color)
 
-    def render_price(self, price: str, ticker_type: str):
+    def render_price(self, board: Board, price: str, ticker_type: str):
         y = self.coords[ticker_type]['price']['y']
         if off_screen(self.matrix.width, self.font.getsize(price)[0]):
             self.scroll_text(price, self.font, self.text_color, Color.BLACK, (1, y))
@@ -52,50 +149,102 @@ class TickerRenderer(Renderer, ABC):
                            col_width=self.matrix.width,
                            x=Position(self.coords[ticker_type]['price']['x']))[0]
             x += self.coords[ticker_type]['price']['offset']
-            self.draw.text((x, y), price, self.text_color, self.font)
+            board.layer('price', (price,), self.font.draw, (x, y), price, self.text_color)
 
-    def render_percentage_change(self, pct_change: str, value_change: float):
+    def render_percentage_change(self, board: Board, pct_change: str, value_change: float):
         x = align_text(self.font.getsize(pct_change),
                        col_width=self.matrix.width,
                        x=Position(self.coords['change_pct']['x']))[0]
         y = self.coords['change_pct']['y']
 
         color = self.set_change_color(value_change)
-        self.draw.text((x, y), pct_change, color, self.font)
+        board.layer('change', (pct_change, color), self.font.draw, (x, y), pct_change, color)
 
-    def render_chart(self, prev_close: float, prices: list, value_change: float):
+    def render_chart(self, board: Board, quote: Quote):
+        color = self.set_change_color(quote.value_change)
+        board.layer('chart', (quote.chart_version, color), self.draw_chart, quote.chart, color)
+
+    def draw_chart(self, canvas: Image.Image, prices: np.ndarray, color: tuple):
         chart_top = self.coords['chart']['y']
-        chart_height = self.matrix.height - chart_top - 1
-        color = self.set_change_color(value_change)
+        chart_height = self.matrix.height - chart_top
+        if len(prices):
+            mask = Image.fromarray(self.rasterize_chart(prices, self.matrix.width, chart_height), 'L')
+            canvas.paste(color, (0, chart_top, self.matrix.width, self.matrix.height), mask)
 
-        if prices:
-            try:
-                max_price = max(prices)
-                min_price = min(prices)
-                price_range = max_price - min_price
+    @staticmethod
+    def rasterize_chart(prices: np.ndarray, width: int, height: int) -> np.ndarray:
+        """
+        Rasterize prices as a filled area chart.
+        Each pixel column is filled up to the highest price falling in it, or to the price interpolated at it if
+        there are fewer prices than columns. A flat series is drawn at half height.
+        :param prices: (np.ndarray) Prices, oldest first
+        :param width: (int) Chart width (in pixels)
+        :param height: (int) Chart height (in pixels)
+        :return: mask: (np.ndarray) uint8 mask of shape (height, width). 255 where filled, 0 otherwise.
+        """
+        prices = np.asarray(prices, dtype=np.float32)
+        num_points = len(prices)
+        if num_points > width:
+            columns = np.maximum.reduceat(prices, np.arange(width) * num_points // width)
+        else:
+            columns = np.interp(np.linspace(0, num_points - 1, width), np.arange(num_points), prices)
 
-                num_points = len(prices)
-                x_step = self.matrix.width / (num_points - 1)
+        min_price, max_price = prices.min(), prices.max()
+        price_range = max_price - min_price
+        scaled = (columns - min_price) / price_range if price_range > 0 else np.full(width, 0.5)
+        tops = np.rint((height - 1) * (1 - scaled)).astype(np.int32)
+        return (np.arange(height)[:, None] >= tops[None, :]).astype(np.uint8) * 255
 
-                line_points = [(i * x_step, chart_top + chart_height * (1 - (price - min_price) / price_range))
-                               for i, price in enumerate(prices)]
+    def prefetch_images(self, tickers: list):
+        """
+        Start loading the images of the first two pages of tickers in the background, if logos are shown.
+        Tickers restored from a snapshot already have their image. Others' are loaded as they are displayed.
+        :param tickers: Tickers to load images for
+        """
+        if self.config.layout.show_logos:
+            for ticker in tickers[:2 * self.data.config.page_size]:
+                if ticker.img is None:
+                    self.submit_image(ticker)
+
+    def image(self, ticker) -> Image:
+        """
+        Ticker's image, once loaded. Loading is started if it was not already.
+        :param ticker: Ticker
+        :return: image: (PIL.Image) Ticker's image. None while it is being loaded, or if it could not be loaded.
+        """
+        if ticker.img is None:
+            self.submit_image(ticker)
+            ticker.img = self.loaded_image(ticker)
+        return ticker.img
 
-                fill_points = ([(0, chart_top + chart_height)] + line_points +
-                               [(self.matrix.width, chart_top + chart_height), (0, chart_top + chart_height)])
+    @abstractmethod
+    def submit_image(self, ticker):
+        """
+        Start loading a ticker's image
+        :param ticker: Ticker
+        """
+        pass
 
-                self.draw.polygon(fill_points, fill=color)
-                self.draw.line(line_points, fill=color, width=1)
-            except ValueError as e:
-                logging.warning('Unable to render chart', e)
+    @abstractmethod
+    def loaded_image(self, ticker) -> Image:
+        """
+        Get a ticker's image, if done loading
+        :param ticker: Ticker
+        :return: image: (PIL.Image) Ticker's image
+        """
+        pass
 
-    def render_image(self, logo: Image):
+    def render_image(self, board: Board, logo: Image):
         if logo:
-            x, y = align_image(logo,
-                               self.matrix.width,
-                               self.matrix.height,
-                               Position.CENTER,
-                               Position.BOTTOM)
-            self.canvas.paste(logo, (x, y))
+            board.layer('image', (logo,), self.draw_image, logo)
+
+    def draw_image(self, canvas: Image.Image, logo: Image):
+        x, y = align_image(logo,
+                           self.matrix.width,
+                           self.matrix.height,
+                           Position.CENTER,
+                           Position.BOTTOM)
+        canvas.paste(logo, (x, y))
 
     @staticmethod
     def format_price(currency: str, price: float) -> str:
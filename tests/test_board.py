@@ -0,0 +1,51 @@
+from unittest import mock
+
+from PIL import Image
+
+from renderer.board import Board
+from util.color import Color
+
+
+def draw_point(canvas: Image.Image, position: tuple, color: tuple):
+    canvas.putpixel(position, color)
+
+
+class TestBoard:
+    def setup_method(self):
+        self.board = Board((64, 32))
+
+    def teardown_method(self):
+        del self.board
+
+    def test_layer(self):
+        self.board.layer('price', ('$10.00',), draw_point, (3, 4), Color.WHITE)
+        layer = self.board.layers['price']
+        assert layer.position == (3, 4)
+        assert layer.image.size == (1, 1)
+
+    def test_layer_2(self):
+        render = mock.Mock()
+        self.board.layer('price', ('$10.00',), render)
+        self.board.compose()
+        self.board.layer('price', ('$10.00',), render)
+        self.board.compose()
+        self.board.layer('price', ('$10.50',), render)
+        assert render.call_count == 2
+        assert self.board.layers['price'].image is None  # Nothing drawn
+
+    def test_compose(self):
+        self.board.layer('chart', (1,), draw_point, (3, 4), Color.RED)
+        self.board.layer('price', ('$10.00',), draw_point, (3, 4), Color.WHITE)
+        image = self.board.compose()
+        assert image.getpixel((3, 4)) == Color.WHITE[:3]
+        assert image.getbbox() == (3, 4, 4, 5)
+
+    def test_compose_2(self):
+        self.board.layer('chart', (1,), draw_point, (3, 4), Color.RED)
+        first = self.board.compose()
+        self.board.layer('chart', (1,), draw_point, (3, 4), Color.RED)
+        assert self.board.compose() is first  # Unchanged
+        self.board.layer('price', ('$10.00',), draw_point, (5, 6), Color.WHITE)
+        self.board.compose()
+        assert list(self.board.layers) == ['price']  # Layers not declared are dropped
+        assert self.board.image.getpixel((3, 4)) == (0, 0, 0)
@@ -0,0 +1,71 @@
+import numpy as np
+
+from data.chart_series import ChartSeries
+
+
+class TestChartSeries:
+    def setup_method(self):
+        self.series = ChartSeries(8)
+
+    def teardown_method(self):
+        del self.series
+
+    def test_append(self):
+        self.series.extend([1.0, 2.0, 3.0])
+        assert self.series.values().tolist() == [1.0, 1.0, 2.0, 2.0, 3.0, 3.0]
+
+    def test_append_2(self):
+        # Memory is constant, no matter how many prices are appended
+        self.series.extend(range(10000))
+        assert self.series.values().nbytes <= 2 * 8 * 4 + 2 * 4
+        assert self.series.bucket_size == self.series.max_bucket_size
+
+    def test_append_3(self):
+        # Buckets keep their extremes, in order
+        self.series.extend([5.0, 1.0, 9.0, 4.0] * 8)
+        values = self.series.values()
+        assert values.min() == 1.0
+        assert values.max() == 9.0
+
+    def test_append_4(self):
+        # Latest price is always included
+        self.series.extend(range(100))
+        self.series.append(-1.0)
+        assert self.series.values()[-1] == -1.0 or self.series.values()[-2] == -1.0
+
+    def test_replace_last(self):
+        self.series.extend([1.0, 2.0])
+        self.series.replace_last(5.0)
+        assert self.series.values().tolist() == [1.0, 1.0, 5.0, 5.0]
+
+    def test_values(self):
+        self.series.append(1.0)
+        assert self.series.values().dtype == np.float32
+
+    def test_version(self):
+        version = self.series.version
+        self.series.append(1.0)
+        assert self.series.version > version
+
+    def test_clear(self):
+        self.series.extend(range(100))
+        self.series.clear()
+        assert len(self.series) == 0
+        assert self.series.bucket_size == 1
+
+    def test_restore(self):
+        self.series.extend(range(50))
+        restored = ChartSeries(8)
+        restored.restore(self.series.to_snapshot())
+        assert restored.values().tolist() == self.series.values().tolist()
+        assert restored.bucket_size == self.series.bucket_size
+
+    def test_release(self):
+        self.series.extend([1.0, 2.0, 3.0])
+        self.series.release()
+        assert self.series.released
+        assert len(self.series) == 0
+        assert self.series.to_snapshot()['buckets'] == []
+        self.series.append(4.0)
+        assert not self.series.released
+        assert self.series.values().tolist() == [4.0, 4.0]
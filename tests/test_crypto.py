@@ -1,6 +1,7 @@
 import logging
 
 from data.crypto import Crypto
+from data.chart_series import ChartSeries
 from data.status import Status
 
 
@@ -31,7 +32,7 @@ class TestCrypto:
 
     def test_get_chart_prices(self):
         chart_prices = self.crypto.get_chart_prices()
-        assert isinstance(chart_prices, list)
+        assert isinstance(chart_prices, ChartSeries)
 
     def test_get_chart_prices_2(self):
         chart_prices = self.crypto.get_chart_prices()
@@ -1,9 +1,31 @@
+import logging
 import time
+from unittest import mock
 
 import pytest
+from requests import Timeout
 
+from api import data
 from api.data import Data
+from api.provider import ReplayProvider
+from benchmarks.cassette import synthetic_cassette
+from constants import DEFAULT_FETCH_TIMEOUT, QUARANTINE_THRESHOLD, SNAPSHOT_SAVE_INTERVAL
+from data.status import Status
 from matrix.matrix_config import MatrixConfig
+from util.upstream import CircuitOpenError
+
+
+class TimeoutProvider(ReplayProvider):
+    """Replays a cassette, except for the history of the given symbols, which times out"""
+
+    def __init__(self, cassette: dict, timeouts: set):
+        super().__init__(cassette)
+        self.timeouts = timeouts
+
+    def history(self, symbol: str, period: str = None, start=None):
+        if symbol in self.timeouts:
+            raise Timeout(f'Timed out fetching history for {symbol}')
+        return super().history(symbol, period, start)
 
 
 class TestData:
@@ -20,3 +42,138 @@ class TestData:
 
     def test_should_update_2(self):
         assert self.data.should_update() is False
+
+    def test_initialize(self, tmpdir):
+        config = self.data.config
+        symbols = config.stocks + config.cryptos + config.forex
+        provider = ReplayProvider(synthetic_cassette(symbols, bars=120), latency=0.01)
+        with mock.patch.object(data, 'SNAPSHOT_FILE', str(tmpdir.join('snapshot.json.gz'))):
+            replayed = Data(config, provider=provider)
+            assert replayed.initialized.wait(10)
+        assert [ticker.symbol for ticker in replayed.stocks + replayed.cryptos + replayed.forex] == symbols
+        assert replayed.progress == [len(symbols), len(symbols)]
+        assert 0 < replayed.time_to_first_ticker <= time.monotonic() - replayed.started
+        assert replayed.missing() == []
+
+    def test_initialize_2(self, tmpdir, caplog):
+        # Only symbols which came back invalid are reported, not those still missing
+        config = self.data.config
+        symbols = [symbol for symbol in config.stocks + config.cryptos + config.forex if symbol != 'MSFT']
+        provider = TimeoutProvider(synthetic_cassette(symbols, bars=120), {'AMZN'})
+        caplog.clear()
+        with mock.patch.object(data, 'SNAPSHOT_FILE', str(tmpdir.join('snapshot.json.gz'))), \
+                mock.patch.object(Data, 'turn_page'), caplog.at_level(logging.WARNING):
+            replayed = Data(config, provider=provider)
+            assert replayed.initialized.wait(10)
+        assert replayed.invalid == {'MSFT'}
+        assert 'MSFT may not be valid.' in caplog.text
+        assert 'AMZN may not be valid.' not in caplog.text
+
+    def test_turn_page(self, tmpdir):
+        config = self.data.config
+        config.page_size = 2
+        symbols = config.stocks + config.cryptos + config.forex
+        provider = ReplayProvider(synthetic_cassette(symbols, bars=120))
+        with mock.patch.object(data, 'SNAPSHOT_FILE', str(tmpdir.join('snapshot.json.gz'))):
+            replayed = Data(config, provider=provider)
+            assert replayed.initialized.wait(10)
+            replayed.turn_page()
+            tickers = replayed.stocks + replayed.cryptos + replayed.forex
+            assert [ticker.charted for ticker in tickers] == [True] * 4 + [False] * 5
+            assert not len(tickers[4].quote.chart)
+            replayed.page = 3
+            replayed.turn_page()
+        assert [ticker.charted for ticker in tickers] == [True] + [False] * 5 + [True] * 3
+        assert all(len(ticker.quote.chart) for ticker in tickers if ticker.charted)
+        assert tickers[1].history.series.released
+
+    def test_update(self, tmpdir):
+        config = self.data.config
+        provider = ReplayProvider(synthetic_cassette(config.stocks + config.cryptos + config.forex, bars=120))
+        with mock.patch.object(data, 'SNAPSHOT_FILE', str(tmpdir.join('snapshot.json.gz'))), \
+                mock.patch.object(Data, 'turn_page'):
+            replayed = Data(config, provider=provider)
+            assert replayed.initialized.wait(10)
+            replayed.stocks.pop(0)  # Not initialized in time on startup
+            assert replayed.update() is Status.SUCCESS
+        assert replayed.missing() == []
+        assert replayed.last_cycle.timeout == DEFAULT_FETCH_TIMEOUT  # Initialized within the update's cycle
+
+    def test_update_2(self, tmpdir):
+        # Tickers are not quarantined for failures affecting every ticker
+        config = self.data.config
+        provider = ReplayProvider(synthetic_cassette(config.stocks + config.cryptos + config.forex, bars=120))
+        with mock.patch.object(data, 'SNAPSHOT_FILE', str(tmpdir.join('snapshot.json.gz'))), \
+                mock.patch.object(Data, 'turn_page'):
+            replayed = Data(config, provider=provider)
+            assert replayed.initialized.wait(10)
+            outage = CircuitOpenError('Circuit open for query1.finance.yahoo.com')
+            with mock.patch.object(provider, 'quotes', side_effect=outage), \
+                    mock.patch.object(provider, 'price', side_effect=outage):
+                for _ in range(QUARANTINE_THRESHOLD):
+                    assert replayed.update() is Status.NETWORK_ERROR
+        results = replayed.last_cycle.results
+        assert all(results[ticker.symbol].status is Status.NETWORK_ERROR
+                   for ticker in replayed.stocks + replayed.cryptos + replayed.forex)
+        assert replayed.scheduler.failures == {}
+        assert replayed.scheduler.quarantined == {}
+
+    def test_update_3(self, tmpdir):
+        # Tickers whose initialization timed out are left missing, and retried on the next update
+        config = self.data.config
+        provider = TimeoutProvider(synthetic_cassette(config.stocks + config.cryptos + config.forex, bars=120),
+                                   {'AMZN'})
+        with mock.patch.object(data, 'SNAPSHOT_FILE', str(tmpdir.join('snapshot.json.gz'))), \
+                mock.patch.object(Data, 'turn_page'):
+            replayed = Data(config, provider=provider)
+            assert replayed.initialized.wait(10)
+            assert 'AMZN' not in [stock.symbol for stock in replayed.stocks]
+            assert replayed.missing() == ['AMZN']
+            assert 'AMZN' not in replayed.invalid
+            provider.timeouts.clear()
+            replayed.update()
+        assert [stock.symbol for stock in replayed.stocks] == config.stocks
+        assert replayed.stocks[1].quote is not None
+        assert replayed.missing() == []
+
+    def test_update_4(self):
+        with self.data.lock:
+            assert self.data.update() is Status.SKIPPED  # Already being updated
+
+    def test_update_async(self, tmpdir):
+        config = self.data.config
+        provider = ReplayProvider(synthetic_cassette(config.stocks + config.cryptos + config.forex, bars=120))
+        with mock.patch.object(data, 'SNAPSHOT_FILE', str(tmpdir.join('snapshot.json.gz'))), \
+                mock.patch.object(Data, 'turn_page'):  # Not holding the lock after initialization
+            replayed = Data(config, provider=provider)
+            assert replayed.initialized.wait(10)
+        with mock.patch.object(Data, 'update', side_effect=lambda: time.sleep(1)) as update:
+            start = time.monotonic()
+            replayed.update_async()
+            assert time.monotonic() - start < 0.5  # Not waited on
+            time.sleep(0.1)
+            assert update.call_count == 1
+
+    def test_update_async_2(self):
+        with mock.patch.object(Data, 'update') as update, self.data.lock:
+            self.data.update_async()
+        assert update.call_count == 0  # Already being updated
+
+    def test_autosave_snapshot(self):
+        with mock.patch.object(self.data, 'save_snapshot') as save_snapshot:
+            self.data.snapshot_saved = time.time()
+            self.data.autosave_snapshot()
+            assert save_snapshot.call_count == 0  # Saved recently
+            self.data.save_pending_snapshot()
+        assert save_snapshot.call_count == 1
+
+    def test_autosave_snapshot_2(self):
+        with mock.patch.object(self.data, 'save_snapshot') as save_snapshot:
+            self.data.snapshot_saved = time.time() - SNAPSHOT_SAVE_INTERVAL
+            self.data.autosave_snapshot()
+        assert save_snapshot.call_count == 1
+
+    def test_ready_tickers(self):
+        ticker = mock.Mock(valid=True)
+        tickers = {'MSFT': ticker, 'TSLA': mock.Mock(valid=False)}
+        assert Data.ready_tickers(tickers, ['TSLA', 'AMZN', 'MSFT']) == [ticker]
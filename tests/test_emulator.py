@@ -0,0 +1,52 @@
+import os
+
+from PIL import Image
+
+from matrix.emulator import EmulatedMatrix, EmulatedMatrixOptions
+from util.color import Color
+
+RED, GREEN, BLUE = Color.RED[:3], Color.GREEN[:3], Color.BLUE[:3]
+
+
+class TestEmulator:
+    def setup_method(self):
+        options = EmulatedMatrixOptions()
+        options.rows = 32
+        options.cols = 64
+        options.chain_length = 2
+        self.matrix = EmulatedMatrix(options)
+
+    def teardown_method(self):
+        del self.matrix
+
+    def test_size(self):
+        assert (self.matrix.width, self.matrix.height) == (128, 32)
+        assert self.matrix.buffer.shape == (32, 128, 3)
+
+    def test_set_image(self):
+        self.matrix.SetImage(Image.new('RGB', (4, 4), RED), 126, -2)
+        assert self.matrix.buffer[0:2, 126:128].tolist() == [[list(RED)] * 2] * 2
+        assert not self.matrix.buffer[2:, :].any()
+        assert not self.matrix.buffer[:, :126].any()
+        assert self.matrix.frames == 1
+
+    def test_swap_on_vsync(self):
+        canvas = self.matrix.CreateFrameCanvas()
+        canvas.Fill(*GREEN)
+        previous = self.matrix.SwapOnVSync(canvas)
+        assert (self.matrix.buffer == GREEN).all()
+        assert not previous.buffer.any()
+        assert len(self.matrix.frame_times) == 1
+
+    def test_clear(self):
+        self.matrix.SetImage(Image.new('RGB', (128, 32), BLUE))
+        self.matrix.Clear()
+        assert not self.matrix.buffer.any()
+
+    def test_dump(self, tmpdir):
+        matrix = EmulatedMatrix(dump_dir=str(tmpdir))
+        matrix.SetImage(Image.new('RGB', (32, 32), RED))
+        matrix.SwapOnVSync(matrix.CreateFrameCanvas())
+        assert sorted(os.listdir(tmpdir)) == ['000001.png', '000002.png']
+        assert Image.open(os.path.join(tmpdir, '000001.png')).getpixel((0, 0)) == RED
+        assert 'displayed 2 frames' in matrix.summary()
@@ -0,0 +1,118 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from curl_cffi.requests.exceptions import DNSError
+from requests import Timeout
+
+from api.engine import FetchCycle
+from data.status import Status
+
+
+class TestFetchCycle:
+    def setup_method(self):
+        self.cycle = FetchCycle(max_concurrency=4, timeout=0.5)
+
+    def teardown_method(self):
+        del self.cycle
+
+    def test_run(self):
+        values = self.cycle.run({'A': lambda: 1, 'B': lambda: 2})
+        assert values == {'A': 1, 'B': 2}
+
+    def test_run_2(self):
+        self.cycle.run({'A': lambda: Status.NETWORK_ERROR})
+        assert self.cycle.results['A'].status is Status.NETWORK_ERROR
+
+    def test_run_3(self):
+        def timeout():
+            raise Timeout()
+        self.cycle.run({'A': timeout})
+        assert self.cycle.results['A'].status is Status.NETWORK_ERROR
+
+    def test_run_3_2(self):
+        def dns_error():
+            raise DNSError('Could not resolve host')
+        self.cycle.run({'A': dns_error})
+        assert self.cycle.results['A'].status is Status.NETWORK_ERROR
+
+    def test_run_4(self):
+        def error():
+            raise KeyError()
+        values = self.cycle.run({'A': error, 'B': lambda: 2})
+        assert values == {'B': 2}
+        assert self.cycle.results['A'].status is Status.FAIL
+
+    def test_run_5(self):
+        # Stragglers are abandoned once the deadline is reached
+        start = time.monotonic()
+        values = self.cycle.run({'A': lambda: time.sleep(2), 'B': lambda: 2})
+        assert time.monotonic() - start < 1
+        assert values == {'B': 2}
+        assert self.cycle.results['A'].status is Status.TIMEOUT
+
+    def test_run_6(self):
+        # Deadline is shared by every run of the cycle
+        self.cycle.run({'A': lambda: time.sleep(0.6)})
+        self.cycle.run({'B': lambda: 2})
+        assert self.cycle.results['B'].status is Status.TIMEOUT
+
+    def test_run_7(self):
+        running, peak = [], []
+        lock = threading.Lock()
+
+        def job():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+        self.cycle.run({str(i): job for i in range(12)})
+        assert max(peak) <= 4
+
+    def test_run_8(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        threads = []
+        for _ in range(2):
+            FetchCycle(executor=executor).run({'A': lambda: threads.append(threading.get_ident())})
+        assert threads[0] == threads[1]
+        executor.shutdown()
+
+    def test_run_9(self):
+        # Results are handed over as each job completes, before the slowest one is done
+        results = []
+        values = self.cycle.run({'A': lambda: time.sleep(0.2), 'B': lambda: 2},
+                                lambda key, value: results.append((key, value, time.monotonic())))
+        assert values == {'B': 2}
+        assert [(key, value) for key, value, _ in results] == [('B', 2), ('A', None)]
+        assert results[1][2] - results[0][2] >= 0.1
+
+    def test_run_10(self):
+        # Jobs not started by the deadline are never run
+        started = []
+        cycle = FetchCycle(max_concurrency=1, timeout=0.1)
+        cycle.run({'A': lambda: time.sleep(0.3), 'B': lambda: started.append('B')})
+        time.sleep(0.4)
+        assert started == []
+        assert cycle.results['B'].status is Status.TIMEOUT
+
+    def test_latency(self):
+        self.cycle.run({'A': lambda: time.sleep(0.1)})
+        assert self.cycle.results['A'].latency >= 0.1
+
+    def test_status(self):
+        self.cycle.run({'A': lambda: Status.NETWORK_ERROR, 'B': lambda: 2})
+        assert self.cycle.status is Status.SUCCESS
+
+    def test_status_2(self):
+        self.cycle.run({'A': lambda: Status.NETWORK_ERROR})
+        assert self.cycle.status is Status.NETWORK_ERROR
+
+    def test_summary(self):
+        self.cycle.run({'A': lambda: 1})
+        assert '1/1 succeeded' in self.cycle.summary()
+
+    def test_summary_2(self):
+        self.cycle.run({'A': lambda: time.sleep(1)})
+        assert '1 timed out (1 abandoned, still running)' in self.cycle.summary()
@@ -0,0 +1,38 @@
+import time
+
+from api.exchange_rates import ExchangeRates
+
+
+class TestExchangeRates:
+    def setup_method(self):
+        self.rates = ExchangeRates(filename='')
+        self.rates.rates = {'USD': 1.0, 'EUR': 0.9, 'JPY': 150.0}
+        self.rates.updated = time.time()
+
+    def teardown_method(self):
+        del self.rates
+
+    def test_rate(self):
+        assert self.rates.rate('EUR') == 0.9
+
+    def test_rate_2(self):
+        assert abs(self.rates.rate('JPY', 'EUR') - 150.0 / 0.9) < 1e-9
+
+    def test_rate_3(self):
+        assert self.rates.rate('XXX') == 1.0
+
+    def test_convert(self):
+        assert self.rates.convert(10.0, 'USD', 'JPY') == 1500.0
+
+    def test_is_stale(self):
+        assert self.rates.is_stale() is False
+        self.rates.updated -= self.rates.ttl
+        assert self.rates.is_stale() is True
+
+    def test_load(self, tmpdir):
+        filename = str(tmpdir.join('exchange_rates.json.gz'))
+        self.rates.filename = filename
+        self.rates.save()
+        restored = ExchangeRates(filename=filename)
+        assert restored.rates == self.rates.rates
+        assert restored.updated == self.rates.updated
@@ -1,6 +1,7 @@
 import logging
 
 from data.forex import Forex
+from data.chart_series import ChartSeries
 from data.status import Status
 
 
@@ -27,7 +28,7 @@ class TestForex:
 
     def test_get_chart_prices(self):
         chart_prices = self.forex.get_chart_prices()
-        assert isinstance(chart_prices, list)
+        assert isinstance(chart_prices, ChartSeries)
 
     def test_get_chart_prices_2(self):
         chart_prices = self.forex.get_chart_prices()
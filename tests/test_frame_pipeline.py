@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from PIL import Image, ImageDraw
+
+from matrix.emulator import EmulatedMatrix
+from renderer.ticker import TickerRenderer
+from util.color import Color
+
+
+def draw_point(canvas: Image.Image, position: tuple, color: tuple):
+    canvas.putpixel(position, color)
+
+
+class PointRenderer(TickerRenderer):
+    """Draws a point at the column of each ticker's price"""
+
+    def __init__(self, matrix, canvas, config, tickers: list):
+        super().__init__(matrix, canvas, ImageDraw.Draw(canvas), config, mock.Mock())
+        self.points = tickers
+
+    @property
+    def tickers(self) -> list:
+        return self.points
+
+    def compose(self, board, ticker, quote):
+        board.layer('price', (quote.price,), draw_point, (quote.price, 0), Color.WHITE)
+
+    def submit_image(self, ticker):
+        pass
+
+    def loaded_image(self, ticker):
+        return None
+
+
+def ticker(symbol: str, price: int) -> SimpleNamespace:
+    return SimpleNamespace(symbol=symbol, quote=SimpleNamespace(price=price))
+
+
+class TestFramePipeline:
+    def setup_method(self):
+        self.matrix = EmulatedMatrix()
+        self.canvas = Image.new('RGB', (self.matrix.width, self.matrix.height))
+        config = SimpleNamespace(layout=SimpleNamespace(font=None, coords={'ticker': {}}, show_logos=False),
+                                 rotation_rate=0)
+        self.renderer = PointRenderer(self.matrix, self.canvas, config, [ticker('A', 1), ticker('B', 2)])
+        self.following = PointRenderer(self.matrix, self.canvas, config, [ticker('C', 3)])
+
+    def teardown_method(self):
+        del self.renderer
+        del self.following
+        del self.matrix
+
+    def test_prepare(self):
+        frame = self.renderer.prepare(self.renderer.tickers[0])
+        assert frame.image.getpixel((1, 0)) == Color.WHITE[:3]
+        assert self.matrix.frames == 0  # Composed off-screen
+        assert self.canvas.getbbox() is None
+
+    def test_prepare_2(self):
+        assert self.renderer.prepare(SimpleNamespace(symbol='D', quote=None)) is None  # Not initialized
+        assert self.renderer.prepare(None) is None
+
+    def test_render(self):
+        self.renderer.render(self.following)
+        assert self.matrix.frames == 2
+        assert self.canvas.getpixel((2, 0)) == Color.WHITE[:3]
+        assert self.following.pending.ticker is self.following.tickers[0]
+
+    def test_render_2(self):
+        self.following.pending = self.following.prepare(self.following.tickers[0])
+        self.following.tickers[0].quote = SimpleNamespace(price=4)  # Updated after the frame was composed
+        self.following.render()
+        assert self.following.pending is None
+        assert self.canvas.getpixel((4, 0)) == Color.WHITE[:3]
+        assert self.canvas.getpixel((3, 0)) == (0, 0, 0)
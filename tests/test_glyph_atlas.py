@@ -0,0 +1,42 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+from util.color import Color
+from util.glyph_atlas import GlyphAtlas
+from util.utils import load_font
+
+
+class TestGlyphAtlas:
+    def setup_method(self):
+        self.font = load_font('4x6.ttf', 6)
+        self.atlas = GlyphAtlas(self.font)
+
+    def teardown_method(self):
+        del self.atlas
+        del self.font
+
+    def test_getsize(self):
+        for text in ['TSLA', '$418.10', '-1.34%', 'Sun, Jan 5', '']:
+            assert self.atlas.getsize(text) == self.font.getsize(text)
+
+    def test_getsize_2(self):
+        assert 'Ж' not in self.atlas.glyphs
+        assert self.atlas.getsize('Ж1') == self.font.getsize('Ж1')
+        assert 'Ж' in self.atlas.glyphs
+
+    def test_draw(self):
+        for font in [self.font, load_font('cherry-10-b.ttf', 10), load_font('10x20.ttf', 20)]:
+            atlas = GlyphAtlas(font)
+            for text in ['TSLA', 'zł78.23', '-1.34%', '12:45 PM', 'gjpqy|~']:
+                expected = Image.new('RGB', (128, 32))
+                ImageDraw.Draw(expected).text((3, 5), text, Color.RED, font)
+                result = Image.new('RGB', (128, 32))
+                atlas.draw(result, (3, 5), text, Color.RED)
+                assert np.array_equal(np.asarray(result), np.asarray(expected))
+
+    def test_draw_2(self):
+        canvas = Image.new('RGB', (64, 32))
+        self.atlas.draw(canvas, (1, 1), 'AMZN', Color.WHITE)
+        self.atlas.draw(canvas, (1, 1), 'AMZN', Color.WHITE)
+        self.atlas.draw(canvas, (1, 1), '', Color.WHITE)
+        assert list(self.atlas.masks) == ['AMZN']
@@ -0,0 +1,58 @@
+import time
+from unittest import mock
+
+from constants import HISTORY_MAX_GAP
+from data.history import History
+
+
+class TestHistory:
+    def setup_method(self):
+        now = int(time.time()) // 60 * 60
+        self.history = History(8)
+        self.history.merge([now - 120, now - 60, now], [1.0, 2.0, 3.0])
+
+    def teardown_method(self):
+        del self.history
+
+    def test_needs_backfill(self):
+        assert History().needs_backfill() is True
+
+    def test_needs_backfill_2(self):
+        assert self.history.needs_backfill() is False
+
+    def test_needs_backfill_3(self):
+        history = History()
+        history.merge([int(time.time()) - HISTORY_MAX_GAP - 60], [1.0])
+        assert history.needs_backfill() is True
+
+    def test_merge(self):
+        # Last bar is replaced, as it may have still been forming
+        last = self.history.last_timestamp
+        self.history.merge([last, last + 60], [3.5, 4.0])
+        assert self.history.series.values().tolist() == [1.0, 1.0, 2.0, 2.0, 3.5, 3.5, 4.0, 4.0]
+        assert self.history.last_timestamp == last + 60
+
+    def test_merge_2(self):
+        self.history.merge([], [])
+        assert self.history.series.values().tolist() == [1.0, 1.0, 2.0, 2.0, 3.0, 3.0]
+
+    def test_merge_3(self):
+        # Bars older than the last one are ignored
+        last = self.history.last_timestamp
+        self.history.merge([last - 600], [10.0])
+        assert 10.0 not in self.history.series.values().tolist()
+
+    def test_update(self):
+        last = self.history.last_timestamp
+        provider = mock.Mock()
+        provider.history.return_value = ([last + 60], [4.0])
+        self.history.update(provider, 'AMZN')
+        assert self.history.last_timestamp == last + 60
+
+    def test_update_2(self):
+        # Bars fetched after the deadline are discarded
+        last = self.history.last_timestamp
+        provider = mock.Mock()
+        provider.history.return_value = ([last + 60], [4.0])
+        self.history.update(provider, 'AMZN', deadline=0)
+        assert self.history.last_timestamp == last
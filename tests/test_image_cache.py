@@ -0,0 +1,47 @@
+import os
+import time
+
+from PIL import Image
+
+from util.image_cache import ImageCache
+
+
+class TestImageCache:
+    def test_get(self, tmpdir):
+        cache = ImageCache(str(tmpdir))
+        cache.put('https://example.com/logo.png', (10, 10), Image.new('RGB', (10, 5), (255, 0, 0)), etag='"abc"')
+        image, metadata = cache.get('https://example.com/logo.png', (10, 10))
+        assert image.size == (10, 5)
+        assert image.getpixel((0, 0)) == (255, 0, 0)
+        assert metadata['etag'] == '"abc"'
+
+    def test_get_2(self, tmpdir):
+        cache = ImageCache(str(tmpdir))
+        cache.put('https://example.com/logo.png', (10, 10), Image.new('RGB', (10, 5)))
+        image, metadata = cache.get('https://example.com/logo.png', (20, 20))
+        assert image is None
+        assert metadata == {}
+
+    def test_is_stale(self, tmpdir):
+        cache = ImageCache(str(tmpdir), revalidate_age=60)
+        assert cache.is_stale({'validated': time.time() - 120}) is True
+        assert cache.is_stale({'validated': time.time()}) is False
+
+    def test_validated(self, tmpdir):
+        cache = ImageCache(str(tmpdir), revalidate_age=60)
+        cache.put('https://example.com/logo.png', (10, 10), Image.new('RGB', (10, 5)))
+        _, metadata = cache.get('https://example.com/logo.png', (10, 10))
+        cache.validated('https://example.com/logo.png', (10, 10), {**metadata, 'validated': 0})
+        _, metadata = cache.get('https://example.com/logo.png', (10, 10))
+        assert cache.is_stale(metadata) is False
+
+    def test_evict(self, tmpdir):
+        cache = ImageCache(str(tmpdir))
+        for i in range(3):
+            cache.put(f'https://example.com/{i}.png', (10, 10), Image.new('RGB', (10, 10)))
+            key = cache.key(f'https://example.com/{i}.png', (10, 10))
+            os.utime(cache.path(key, 'png'), (i, i))
+        cache.max_size = os.path.getsize(cache.path(key, 'png')) * 2
+        cache.evict()
+        assert cache.get('https://example.com/0.png', (10, 10))[0] is None
+        assert cache.get('https://example.com/2.png', (10, 10))[0] is not None
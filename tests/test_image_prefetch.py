@@ -0,0 +1,47 @@
+import threading
+
+from PIL import Image
+
+from util.image_prefetch import ImagePrefetcher
+
+
+class TestImagePrefetcher:
+    def setup_method(self):
+        self.images = ImagePrefetcher(max_workers=2)
+
+    def teardown_method(self):
+        self.images.shutdown()
+
+    def test_result(self):
+        self.images.submit('logo', Image.new, 'RGB', (2, 2))
+        image = self.images.result('logo', timeout=None)
+        assert image.size == (2, 2)
+
+    def test_result_2(self):
+        event = threading.Event()
+        self.images.submit('logo', event.wait)
+        assert self.images.result('logo') is None
+        assert self.images.done('logo') is False
+        event.set()
+
+    def test_result_3(self):
+        def fail():
+            raise OSError('Unreachable')
+        self.images.submit('logo', fail)
+        assert self.images.result('logo', timeout=None) is None
+        assert self.images.done('logo') is True
+
+    def test_submit(self):
+        calls = []
+        self.images.submit('flag', calls.append, 1)
+        self.images.submit('flag', calls.append, 2)
+        self.images.result('flag', timeout=None)
+        assert calls == [1]
+
+    def test_revalidate(self):
+        event, calls = threading.Event(), []
+        self.images.revalidate(('logo', (2, 2)), lambda: calls.append(event.wait()))
+        self.images.revalidate(('logo', (2, 2)), calls.append, 2)  # Already being revalidated
+        event.set()
+        self.images.revalidations[('logo', (2, 2))].result()
+        assert calls == [True]
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from util.market_calendar import EXCHANGE_HOURS, FOREX_HOURS
+
+
+class TestMarketCalendar:
+    def test_is_open(self):
+        now = datetime(2024, 1, 8, 15, 0, tzinfo=timezone.utc)  # Monday, 10:00 AM New York
+        assert EXCHANGE_HOURS['NMS'].is_open(now) is True
+
+    def test_is_open_2(self):
+        now = datetime(2024, 1, 8, 21, 30, tzinfo=timezone.utc)  # Monday, 4:30 PM New York
+        assert EXCHANGE_HOURS['NMS'].is_open(now) is False
+
+    def test_is_open_3(self):
+        now = datetime(2024, 1, 13, 15, 0, tzinfo=timezone.utc)  # Saturday
+        assert FOREX_HOURS.is_open(now) is False
+
+    def test_is_open_4(self):
+        now = datetime(2024, 1, 9, 3, 0, tzinfo=timezone.utc)  # Monday, 10:00 PM New York
+        assert FOREX_HOURS.is_open(now) is True
+
+    def test_next_open(self):
+        now = datetime(2024, 1, 12, 21, 30, tzinfo=timezone.utc)  # Friday, 4:30 PM New York
+        assert EXCHANGE_HOURS['NMS'].next_open(now) == datetime(2024, 1, 15, 14, 30, tzinfo=timezone.utc)
+
+    def test_next_open_2(self):
+        now = datetime(2024, 1, 13, 15, 0, tzinfo=timezone.utc)  # Saturday
+        assert FOREX_HOURS.next_open(now) == datetime(2024, 1, 14, 22, 0, tzinfo=timezone.utc)
+
+    def test_session_start(self):
+        now = datetime(2024, 1, 9, 3, 0, tzinfo=timezone.utc)  # Monday, 10:00 PM New York
+        assert FOREX_HOURS.session_start(now) == datetime(2024, 1, 8, 22, 0, tzinfo=timezone.utc)
@@ -0,0 +1,43 @@
+from PIL import Image, ImageDraw
+
+from matrix.emulator import EmulatedMatrix
+from matrix.output import FrameOutput, union
+
+
+class TestFrameOutput:
+    def setup_method(self):
+        self.matrix = EmulatedMatrix()
+        self.output = FrameOutput(self.matrix)
+        self.image = Image.new('RGB', (self.matrix.width, self.matrix.height))
+        self.draw = ImageDraw.Draw(self.image)
+
+    def teardown_method(self):
+        del self.output
+        del self.matrix
+
+    def test_show(self):
+        self.draw.rectangle((0, 0, 31, 31), fill=(255, 0, 0))
+        self.output.show(self.image)
+        assert (self.matrix.buffer == (255, 0, 0)).all()
+        assert self.output.pixels == 32 * 32
+
+    def test_show_2(self):
+        self.output.show(self.image)
+        self.draw.point((1, 1), fill=(0, 255, 0))
+        self.output.show(self.image, (1, 1, 2, 2))
+        self.draw.point((30, 30), fill=(0, 0, 255))
+        self.output.show(self.image, (30, 30, 31, 31))
+        assert (self.matrix.buffer == self.image).all()  # The off-screen canvas caught up with the first point
+        assert self.output.pixels == 32 * 32 + 32 * 32 + 30 * 30
+
+    def test_show_3(self):
+        self.output.show(self.image)
+        self.output.show(self.image)
+        self.output.show(self.image, (40, 40, 50, 50))  # Off the matrix
+        assert self.output.frames == 3
+        assert self.matrix.frames == 3
+
+    def test_union(self):
+        assert union((0, 0, 2, 2), (4, 1, 6, 3)) == (0, 0, 6, 3)
+        assert union(None, (4, 1, 6, 3)) == (4, 1, 6, 3)
+        assert union(None, None) is None
@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from api.data import fetch_quotes
+from api.provider import ReplayProvider, RecordingProvider
+from benchmarks.cassette import synthetic_cassette
+from data.status import Status
+from data.stock import Stock
+from util.market_status import MarketStatus
+
+
+class TestReplayProvider:
+    def setup_method(self):
+        self.cassette = synthetic_cassette(['AMZN', 'MSFT'], bars=120)
+        self.provider = ReplayProvider(self.cassette)
+
+    def teardown_method(self):
+        del self.provider
+
+    def test_price(self):
+        assert self.provider.price('AMZN') == self.cassette['quotes']['AMZN']
+        assert self.provider.price('TSLA') is None
+
+    def test_quotes(self):
+        assert list(self.provider.quotes(['AMZN', 'TSLA', 'MSFT'])) == ['AMZN', 'MSFT']
+        assert self.provider.requests == 1
+
+    def test_quotes_2(self):
+        assert fetch_quotes(self.provider, ['AMZN', 'MSFT', 'TSLA'], 1).keys() == {'AMZN', 'MSFT'}
+        assert self.provider.requests == 3
+
+    def test_history(self):
+        timestamps, prices = self.provider.history('AMZN', period='1d')
+        assert prices == self.cassette['history']['AMZN']['prices']
+        assert timestamps[1] - timestamps[0] == 60
+
+    def test_history_2(self):
+        timestamps, _ = self.provider.history('AMZN', period='1d')
+        start = datetime.fromtimestamp(timestamps[-2], tz=timezone.utc)
+        assert self.provider.history('AMZN', start=start)[0] == timestamps[-2:]
+
+    def test_history_3(self):
+        assert self.provider.history('TSLA', period='1d') == ([], [])
+
+    def test_version(self):
+        with pytest.raises(ValueError):
+            ReplayProvider({**self.cassette, 'version': 0})
+
+    def test_stock(self):
+        stock = Stock('AMZN', provider=self.provider)
+        assert stock.valid is True
+        assert stock.price == self.cassette['quotes']['AMZN']['regularMarketPrice']
+        assert stock.logo_url.endswith('www.amzn.com')
+        assert stock.market_status is MarketStatus.OPEN
+        assert len(stock.chart_prices) > 0
+        assert stock.update() is Status.SUCCESS
+
+    def test_stock_2(self):
+        assert Stock('TSLA', provider=self.provider).valid is False
+
+    def test_record(self, tmpdir):
+        filename = str(tmpdir.join('recording.json.gz'))
+        recorder = RecordingProvider(self.provider, filename)
+        recorder.quotes(['AMZN'])
+        recorder.price('MSFT')
+        recorder.profile('AMZN')
+        recorder.history('AMZN', period='1d')
+        recorder.exchange_rates()
+        recorder.save()
+        replay = ReplayProvider.from_file(filename)
+        assert replay.quotes(['AMZN', 'MSFT']) == self.provider.quotes(['AMZN', 'MSFT'])
+        assert replay.profile('AMZN') == self.cassette['profiles']['AMZN']
+        assert replay.history('AMZN', period='1d')[1] == self.cassette['history']['AMZN']['prices']
+        assert replay.history('MSFT', period='1d') == ([], [])
+        assert replay.exchange_rates() == self.cassette['exchange_rates']
@@ -0,0 +1,83 @@
+import dataclasses
+import threading
+
+import pytest
+
+from api.provider import ReplayProvider
+from benchmarks.cassette import synthetic_cassette
+from data.crypto import Crypto
+from data.status import Status
+from data.stock import Stock
+from data.ticker import PRICE_FIELDS
+from util.market_status import MarketStatus
+
+
+class TestQuote:
+    def setup_method(self):
+        self.cassette = synthetic_cassette(['AMZN', 'BTC-USD'], bars=120)
+        self.stock = Stock('AMZN', provider=ReplayProvider(self.cassette))
+
+    def teardown_method(self):
+        del self.stock
+
+    def test_quote(self):
+        quote = self.stock.quote
+        assert quote.generation == 1
+        assert quote.price == self.stock.price
+        assert quote.market_status is MarketStatus.OPEN
+        assert len(quote.chart) == len(self.stock.chart_prices)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            quote.price = 0.0
+        with pytest.raises(ValueError):
+            quote.chart[0] = 0.0
+
+    def test_update(self):
+        quote = self.stock.quote
+        assert self.stock.update(fetch_history=False) is Status.SUCCESS
+        assert self.stock.quote is quote  # Unchanged
+
+    def test_update_2(self):
+        # Data fetched after the update cycle's deadline is discarded
+        quote = self.stock.quote
+        assert self.stock.update({**self.stock.price_data, 'regularMarketPrice': 1.5}, deadline=0) is Status.TIMEOUT
+        assert self.stock.quote is quote
+
+    def test_apply_quote(self):
+        quote = self.stock.quote
+        assert self.stock.apply_quote({'regularMarketPrice': 1.5, 'marketState': 'CLOSED'}) is Status.SUCCESS
+        assert self.stock.quote.generation == 2
+        assert self.stock.quote.price == 1.5
+        assert self.stock.quote.market_status is MarketStatus.CLOSED
+        assert quote.price != 1.5 and quote.market_status is MarketStatus.OPEN
+
+    def test_apply_quote_2(self):
+        quote = self.stock.quote
+        assert self.stock.apply_quote({'regularMarketChange': None}) is Status.FAIL
+        assert self.stock.quote is quote
+
+    def test_apply_quote_3(self):
+        # Streamed quotes wait for updates in progress, so that only one quote is published at a time
+        generation = self.stock.quote.generation
+        with self.stock.lock:
+            thread = threading.Thread(target=self.stock.apply_quote, args=({'regularMarketPrice': 1.5},))
+            thread.start()
+            thread.join(0.1)
+            assert self.stock.quote.generation == generation
+        thread.join()
+        assert self.stock.quote.generation == generation + 1
+        assert self.stock.quote.price == 1.5
+
+    def test_crypto(self):
+        crypto = Crypto('BTC-USD', provider=ReplayProvider(self.cassette))
+        assert crypto.quote.name == crypto.name
+        assert crypto.quote.market_status is None
+
+    def test_slots(self):
+        assert not hasattr(self.stock.quote, '__dict__')
+
+    def test_parse(self):
+        price_data = {**self.cassette['quotes']['AMZN'], 'longName': 'Amazon.com, Inc.', 'bid': 130.2}
+        parsed = Stock.parse(price_data)
+        assert 'longName' not in parsed and 'bid' not in parsed and 'symbol' not in parsed
+        assert parsed['regularMarketPrice'] == price_data['regularMarketPrice']
+        assert self.stock.price_data.keys() <= set(PRICE_FIELDS)
@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+
+from api.scheduler import UpdateScheduler
+from data.crypto import Crypto
+from data.forex import Forex
+from data.stock import Stock
+from util.market_status import MarketStatus
+
+OPEN = datetime(2024, 1, 8, 15, 0, tzinfo=timezone.utc).timestamp()  # Monday, 10:00 AM New York
+CLOSED = datetime(2024, 1, 13, 15, 0, tzinfo=timezone.utc).timestamp()  # Saturday
+
+
+class TestUpdateScheduler:
+    def setup_method(self):
+        snapshot = {
+            'symbol': 'AMZN',
+            'currency': 'USD',
+            'currency_exchange_rate': 1,
+            'name': 'Amazon',
+            'price': 130.25,
+            'prev_close': 128.5,
+            'value_change': 1.75,
+            'pct_change': '1.36%',
+            'history': {'last_timestamp': None, 'bucket_size': 1, 'buckets': '', 'pending': ''},
+            'img': None,
+            'market_status': MarketStatus.OPEN.value,
+            'logo_url': None,
+            'exchange': 'NMS',
+            'img_url': None
+        }
+        self.stock = Stock.from_snapshot(snapshot)
+        self.crypto = Crypto.from_snapshot({**snapshot, 'symbol': 'BTC-USD'})
+        self.forex = Forex.from_snapshot({**snapshot, 'symbol': 'USDEUR=X'})
+        self.scheduler = UpdateScheduler(update_rate=600, closed_update_rate=3600)
+
+    def teardown_method(self):
+        del self.scheduler
+
+    def test_plan(self):
+        plan = self.scheduler.plan([self.stock, self.crypto, self.forex], OPEN)
+        assert plan == [(self.stock, True), (self.crypto, True), (self.forex, True)]
+
+    def test_plan_2(self):
+        for ticker in (self.stock, self.crypto, self.forex):
+            self.scheduler.schedule(ticker, CLOSED)
+        plan = self.scheduler.plan([self.stock, self.crypto, self.forex], CLOSED + 600)
+        assert plan == [(self.crypto, True)]
+        assert self.scheduler.avoided(CLOSED + 600) == {'quotes': 2, 'history': 2}
+
+    def test_plan_3(self):
+        self.scheduler.schedule(self.stock, OPEN + 6 * 3600 - 300)  # Last update before close
+        plan = self.scheduler.plan([self.stock], OPEN + 6 * 3600 + 300)
+        assert plan == [(self.stock, True)]
+
+    def test_plan_4(self):
+        self.scheduler.schedule(self.stock, CLOSED)
+        plan = self.scheduler.plan([self.stock], CLOSED + 2 * 86400)  # Monday, after opening
+        assert plan == [(self.stock, True)]
+
+    def test_schedule(self):
+        self.scheduler.schedule(self.stock, CLOSED)
+        assert self.scheduler.next_update['AMZN'] == datetime(2024, 1, 15, 14, 30, tzinfo=timezone.utc).timestamp()
+
+    def test_schedule_2(self):
+        self.stock.market_status = MarketStatus.CLOSED  # Market state lagging behind the opening bell
+        self.scheduler.schedule(self.stock, OPEN)
+        assert self.scheduler.next_update['AMZN'] == OPEN + 600
+        assert self.scheduler.plan([self.stock], OPEN + 600) == [(self.stock, False)]
+
+    def test_schedule_3(self):
+        self.stock.exchange = None
+        self.stock.market_status = MarketStatus.CLOSED
+        self.scheduler.schedule(self.stock, OPEN)
+        assert self.scheduler.next_update['AMZN'] == OPEN + 3600
+        assert self.scheduler.plan([self.stock], OPEN + 3600) == [(self.stock, False)]
+
+    def test_plan_5(self):
+        self.scheduler.schedule(self.crypto, OPEN)
+        horizons = {'BTC-USD': OPEN + 600}
+        assert self.scheduler.plan([self.crypto], OPEN + 300) == []
+        assert self.scheduler.plan([self.crypto], OPEN + 300, horizons) == [(self.crypto, True)]
+
+    def test_priorities(self):
+        self.scheduler.volatility = {'AMZN': 0.1, 'BTC-USD': 4.0, 'USDEUR=X': 1.0}
+        priorities = self.scheduler.priorities()
+        assert priorities['BTC-USD'] > priorities['USDEUR=X'] > priorities['AMZN']
+        assert abs(sum(priorities.values()) - 3) < 1e-9
+
+    def test_schedule_4(self):
+        self.scheduler.schedule(self.crypto, OPEN)
+        self.scheduler.schedule(self.forex, OPEN)
+        self.crypto.pct_change = '3.36%'  # Moved 2 points in 10 minutes
+        self.scheduler.schedule(self.forex, OPEN + 600)
+        self.scheduler.schedule(self.crypto, OPEN + 600)
+        assert self.scheduler.volatility['BTC-USD'] == 12.0
+        assert self.scheduler.next_update['BTC-USD'] < OPEN + 1200
+        assert self.scheduler.priorities()['USDEUR=X'] < 1
+
+    def test_fail(self):
+        self.scheduler.fail('BTC-USD', OPEN)
+        self.scheduler.fail('BTC-USD', OPEN)
+        assert self.scheduler.plan([self.crypto], OPEN) == [(self.crypto, True)]
+        self.scheduler.fail('BTC-USD', OPEN)
+        assert self.scheduler.is_quarantined('BTC-USD', OPEN + 59)
+        assert self.scheduler.plan([self.crypto], OPEN + 59) == []
+        self.scheduler.fail('BTC-USD', OPEN + 60)
+        assert self.scheduler.next_update['BTC-USD'] == OPEN + 180
+
+    def test_fail_2(self):
+        for _ in range(3):
+            self.scheduler.fail('BTC-USD', OPEN)
+        self.scheduler.schedule(self.crypto, OPEN + 60)
+        assert not self.scheduler.is_quarantined('BTC-USD', OPEN + 60)
+        assert 'BTC-USD' not in self.scheduler.failures
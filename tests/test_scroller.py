@@ -0,0 +1,43 @@
+from PIL import Image
+
+from renderer.scroller import ScrollingText
+from util.color import Color
+from util.glyph_atlas import GlyphAtlas
+from util.utils import load_font
+
+
+class TestScrollingText:
+    def setup_method(self):
+        strip = Image.new('RGB', (100, 10))
+        strip.paste(Color.RED[:3], (60, 0, 100, 10))
+        self.text = ScrollingText(strip, (1, 5), 60, speed=0.1, pause=1.0)
+
+    def teardown_method(self):
+        del self.text
+
+    def test_rasterize(self):
+        font = GlyphAtlas(load_font('7x13.ttf', 13))
+        text = ScrollingText.rasterize('SYNTHETIC HOLDINGS', font, Color.WHITE, Color.BLACK, (1, 0), 63)
+        assert text.strip.size == font.getsize('SYNTHETIC HOLDINGS')
+        assert text.travel == text.strip.width - 63
+
+    def test_rasterize_2(self):
+        font = GlyphAtlas(load_font('7x13.ttf', 13))
+        text = ScrollingText.rasterize('AMZN', font, Color.WHITE, Color.BLACK, (1, 0), 63)
+        assert text.strip.width == 63
+        assert text.offset_at(5.0) == 0
+
+    def test_offset_at(self):
+        assert self.text.offset_at(0.5) == 0  # Stopped at its start
+        assert self.text.offset_at(1.55) == 5
+        assert self.text.offset_at(5.5) == 40  # Stopped at its end
+        assert self.text.offset_at(6.55) == 35  # Scrolling back
+        assert self.text.offset_at(10.5) == 0  # Stopped at its start again
+
+    def test_draw(self):
+        canvas = Image.new('RGB', (64, 32))
+        assert self.text.draw(canvas, 0.0) == (1, 5, 61, 15)
+        assert self.text.draw(canvas, 0.5) is None  # Did not move
+        self.text.draw(canvas, 5.5)
+        assert canvas.getpixel((21, 5)) == Color.RED[:3]
+        assert canvas.getpixel((0, 5)) == (0, 0, 0)
@@ -0,0 +1,38 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from util.session import PooledSession
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPooledSession:
+    def setup_method(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/'
+        self.session = PooledSession()
+
+    def teardown_method(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connection_stats(self):
+        for _ in range(3):
+            assert self.session.get(self.url).text == 'ok'
+        assert self.session.connection_stats() == (1, 2)
+
+    def test_connection_stats_2(self):
+        assert self.session.connection_stats() == (0, 0)
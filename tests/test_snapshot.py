@@ -0,0 +1,64 @@
+from PIL import Image
+
+from data.crypto import Crypto
+from data.forex import Forex
+from data.stock import Stock
+from util.market_status import MarketStatus
+
+
+class TestSnapshot:
+    def setup_method(self):
+        self.snapshot = {
+            'symbol': 'AMZN',
+            'currency': 'USD',
+            'currency_exchange_rate': 1,
+            'name': 'Amazon',
+            'price': 130.25,
+            'prev_close': 128.5,
+            'value_change': 1.75,
+            'pct_change': '1.36%',
+            'history': {
+                'last_timestamp': 60,
+                'bucket_size': 1,
+                'buckets': 'AAACQwAAAkM=',  # [130.0, 130.0]
+                'pending': 'AAADQw=='  # [131.0]
+            },
+            'img': None,
+            'market_status': MarketStatus.CLOSED.value,
+            'logo_url': 'https://logo.clearbit.com/amazon.com',
+            'exchange': 'NMS'
+        }
+
+    def teardown_method(self):
+        del self.snapshot
+
+    def test_from_snapshot(self):
+        stock = Stock.from_snapshot(self.snapshot)
+        assert stock.price == 130.25
+        assert stock.market_status is MarketStatus.CLOSED
+
+    def test_from_snapshot_2(self):
+        stock = Stock.from_snapshot(self.snapshot)
+        assert stock.history.last_timestamp == 60
+        assert stock.chart_prices.values().tolist() == [130.0, 130.0, 131.0, 131.0]
+
+    def test_to_snapshot(self):
+        stock = Stock.from_snapshot(self.snapshot)
+        assert stock.to_snapshot() == self.snapshot
+
+    def test_to_snapshot_2(self):
+        stock = Stock.from_snapshot(self.snapshot)
+        stock.img = Image.new('RGB', (4, 2), (255, 0, 0))
+        restored = Stock.from_snapshot(stock.to_snapshot())
+        assert restored.img.size == (4, 2)
+        assert restored.img.getpixel((0, 0)) == (255, 0, 0)
+
+    def test_to_snapshot_3(self):
+        self.snapshot['img_url'] = 'https://coinicons-api.vercel.app/api/icon/btc'
+        crypto = Crypto.from_snapshot(self.snapshot)
+        assert crypto.to_snapshot()['img_url'] == self.snapshot['img_url']
+
+    def test_to_snapshot_4(self):
+        self.snapshot['img_url'] = ['usd', 'eur']
+        forex = Forex.from_snapshot(self.snapshot)
+        assert forex.to_snapshot()['img_url'] == ['usd', 'eur']
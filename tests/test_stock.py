@@ -1,5 +1,6 @@
 import logging
 
+from data.chart_series import ChartSeries
 from data.status import Status
 from data.stock import Stock
 
@@ -41,7 +42,7 @@ class TestStock:
 
     def test_get_chart_prices(self):
         chart_prices = self.stock.get_chart_prices()
-        assert isinstance(chart_prices, list)
+        assert isinstance(chart_prices, ChartSeries)
 
     def test_get_chart_prices_2(self):
         chart_prices = self.stock.get_chart_prices()
@@ -0,0 +1,95 @@
+import threading
+import time
+from unittest import mock
+
+from api import stream
+from api.stream import SSEQuoteStream, parse_events
+from benchmarks.stream_server import QuoteStreamServer
+from data.status import Status
+from data.stock import Stock
+from util.market_status import MarketStatus
+
+
+class TestSSEQuoteStream:
+    def setup_method(self):
+        self.patch = mock.patch.object(stream, 'STREAM_RECONNECT_DELAY', 0.05)
+        self.patch.start()
+        self.server = QuoteStreamServer(keepalive=0.05).start()
+        self.quotes = []
+        self.received = threading.Event()
+        self.stream = SSEQuoteStream(self.server.url, self.on_quote)
+        self.stream.start(['AMZN'])
+        self.wait_until(lambda: self.stream.connected)
+
+    def teardown_method(self):
+        self.stream.stop()
+        self.server.stop()
+        self.patch.stop()
+
+    def on_quote(self, symbol: str, quote: dict):
+        self.quotes.append((symbol, quote))
+        self.received.set()
+
+    @staticmethod
+    def wait_until(condition, timeout: float = 5):
+        deadline = time.time() + timeout
+        while not condition() and time.time() < deadline:
+            time.sleep(0.01)
+        assert condition()
+
+    def test_quotes(self):
+        self.server.publish('AMZN', {'regularMarketPrice': 130.5})
+        assert self.received.wait(5)
+        assert self.quotes == [('AMZN', {'regularMarketPrice': 130.5})]
+
+    def test_quotes_2(self):
+        self.server.publish('MSFT', {'regularMarketPrice': 330.0})  # Not subscribed to
+        self.server.publish('AMZN', {'regularMarketPrice': 130.5})
+        assert self.received.wait(5)
+        assert [symbol for symbol, _ in self.quotes] == ['AMZN']
+
+    def test_reconnect(self):
+        self.server.disconnect_all()
+        self.wait_until(lambda: not self.server.subscribed())
+        self.wait_until(lambda: self.server.subscribed() == {'AMZN'})
+        self.server.publish('AMZN', {'regularMarketPrice': 130.5})
+        assert self.received.wait(5)
+
+    def test_is_live(self):
+        assert not self.stream.is_live('AMZN', 60)
+        self.server.publish('AMZN', {'regularMarketPrice': 130.5})
+        assert self.received.wait(5)
+        assert self.stream.is_live('AMZN', 60)
+        self.stream.stop()
+        self.wait_until(lambda: not self.stream.connected)
+        assert not self.stream.is_live('AMZN', 60)
+
+    def test_parse_events(self):
+        lines = [': keep-alive', '', 'event: quote', 'data: {"symbol": "AMZN",', 'data: "price": 1}', '', 'data:x', '']
+        assert list(parse_events(lines)) == [('quote', '{"symbol": "AMZN",\n"price": 1}'), ('message', 'x')]
+
+    def test_apply_quote(self):
+        stock = Stock.from_snapshot({
+            'symbol': 'AMZN',
+            'currency': 'USD',
+            'currency_exchange_rate': 1,
+            'name': 'Amazon',
+            'price': 130.25,
+            'prev_close': 128.5,
+            'value_change': 1.75,
+            'pct_change': '1.36%',
+            'history': {'last_timestamp': None, 'bucket_size': 1, 'buckets': '', 'pending': ''},
+            'img': None,
+            'market_status': MarketStatus.OPEN.value,
+            'logo_url': None,
+            'exchange': 'NMS'
+        })
+        assert stock.apply_quote({'regularMarketPrice': 131.0}) is Status.FAIL  # Change unknown
+        assert stock.price == 130.25
+        quote = {'regularMarketPrice': 131.0, 'regularMarketChange': 2.5, 'regularMarketChangePercent': 0.0195,
+                 'marketState': 'POST'}
+        assert stock.apply_quote(quote) is Status.SUCCESS
+        assert (stock.price, stock.value_change, stock.pct_change) == (131.0, 2.5, '1.95%')
+        assert stock.market_status is MarketStatus.CLOSED
+        assert stock.apply_quote({'regularMarketPrice': 131.5}) is Status.SUCCESS
+        assert (stock.price, stock.value_change) == (131.5, 2.5)
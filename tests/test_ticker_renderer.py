@@ -1,3 +1,5 @@
+import numpy as np
+
 from renderer.ticker import TickerRenderer
 from util.color import Color
 
@@ -22,3 +24,15 @@ class TestTickerRenderer:
     def test_set_change_color_3(self):
         color = TickerRenderer.set_change_color(0.01)
         assert color == Color.GREEN
+
+    def test_rasterize_chart(self):
+        mask = TickerRenderer.rasterize_chart(np.full(10, 5.0), 4, 5)
+        assert mask.shape == (5, 4)
+        assert (mask[2:] == 255).all() and (mask[:2] == 0).all()
+
+    def test_rasterize_chart_2(self):
+        prices = np.array([1.0, 2.0, 1.0, 1.0, 3.0, 1.0, 1.0, 1.0])
+        mask = TickerRenderer.rasterize_chart(prices, 4, 3)
+        assert (mask[:, 2] == 255).all()
+        assert (mask[0, [0, 1, 3]] == 0).all()
+        assert (mask[2] == 255).all()
@@ -0,0 +1,67 @@
+from unittest import mock
+
+import pytest
+from requests import ConnectionError
+
+from util.circuit_state import CircuitState
+from util.session import guarded
+from util.upstream import TokenBucket, CircuitBreaker, Upstream, CircuitOpenError
+
+
+class TestUpstream:
+    def setup_method(self):
+        self.upstream = Upstream('query1.finance.yahoo.com', TokenBucket(rate=1000, capacity=2),
+                                 CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+    def teardown_method(self):
+        del self.upstream
+
+    def test_acquire(self):
+        assert self.upstream.limiter.acquire() == 0.0
+        assert self.upstream.limiter.acquire() == 0.0
+        assert self.upstream.limiter.acquire() > 0.0
+        assert self.upstream.limiter.throttled == 1
+
+    def test_acquire_2(self):
+        self.upstream.release(failed=True)
+        self.upstream.release(failed=True)
+        assert self.upstream.breaker.state is CircuitState.OPEN
+        with pytest.raises(ConnectionError):
+            self.upstream.acquire()
+        assert self.upstream.metrics()['rejected'] == 1
+
+    def test_release(self):
+        self.upstream.release(failed=True)
+        self.upstream.release(failed=False)
+        self.upstream.release(failed=True)
+        assert self.upstream.breaker.state is CircuitState.CLOSED
+
+    def test_half_open(self):
+        self.upstream.release(failed=True)
+        self.upstream.release(failed=True)
+        self.upstream.breaker.reset_timeout = 0
+        self.upstream.acquire()  # Probe
+        assert self.upstream.breaker.state is CircuitState.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            self.upstream.acquire()
+        self.upstream.release(failed=False)
+        assert self.upstream.breaker.state is CircuitState.CLOSED
+
+    def test_half_open_2(self):
+        self.upstream.release(failed=True)
+        self.upstream.release(failed=True)
+        self.upstream.breaker.reset_timeout = 0
+        self.upstream.acquire()  # Probe
+        self.upstream.release(failed=True)
+        self.upstream.breaker.reset_timeout = 60
+        assert self.upstream.breaker.state is CircuitState.OPEN
+        assert self.upstream.metrics()['trips'] == 2
+
+    def test_guarded(self):
+        send = mock.Mock(return_value=mock.Mock(status_code=503))
+        with mock.patch('util.session.upstream', return_value=self.upstream):
+            guarded(send, 'GET', 'https://query1.finance.yahoo.com/')
+            guarded(send, 'GET', 'https://query1.finance.yahoo.com/')
+            with pytest.raises(CircuitOpenError):
+                guarded(send, 'GET', 'https://query1.finance.yahoo.com/')
+        assert send.call_count == 2
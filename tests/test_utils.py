@@ -1,4 +1,5 @@
 import logging
+from unittest import mock
 
 from PIL import Image, ImageFont
 
@@ -39,6 +40,14 @@ class TestUtils:
         dict_ = utils.read_json(tmp_file)
         assert dict_ == new_data
 
+    def test_read_watchlist(self, tmpdir):
+        tmp_file = tmpdir.join('sp500.csv')
+        tmp_file.write('Symbol,Security\nMMM,3M\n# Comment\n\nBRK.B,Berkshire Hathaway\naapl,Apple Inc.\nMMM,3M\n')
+        assert utils.read_watchlist(str(tmp_file)) == ['MMM', 'BRK-B', 'AAPL']
+
+    def test_read_watchlist_2(self):
+        assert utils.read_watchlist('invalid.txt') == []
+
     def test_off_screen(self):
         long_text = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit.'
         result = utils.off_screen(64, self.font.getsize(long_text)[0])
@@ -138,6 +147,15 @@ class TestUtils:
             utils.load_image_url(None, (10, 10))
         assert 'No url provided' in caplog.text
 
+    def test_load_image_url_4(self):
+        # Stale cached images are revalidated by the image prefetcher's threads
+        image, metadata, images = Image.new('RGB', (10, 10)), {'fetched': 0}, mock.Mock()
+        with mock.patch.object(utils.IMAGE_CACHE, 'get', return_value=(image, metadata)), \
+                mock.patch.object(utils.IMAGE_CACHE, 'is_stale', return_value=True):
+            assert utils.load_image_url('https://example.com/logo.png', (10, 10), images) is image
+        images.revalidate.assert_called_once_with(('https://example.com/logo.png', (10, 10)), utils.revalidate_image,
+                                                  'https://example.com/logo.png', (10, 10), metadata)
+
     def test_convert_currency(self):
         result = utils.convert_currency(1, 15.0)
         assert isinstance(result, float)
@@ -166,3 +184,34 @@ class TestUtils:
         with caplog.at_level(logging.WARNING):
             utils.build_forex_img(urls, (40, 20))
         assert 'Unable to build forex image' in caplog.text
+
+    def test_chunks(self):
+        result = list(utils.chunks(['A', 'B', 'C', 'D', 'E'], 2))
+        assert result == [['A', 'B'], ['C', 'D'], ['E']]
+
+    def test_chunks_2(self):
+        result = list(utils.chunks([], 2))
+        assert result == []
+
+    def test_encode_array(self):
+        encoded = utils.encode_array([1.5, 2.25], 'f')
+        assert utils.decode_array(encoded, 'f') == [1.5, 2.25]
+
+    def test_encode_image(self):
+        image = Image.new('RGB', (3, 3), (0, 255, 0))
+        decoded = utils.decode_image(utils.encode_image(image))
+        assert decoded.getpixel((1, 1)) == (0, 255, 0)
+
+    def test_encode_image_2(self):
+        assert utils.encode_image(None) is None
+
+    def test_read_compressed_json(self, tmpdir):
+        tmp_file = str(tmpdir.join('temp.json.gz'))
+        content = {"key_list": [1, 2], "key_string": "String"}
+        utils.write_compressed_json(tmp_file, content)
+        assert utils.read_compressed_json(tmp_file) == content
+
+    def test_read_compressed_json_2(self, tmpdir):
+        tmp_file = tmpdir.join('temp.json.gz')
+        tmp_file.write('not compressed')
+        assert utils.read_compressed_json(str(tmp_file)) is None
@@ -0,0 +1,41 @@
+import copy
+from types import SimpleNamespace
+from unittest import mock
+
+from api.data import fetch_quotes
+from api.provider import YahooProvider
+
+RESPONSES = {
+    ('AMZN', 'MSFT'): {'AMZN': {'regularMarketPrice': 150.0, 'regularMarketChangePercent': 1.5},
+                       'MSFT': {'regularMarketPrice': 400.0, 'regularMarketChangePercent': None}},
+    ('TSLA', 'GOOG'): {'GOOG': {'regularMarketPrice': 140.0, 'regularMarketChangePercent': -2.0}},  # TSLA missing
+    ('NFLX',): 'No data found'  # Error message
+}
+
+
+def stub_ticker(symbols: list) -> SimpleNamespace:
+    return SimpleNamespace(quotes=copy.deepcopy(RESPONSES[tuple(symbols)]))
+
+
+class TestYahooProvider:
+    def setup_method(self):
+        self.provider = YahooProvider()
+
+    def teardown_method(self):
+        del self.provider
+
+    def test_quotes(self):
+        with mock.patch.object(self.provider, 'ticker', side_effect=stub_ticker) as ticker:
+            quotes = fetch_quotes(self.provider, ['AMZN', 'MSFT', 'TSLA', 'GOOG', 'NFLX'], 2)
+        assert [call.args[0] for call in ticker.call_args_list] == [['AMZN', 'MSFT'], ['TSLA', 'GOOG'], ['NFLX']]
+        assert list(quotes) == ['AMZN', 'MSFT', 'GOOG']
+
+    def test_quotes_2(self):
+        # Percent changes are fractions, as in the price module
+        with mock.patch.object(self.provider, 'ticker', side_effect=stub_ticker):
+            quotes = self.provider.quotes(['AMZN', 'MSFT'])
+        assert quotes['AMZN']['regularMarketChangePercent'] == 0.015
+        assert quotes['MSFT']['regularMarketChangePercent'] == 0.0
+
+    def test_quotes_3(self):
+        assert self.provider.quotes([]) == {}
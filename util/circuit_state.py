@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class CircuitState(Enum):
+    CLOSED = 'Closed'
+    OPEN = 'Open'
+    HALF_OPEN = 'Half-open'
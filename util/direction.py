@@ -1,6 +0,0 @@
-from enum import Enum, auto
-
-
-class Direction(Enum):
-    LEFT = auto()
-    RIGHT = auto()
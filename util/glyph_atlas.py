@@ -0,0 +1,108 @@
+import string
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw
+from PIL.ImageFont import FreeTypeFont
+
+from constants import TEXT_MASK_CACHE_SIZE
+from data.currency import CURRENCIES
+
+ATLAS_CHARACTERS = string.digits + string.ascii_letters + string.punctuation + ' ' + ''.join(CURRENCIES.values())
+
+
+class GlyphAtlas:
+    """
+    Text engine for pixel fonts, whose glyphs are rasterized once into a 1-bit atlas.
+    Strings are measured by adding up their glyphs' advances, and drawn by pasting a mask assembled from the atlas'
+    columns, rather than by having FreeType lay out and rasterize them again.
+    Pixel fonts render each glyph within its advance, and without anti-aliasing at their native size, so that text
+    drawn from the atlas is identical to text drawn by FreeType. Glyphs missing from the atlas are added as they are
+    first drawn. Masks of the strings drawn last are kept, as the same strings are drawn on every rotation.
+
+    Arguments:
+        font (PIL.FreeTypeFont):                Pixel font, at its native size
+        characters (str):                       Characters to rasterize up front
+
+    Attributes:
+        height (int):                           Line height (in pixels). i.e. Ascent and descent.
+        atlas (np.ndarray):                     Boolean atlas of shape (height, total advance), glyphs side by side
+        glyphs (Dict[str, Tuple[int, int]]):    First atlas column, and advance, of each glyph, keyed by character
+        masks (OrderedDict[str, PIL.Image]):    Masks of the last TEXT_MASK_CACHE_SIZE strings drawn, keyed by string
+    """
+
+    def __init__(self, font: FreeTypeFont, characters: str = ATLAS_CHARACTERS):
+        self.font: FreeTypeFont = font
+        self.height: int = sum(font.getmetrics())
+        self.atlas: np.ndarray = np.zeros((self.height, 0), dtype=bool)
+        self.glyphs: Dict[str, Tuple[int, int]] = {}
+        self.masks: OrderedDict = OrderedDict()
+        self.add(characters)
+
+    def add(self, characters: str):
+        """
+        Rasterize glyphs into the atlas
+        :param characters: (str) Characters whose glyphs to add. Those already in the atlas are skipped.
+        """
+        cells = []
+        column = self.atlas.shape[1]
+        for character in dict.fromkeys(characters):
+            if character in self.glyphs:
+                continue
+            advance = self.font.getsize(character)[0]
+            cell = Image.new('L', (advance, self.height))
+            ImageDraw.Draw(cell).text((0, 0), character, 255, self.font)
+            cells.append(np.asarray(cell) >= 128)
+            self.glyphs[character] = (column, advance)
+            column += advance
+        if cells:
+            self.atlas = np.hstack([self.atlas] + cells)
+
+    def getsize(self, text: str) -> Tuple[int, int]:
+        """
+        Size of a string, as FreeTypeFont.getsize
+        :param text: (str) Text
+        :return: size: (Tuple[int, int]) Width and height (in pixels)
+        """
+        if not text:
+            return 0, 0
+        try:
+            return sum(self.glyphs[character][1] for character in text), self.height
+        except KeyError:
+            self.add(text)
+            return self.getsize(text)
+
+    def mask(self, text: str) -> np.ndarray:
+        """
+        Rasterize a string from the atlas
+        :param text: (str) Text
+        :return: mask: (np.ndarray) Boolean mask of shape (height, width). True where glyphs are inked.
+        """
+        if any(character not in self.glyphs for character in text):
+            self.add(text)
+        if not text:
+            return np.zeros((self.height, 0), dtype=bool)
+        columns = np.concatenate([np.arange(column, column + advance)
+                                  for column, advance in (self.glyphs[character] for character in text)])
+        return self.atlas[:, columns]
+
+    def draw(self, canvas: Image.Image, position: Tuple[int, int], text: str, color: tuple):
+        """
+        Draw a string on canvas, as ImageDraw.text would
+        :param canvas: (PIL.Image) Canvas
+        :param position: (Tuple[int, int]) Top-left corner of the text
+        :param text: (str) Text
+        :param color: (tuple) Text color
+        """
+        if not text:
+            return
+        mask = self.masks.get(text)
+        if mask is None:
+            mask = self.masks[text] = Image.fromarray(self.mask(text))
+            if len(self.masks) > TEXT_MASK_CACHE_SIZE:
+                self.masks.popitem(last=False)
+        else:
+            self.masks.move_to_end(text)
+        x, y = position
+        canvas.paste(color, (x, y, x + mask.width, y + self.height), mask)
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Tuple, Optional
+
+from PIL import Image, UnidentifiedImageError
+
+from constants import IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_SIZE, IMAGE_REVALIDATE_AGE
+
+
+class ImageCache:
+    """
+    Disk cache of images already resized for display, keyed by URL and size.
+    Each entry is stored as an RGB PNG named after a hash of its key, along with its metadata: the validators
+    (ETag, Last-Modified) needed to revalidate it, and the time it was last validated.
+    Entries are evicted least recently used first once the cache exceeds its maximum size.
+
+    Arguments:
+        directory (str):                Cache directory
+        max_size (int):                 Maximum total size of cached images (in bytes)
+        revalidate_age (float):         Age after which an entry should be revalidated (in seconds)
+    """
+
+    def __init__(self,
+                 directory: str = IMAGE_CACHE_DIR,
+                 max_size: int = IMAGE_CACHE_MAX_SIZE,
+                 revalidate_age: float = IMAGE_REVALIDATE_AGE):
+        self.directory: str = directory
+        self.max_size: int = max_size
+        self.revalidate_age: float = revalidate_age
+        self.lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, size: Tuple[int, int]) -> str:
+        """
+        Cache key of an image
+        :param url: Image URL
+        :param size: Image size
+        :return: key: (str) Hash of the URL and size
+        """
+        return hashlib.sha256(f'{url}|{size[0]}x{size[1]}'.encode()).hexdigest()
+
+    def path(self, key: str, extension: str) -> str:
+        return os.path.join(self.directory, f'{key}.{extension}')
+
+    def get(self, url: str, size: Tuple[int, int]) -> Tuple[Optional[Image.Image], dict]:
+        """
+        Get a cached image, and mark it as recently used
+        :param url: Image URL
+        :param size: Image size
+        :return: image, metadata: Cached image, or None if not cached, and its metadata
+        """
+        key = self.key(url, size)
+        with self.lock:
+            try:
+                with open(self.path(key, 'json'), 'r') as metadata_file:
+                    metadata = json.load(metadata_file)
+                with Image.open(self.path(key, 'png')) as image:
+                    image = image.convert('RGB')
+                os.utime(self.path(key, 'png'))  # Last used
+                return image, metadata
+            except (OSError, ValueError, UnidentifiedImageError):
+                return None, {}
+
+    def put(self, url: str, size: Tuple[int, int], image: Image.Image, etag: str = None, last_modified: str = None):
+        """
+        Cache an image, then evict least recently used images if the cache is over its maximum size
+        :param url: Image URL
+        :param size: Image size
+        :param image: Resized image
+        :param etag: ETag response header
+        :param last_modified: Last-Modified response header
+        """
+        key = self.key(url, size)
+        metadata = {'url': url, 'size': list(size), 'etag': etag, 'last_modified': last_modified,
+                    'validated': time.time()}
+        with self.lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                image.save(f'{self.path(key, "png")}.tmp', format='PNG')
+                os.replace(f'{self.path(key, "png")}.tmp', self.path(key, 'png'))
+                self.write_metadata(key, metadata)
+                self.evict()
+            except OSError as e:
+                logging.warning(f'Unable to cache image {url}: {e}')
+
+    def validated(self, url: str, size: Tuple[int, int], metadata: dict):
+        """
+        Record that a cached image is still up-to-date
+        :param url: Image URL
+        :param size: Image size
+        :param metadata: Image's metadata
+        """
+        with self.lock:
+            try:
+                self.write_metadata(self.key(url, size), {**metadata, 'validated': time.time()})
+            except OSError as e:
+                logging.warning(f'Unable to update cached image {url}: {e}')
+
+    def is_stale(self, metadata: dict) -> bool:
+        """
+        Determine if a cached image should be revalidated
+        :param metadata: Image's metadata
+        :return: is_stale: (bool)
+        """
+        return time.time() - metadata.get('validated', 0) >= self.revalidate_age
+
+    def write_metadata(self, key: str, metadata: dict):
+        with open(f'{self.path(key, "json")}.tmp', 'w') as metadata_file:
+            json.dump(metadata, metadata_file)
+        os.replace(f'{self.path(key, "json")}.tmp', self.path(key, 'json'))
+
+    def evict(self):
+        """Remove least recently used images until the cache fits its maximum size"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.png'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.name[:-len('.png')]))
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_size:
+                break
+            for extension in ('png', 'json'):
+                try:
+                    os.remove(self.path(key, extension))
+                except FileNotFoundError:
+                    pass
+            total -= size
+            logging.debug(f'Evicted cached image {key}')
+
+
+IMAGE_CACHE = ImageCache()
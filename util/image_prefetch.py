@@ -0,0 +1,91 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError
+from typing import Callable, Dict, Hashable
+
+from PIL import Image
+
+from constants import IMAGE_PREFETCH_CONCURRENCY
+
+
+class ImagePrefetcher:
+    """
+    Load images concurrently in the background, with a bounded pool of threads.
+    Images are keyed, so that an image requested more than once (i.e. Flag shared by forex pairs) is only loaded once.
+
+    Arguments:
+        max_workers (int):                      Maximum number of images loaded at once
+
+    Attributes:
+        futures (Dict[Hashable, Future]):       Images being loaded, or loaded, keyed by image
+        revalidations (Dict[Hashable, Future]): Cached images being revalidated, or revalidated, keyed by image
+    """
+
+    def __init__(self, max_workers: int = IMAGE_PREFETCH_CONCURRENCY):
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='images')
+        self.futures: Dict[Hashable, Future] = {}
+        self.revalidations: Dict[Hashable, Future] = {}
+        self.lock: threading.Lock = threading.Lock()
+
+    def submit(self, key: Hashable, loader: Callable[..., Image.Image], *args):
+        """
+        Start loading an image, unless it is already being loaded
+        :param key: Image key
+        :param loader: Blocking callable returning the image
+        :param args: Loader's arguments
+        """
+        with self.lock:
+            if key not in self.futures:
+                self.futures[key] = self.executor.submit(loader, *args)
+
+    def revalidate(self, key: Hashable, revalidator: Callable[..., None], *args):
+        """
+        Start revalidating a cached image, on the same threads as images being loaded, unless it is already being
+        revalidated
+        :param key: Image key
+        :param revalidator: Blocking callable revalidating the image
+        :param args: Revalidator's arguments
+        """
+        with self.lock:
+            if key not in self.revalidations or self.revalidations[key].done():
+                self.revalidations[key] = self.executor.submit(revalidator, *args)
+
+    def result(self, key: Hashable, timeout: float = 0) -> Image.Image:
+        """
+        Get a loaded image
+        :param key: Image key
+        :param timeout: Time to wait for the image to be loaded (in seconds). None to wait until it is.
+        :return: image: (PIL.Image) Loaded image. None if it is not loaded yet, or could not be loaded.
+        """
+        future = self.futures.get(key)
+        if future is None:
+            return None
+        if timeout is not None and timeout <= 0 and not future.done():
+            return None
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            return None
+        except Exception as e:
+            logging.error(f'Unable to load image {key}: {e}')
+            return None
+
+    def done(self, key: Hashable) -> bool:
+        """
+        Determine if an image is done loading, whether it succeeded or not
+        :param key: Image key
+        :return: done: (bool)
+        """
+        future = self.futures.get(key)
+        return future is not None and future.done()
+
+    def pending(self) -> int:
+        """
+        Count images still being loaded
+        :return: pending: (int) Number of images
+        """
+        return sum(1 for future in self.futures.values() if not future.done())
+
+    def shutdown(self):
+        """Stop loading images not started yet"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
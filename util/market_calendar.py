@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+
+@dataclass(frozen=True)
+class TradingHours:
+    """
+    Weekly trading hours of a market, in the market's local time. Holidays are not included.
+    A session closing at or before the time it opens ends on the following day.
+
+    Arguments:
+        timezone (str):                 Market's timezone (IANA name)
+        open (datetime.time):           Session opening time
+        close (datetime.time):          Session closing time
+        weekdays (tuple):               Days on which a session opens. 0 is Monday.
+    """
+    timezone: str
+    open: time
+    close: time
+    weekdays: Tuple[int, ...] = (0, 1, 2, 3, 4)
+
+    @property
+    def overnight(self) -> bool:
+        return self.close <= self.open
+
+    def session_start(self, now: datetime) -> Optional[datetime]:
+        """
+        Opening time of the session in progress
+        :param now: (datetime) Timezone-aware current time
+        :return: session_start: (datetime) Session's opening time. None if the market is closed.
+        """
+        local = now.astimezone(ZoneInfo(self.timezone))
+        today = local.replace(hour=self.open.hour, minute=self.open.minute, second=0, microsecond=0)
+        if local.weekday() in self.weekdays and local.time() >= self.open and \
+                (self.overnight or local.time() < self.close):
+            return today
+        yesterday = today - timedelta(days=1)
+        if self.overnight and yesterday.weekday() in self.weekdays and local.time() < self.close:
+            return yesterday
+        return None
+
+    def is_open(self, now: datetime) -> bool:
+        """
+        Determine if the market is open
+        :param now: (datetime) Timezone-aware current time
+        :return: is_open: (bool)
+        """
+        return self.session_start(now) is not None
+
+    def next_open(self, now: datetime) -> datetime:
+        """
+        Opening time of the next session
+        :param now: (datetime) Timezone-aware current time
+        :return: next_open: (datetime) Next session's opening time
+        """
+        tz = ZoneInfo(self.timezone)
+        local = now.astimezone(tz)
+        for days in range(8):
+            day = local.date() + timedelta(days=days)
+            opening = datetime.combine(day, self.open, tzinfo=tz)
+            if opening > now and day.weekday() in self.weekdays:
+                return opening
+        raise ValueError('Market never opens')
+
+
+# Regular trading hours, keyed by Yahoo Finance exchange code
+US_HOURS = TradingHours('America/New_York', time(9, 30), time(16, 0))
+EXCHANGE_HOURS = {
+    'NMS': US_HOURS,  # NASDAQ Global Select
+    'NGM': US_HOURS,  # NASDAQ Global Market
+    'NCM': US_HOURS,  # NASDAQ Capital Market
+    'NAS': US_HOURS,  # NASDAQ
+    'NYQ': US_HOURS,  # NYSE
+    'NYS': US_HOURS,  # NYSE
+    'ASE': US_HOURS,  # NYSE American
+    'PCX': US_HOURS,  # NYSE Arca
+    'BTS': US_HOURS,  # Cboe BZX
+    'SNP': US_HOURS,  # S&P indices
+    'DJI': US_HOURS,  # Dow Jones indices
+    'NIM': US_HOURS,  # NASDAQ indices
+    'TOR': TradingHours('America/Toronto', time(9, 30), time(16, 0)),  # Toronto
+    'LSE': TradingHours('Europe/London', time(8, 0), time(16, 30)),  # London
+    'GER': TradingHours('Europe/Berlin', time(9, 0), time(17, 30)),  # XETRA
+    'PAR': TradingHours('Europe/Paris', time(9, 0), time(17, 30)),  # Euronext Paris
+    'AMS': TradingHours('Europe/Amsterdam', time(9, 0), time(17, 30)),  # Euronext Amsterdam
+    'JPX': TradingHours('Asia/Tokyo', time(9, 0), time(15, 0)),  # Tokyo
+    'HKG': TradingHours('Asia/Hong_Kong', time(9, 30), time(16, 0)),  # Hong Kong
+    'ASX': TradingHours('Australia/Sydney', time(10, 0), time(16, 0)),  # Australia
+}
+# Forex trades around the clock, from Sunday 5 PM to Friday 5 PM (New York time)
+FOREX_HOURS = TradingHours('America/New_York', time(17, 0), time(17, 0), (6, 0, 1, 2, 3))
@@ -0,0 +1,144 @@
+import random
+import threading
+from typing import Set, Tuple
+
+import requests
+from curl_cffi import requests as curl_requests
+from requests.adapters import HTTPAdapter
+# Internals of yahooquery, which is pinned for them: browser headers to impersonate, and Yahoo Finance session setup
+from yahooquery.constants import BROWSERS
+from yahooquery.session_management import setup_session
+
+from constants import HTTP_POOL_HOSTS, HTTP_POOL_SIZE, HTTP_TIMEOUT
+from util.upstream import upstream, is_failure
+
+# Errors reaching a host, from either session. i.e. Timeouts, connection or DNS errors, and open circuits.
+NETWORK_ERRORS = (requests.Timeout, requests.ConnectionError, curl_requests.exceptions.Timeout,
+                  curl_requests.exceptions.ConnectionError)
+
+
+class PooledSession(requests.Session):
+    """
+    HTTP session with keep-alive connections pooled per host, for plain HTTP requests (i.e. Images, exchange rates).
+    At most HTTP_POOL_HOSTS hosts are kept, each with at most HTTP_POOL_SIZE connections.
+    Requests are rate limited and guarded by a circuit breaker, per host.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.adapter: HTTPAdapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE)
+        self.mount('https://', self.adapter)
+        self.mount('http://', self.adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', HTTP_TIMEOUT)
+        return guarded(super().request, method, url, **kwargs)
+
+    def connection_stats(self) -> Tuple[int, int]:
+        """
+        Connections opened, and requests sent on already open connections
+        :return: opened, reused: (int, int)
+        """
+        opened, sent = 0, 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                sent += pool.num_requests
+        return opened, max(0, sent - opened)
+
+
+class YahooSession(curl_requests.Session):
+    """
+    Session shared by yahooquery tickers, so that the cookies and connections set up for Yahoo Finance are reused.
+    Impersonates a browser, as yahooquery does. Connections are kept alive per fetching thread.
+    Requests are rate limited and guarded by a circuit breaker, per host.
+    """
+
+    def __init__(self):
+        impersonate = random.choice(list(BROWSERS.keys()))
+        super().__init__(headers=BROWSERS[impersonate], impersonate=impersonate, timeout=HTTP_TIMEOUT)
+        self.connections: Set[tuple] = set()
+        self.requests_sent: int = 0
+        self.stats_lock: threading.Lock = threading.Lock()
+
+    def request(self, method, url, *args, **kwargs):
+        response = guarded(super().request, method, url, *args, **kwargs)
+        with self.stats_lock:  # Each connection has its own local port
+            self.connections.add((response.local_ip, response.local_port, response.primary_ip, response.primary_port))
+            self.requests_sent += 1
+        return response
+
+    def connection_stats(self) -> Tuple[int, int]:
+        """
+        Connections opened, and requests sent on already open connections
+        :return: opened, reused: (int, int)
+        """
+        with self.stats_lock:
+            return len(self.connections), self.requests_sent - len(self.connections)
+
+
+def guarded(send, method: str, url: str, *args, **kwargs):
+    """
+    Send a request once its host's rate limiter allows it, and record its outcome in the host's circuit breaker
+    :param send: Request sending function
+    :param method: HTTP method
+    :param url: Request URL
+    :return: response: Response
+    :exception CircuitOpenError: If the host's circuit is open
+    """
+    host = upstream(url)
+    host.acquire()
+    try:
+        response = send(method, url, *args, **kwargs)
+    except Exception:
+        host.release(failed=True)
+        raise
+    host.release(failed=is_failure(response.status_code))
+    return response
+
+
+_lock = threading.Lock()
+_http_session: PooledSession = None
+_yahoo_session: YahooSession = None
+
+
+def http_session() -> PooledSession:
+    """
+    Shared session for plain HTTP requests
+    :return: session: (PooledSession) Shared session
+    """
+    global _http_session
+    with _lock:
+        if _http_session is None:
+            _http_session = PooledSession()
+        return _http_session
+
+
+def yahoo_session() -> YahooSession:
+    """
+    Shared session for yahooquery tickers. Set up (i.e. Cookies, consent) on first use.
+    :return: session: (YahooSession) Shared session
+    """
+    global _yahoo_session
+    with _lock:
+        if _yahoo_session is None:
+            session = YahooSession()
+            setup_session(session)
+            _yahoo_session = session
+        return _yahoo_session
+
+
+def connection_summary() -> str:
+    """
+    One-line summary of connections opened and reused by the shared sessions, for logging
+    :return: summary: (str) Connections summary
+    """
+    opened, reused = 0, 0
+    for session in (_http_session, _yahoo_session):
+        if session is not None:
+            session_opened, session_reused = session.connection_stats()
+            opened += session_opened
+            reused += session_reused
+    return f'HTTP connections: {opened} opened, {reused} requests on reused connections'
@@ -0,0 +1,234 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict
+from urllib.parse import urlparse
+
+from requests import ConnectionError
+
+from constants import UPSTREAM_RATE, UPSTREAM_BURST, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+from util.circuit_state import CircuitState
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of sending a request to an upstream host whose circuit is open"""
+
+
+@dataclass
+class TokenBucket:
+    """
+    Token bucket rate limiter, shared by every thread sending requests to the same host.
+    Tokens are reserved in the order they are requested: once the bucket is empty, callers wait their turn, so that
+    requests are spread at the bucket's rate instead of being sent at once.
+
+    Arguments:
+        rate (float):                           Tokens added per second
+        capacity (float):                       Maximum number of tokens. i.e. Requests allowed in a burst
+
+    Attributes:
+        tokens (float):                         Tokens available. Negative once reserved ahead of being added.
+        updated (float):                        Time tokens were last added (monotonic)
+        throttled (int):                        Number of acquisitions which had to wait for a token
+        waited (float):                         Total time spent waiting for tokens (in seconds)
+    """
+    rate: float = UPSTREAM_RATE
+    capacity: float = UPSTREAM_BURST
+    tokens: float = field(init=False)
+    updated: float = field(init=False)
+    throttled: int = 0
+    waited: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def acquire(self) -> float:
+        """
+        Take a token, waiting for one to be added if the bucket is empty
+        :return: wait: (float) Time waited (in seconds)
+        """
+        with self.lock:
+            self.refill(time.monotonic())
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            if wait:
+                self.throttled += 1
+                self.waited += wait
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def refill(self, now: float):
+        """
+        Add the tokens accumulated since they were last added
+        :param now: (float) Current time (monotonic)
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Circuit breaker, which stops requests to a host once they keep failing, rather than having every thread wait out
+    its own timeout.
+    The circuit opens after failure_threshold consecutive failures, and requests are rejected at once while it is open.
+    After reset_timeout, it is half-open: a single request is let through to probe the host. The circuit closes if the
+    probe succeeds, and opens again otherwise.
+
+    Arguments:
+        failure_threshold (int):                Consecutive failures after which the circuit opens
+        reset_timeout (float):                  Time the circuit stays open before probing the host (in seconds)
+
+    Attributes:
+        state (CircuitState):                   Circuit state
+        failures (int):                         Consecutive failures
+        opened (float):                         Time the circuit last opened (monotonic)
+        probing (bool):                         Whether a probe request is in progress
+        rejected (int):                         Number of requests rejected while the circuit was open
+        trips (int):                            Number of times the circuit opened
+    """
+    failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD
+    reset_timeout: float = CIRCUIT_RESET_TIMEOUT
+    state: CircuitState = CircuitState.CLOSED
+    failures: int = 0
+    opened: float = None
+    probing: bool = False
+    rejected: int = 0
+    trips: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def allow(self) -> bool:
+        """
+        Determine if a request may be sent. Once reset_timeout has passed, a single probe request is allowed.
+        :return: allow: (bool)
+        """
+        with self.lock:
+            if self.state is CircuitState.OPEN and time.monotonic() - self.opened >= self.reset_timeout:
+                self.state = CircuitState.HALF_OPEN
+            if self.state is CircuitState.CLOSED:
+                return True
+            if self.state is CircuitState.HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """Record a successful request, which closes the circuit"""
+        with self.lock:
+            self.failures = 0
+            self.probing = False
+            self.state = CircuitState.CLOSED
+
+    def record_failure(self):
+        """Record a failed request, which opens the circuit once too many failed in a row, or if it was a probe"""
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if self.state is CircuitState.HALF_OPEN or \
+                    (self.state is CircuitState.CLOSED and self.failures >= self.failure_threshold):
+                self.state = CircuitState.OPEN
+                self.opened = time.monotonic()
+                self.trips += 1
+
+
+@dataclass
+class Upstream:
+    """
+    Upstream host, whose requests are rate limited and guarded by a circuit breaker
+
+    Arguments:
+        host (str):                             Host name
+
+    Attributes:
+        limiter (TokenBucket):                  Host's rate limiter
+        breaker (CircuitBreaker):               Host's circuit breaker
+    """
+    host: str
+    limiter: TokenBucket = field(default_factory=TokenBucket)
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+
+    def acquire(self):
+        """
+        Wait for the host's rate limiter to allow a request
+        :exception CircuitOpenError: If the host's circuit is open
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f'Circuit open for {self.host}')
+        self.limiter.acquire()
+
+    def release(self, failed: bool):
+        """
+        Record the outcome of a request
+        :param failed: (bool) Whether the request failed. i.e. Connection error, timeout, throttled or server error.
+        """
+        state = self.breaker.state
+        if failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        if self.breaker.state is not state:
+            logging.warning(f'Circuit for {self.host} is now {self.breaker.state.value.lower()}.')
+
+    def metrics(self) -> dict:
+        """
+        Rate limiter and circuit breaker state
+        :return: metrics: (dict) Host's metrics
+        """
+        return {
+            'state': self.breaker.state.value,
+            'failures': self.breaker.failures,
+            'trips': self.breaker.trips,
+            'rejected': self.breaker.rejected,
+            'throttled': self.limiter.throttled,
+            'waited': round(self.limiter.waited, 3)
+        }
+
+
+_lock = threading.Lock()
+_upstreams: Dict[str, Upstream] = {}
+
+
+def upstream(url: str) -> Upstream:
+    """
+    Shared upstream of the host a URL points to
+    :param url: Request URL
+    :return: upstream: (Upstream) Host's upstream
+    """
+    host = urlparse(url).hostname or ''
+    with _lock:
+        if host not in _upstreams:
+            _upstreams[host] = Upstream(host)
+        return _upstreams[host]
+
+
+def is_failure(status_code: int) -> bool:
+    """
+    Determine if a response means that the host is failing, or throttling requests
+    :param status_code: Response status code
+    :return: is_failure: (bool)
+    """
+    return status_code == 429 or status_code >= 500
+
+
+def upstream_metrics() -> Dict[str, dict]:
+    """
+    Metrics of every upstream host requested so far
+    :return: metrics: (dict) Metrics keyed by host
+    """
+    with _lock:
+        upstreams = list(_upstreams.values())
+    return {item.host: item.metrics() for item in upstreams}
+
+
+def upstream_summary() -> str:
+    """
+    One-line summary of the state of upstream hosts, for logging
+    :return: summary: (str) Upstream hosts summary
+    """
+    hosts = [f'{host} {metrics["state"].lower()} ({metrics["throttled"]} throttled, {metrics["rejected"]} rejected)'
+             for host, metrics in upstream_metrics().items()]
+    return f'Upstream hosts: {", ".join(hosts) or "none"}'
@@ -1,22 +1,32 @@
 """Class with miscellaneous utility functions"""
 import argparse
+import base64
+import gzip
 import json
 import logging
 import operator
 import os
+import time
+from array import array
 from io import BytesIO
-from typing import Tuple, List
+from typing import Tuple, List, Iterator, Dict
 
-import requests
 from PIL import Image, ImageFont, UnidentifiedImageError
-from rgbmatrix import RGBMatrixOptions
 from requests import Timeout, RequestException, ConnectionError
 
 import constants
 from util.color import Color
+from util.image_cache import IMAGE_CACHE
+from util.image_prefetch import ImagePrefetcher
 from util.position import Position
+from util.session import http_session
 from util.retry import retry
 
+try:
+    from rgbmatrix import RGBMatrixOptions
+except ImportError:  # Without the hardware library, only the emulated matrix (--emulator) is available
+    from matrix.emulator import EmulatedMatrixOptions as RGBMatrixOptions
+
 
 def read_json(filename: str) -> dict:
     """
@@ -42,6 +52,59 @@ def write_json(filename: str, data: dict):
         json.dump(data, json_file, indent=4)
 
 
+def read_compressed_json(filename: str) -> dict:
+    """
+    Read from gzip-compressed JSON file and return it as a dictionary
+    :param filename: (str) Compressed JSON file
+    :return: json: (dict) JSON file as a dict, or None if the file is missing or unreadable
+    """
+    if os.path.isfile(filename):
+        try:
+            with gzip.open(filename, 'rt') as json_file:
+                logging.debug(f'Reading compressed JSON file at {filename}')
+                return json.load(json_file)
+        except (OSError, EOFError, ValueError):
+            logging.warning(f'Unable to read file at {filename}')
+            return None
+    logging.debug(f"Couldn't find file at {filename}")
+
+
+def write_compressed_json(filename: str, data: dict):
+    """
+    Write to gzip-compressed JSON file from dictionary. The file is replaced atomically.
+    :param filename: (str) file to write dictionary to
+    :param data: (dict) dictionary to write to file
+    """
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    tmp_filename = f'{filename}.tmp'
+    with gzip.open(tmp_filename, 'wt') as json_file:
+        logging.debug(f'Writing compressed JSON to file at {filename}')
+        json.dump(data, json_file, separators=(',', ':'))
+    os.replace(tmp_filename, filename)
+
+
+def read_watchlist(filename: str) -> List[str]:
+    """
+    Read stock symbols from a watchlist file (i.e. An index's constituents).
+    Symbols are listed one per line, or as the first column of a CSV file. Blank lines, comments (#) and a header row
+    are skipped. Share classes are written as Yahoo Finance does (i.e. BRK.B -> BRK-B).
+    :param filename: (str) Watchlist file
+    :return: symbols: (list) Symbols, in order and without duplicates. Empty if the file could not be read.
+    """
+    try:
+        with open(filename, 'r') as watchlist:
+            lines = watchlist.read().splitlines()
+    except OSError:
+        logging.error(f"Couldn't read watchlist at {filename}")
+        return []
+    symbols = []
+    for line in lines:
+        symbol = line.split(',')[0].strip().strip('"').upper().replace('.', '-')
+        if symbol and not symbol.startswith('#') and symbol not in ('SYMBOL', 'TICKER'):
+            symbols.append(symbol)
+    return list(dict.fromkeys(symbols))
+
+
 def off_screen(canvas_width: int, text_size: int) -> bool:
     """
     Determines if text will go off-screen
@@ -153,28 +216,70 @@ def load_image(filename: str,
     logging.error(f"Couldn't find image {filename}")
 
 
-def load_image_url(url: str, size: Tuple[int, int]) -> Image:
+def load_image_url(url: str, size: Tuple[int, int], images: ImagePrefetcher = None) -> Image:
     """
-    Fetch the stock's company logo.
+    Load an image from its URL, resized to fit the given size.
+    Images are cached on disk once resized. Cached images are used as they are, and revalidated in the background, by
+    the image prefetcher's threads, once they are older than IMAGE_REVALIDATE_AGE.
     :param url: URL to logo image
     :param size: Image size
+    :param images: Image prefetcher to revalidate cached images with. Not revalidated if None.
     :return: image: Image from URL
-    :exception UnidentifiedImageError: If image cannot be opened/identified
     :exception ConnectionError: If connection error occurred
     """
     if url:
-        response = requests.get(url)
-        if response.ok:
-            try:
-                with Image.open(BytesIO(response.content)) as img:
-                    img.thumbnail(size)
-                    return img.convert('RGB')
-            except UnidentifiedImageError:
-                logging.error(f'Could not get image at {url}')
+        image, metadata = IMAGE_CACHE.get(url, size)
+        if image is not None:
+            if images is not None and IMAGE_CACHE.is_stale(metadata):
+                images.revalidate((url, size), revalidate_image, url, size, metadata)
+            return image
+        return fetch_image(url, size)
     else:
         logging.error('No url provided')
 
 
+def fetch_image(url: str, size: Tuple[int, int], metadata: dict = None) -> Image:
+    """
+    Download an image, resize it, and cache it.
+    If the metadata of a cached copy is provided, the request is conditional.
+    :param url: URL to image
+    :param size: Image size
+    :param metadata: Cached image's metadata
+    :return: image: Image from URL, or None if the cached copy is still up-to-date
+    :exception ConnectionError: If connection error occurred
+    """
+    headers = {}
+    if metadata and metadata.get('etag'):
+        headers['If-None-Match'] = metadata['etag']
+    if metadata and metadata.get('last_modified'):
+        headers['If-Modified-Since'] = metadata['last_modified']
+    response = http_session().get(url, headers=headers)
+    if response.status_code == 304:
+        IMAGE_CACHE.validated(url, size, metadata)
+    elif response.ok:
+        try:
+            with Image.open(BytesIO(response.content)) as img:
+                img.thumbnail(size)
+                image = img.convert('RGB')
+            IMAGE_CACHE.put(url, size, image, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return image
+        except UnidentifiedImageError:
+            logging.error(f'Could not get image at {url}')
+
+
+def revalidate_image(url: str, size: Tuple[int, int], metadata: dict):
+    """
+    Revalidate a cached image. An updated image is cached, to be used on next start.
+    :param url: URL to image
+    :param size: Image size
+    :param metadata: Cached image's metadata
+    """
+    try:
+        fetch_image(url, size, metadata)
+    except RequestException as e:
+        logging.warning(f'Unable to revalidate image at {url}: {e}')
+
+
 def build_forex_img(urls: List[str], size: Tuple[int, int]) -> Image:
     """
     Build image with flags of forex pair countries
@@ -182,12 +287,31 @@ def build_forex_img(urls: List[str], size: Tuple[int, int]) -> Image:
     :param size: image size
     :return: image: Image with flag of currency from/to
     """
-    img = Image.new('RGB', size)
+    flag_size = forex_flag_size(size)
+    return combine_flags([load_image_url(url, flag_size) for url in urls], size)
+
+
+def forex_flag_size(size: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Size of each flag in a forex pair image
+    :param size: Forex image size
+    :return: flag_size: Flag size
+    """
     flag_size = round(0.67 * size[0])
-    flag_from = load_image_url(urls[0], (flag_size, flag_size))
-    flag_to = load_image_url(urls[1], (flag_size, flag_size))
+    return flag_size, flag_size
+
 
+def combine_flags(flags: List[Image.Image], size: Tuple[int, int]) -> Image:
+    """
+    Combine the flags of forex pair countries into a single image.
+    The flag of the currency from is placed top-left, and the flag of the currency to bottom-right.
+    :param flags: Flags of currency from/to
+    :param size: image size
+    :return: image: Image with flag of currency from/to
+    """
+    flag_from, flag_to = flags
     if flag_from and flag_to:
+        img = Image.new('RGB', size)
         img.paste(flag_from)
         img.paste(flag_to, tuple(map(operator.sub, size, flag_to.size)))
         return img
@@ -195,21 +319,66 @@ def build_forex_img(urls: List[str], size: Tuple[int, int]) -> Image:
 
 
 @retry((Timeout, ConnectionError), total_tries=3)
-def fetch_exchange_rate(currency_to: str) -> float:
+def fetch_exchange_rates() -> Dict[str, float]:
     """
-    Fetch
-    :param currency_to: (str) Currency to convert to
-    :return: result: (float) Converted amount
+    Fetch the exchange rates from USD to every currency
+    :return: rates: (dict) Exchange rates keyed by currency, or an empty dict if they could not be fetched
     :exception Timeout: If the request timed out
     :exception ConnectionError: If a connection error occurred
-    :exception RequestException: If an ambiguous exception that occurred
     """
     try:
-        response = requests.get(constants.CURRENCY_EXCHANGE_URL).json()
-        return float(response['rates'][currency_to])
-    except RequestException:
+        response = http_session().get(constants.CURRENCY_EXCHANGE_URL).json()
+        return {currency: float(rate) for currency, rate in response['rates'].items()}
+    except (RequestException, KeyError, TypeError, ValueError):
         logging.error('Encountered an unknown error while fetching exchange rates.')
-        return 1
+        return {}
+
+
+def encode_array(values: list, typecode: str) -> str:
+    """
+    Encode a list of numbers as a compact base64 string of packed values
+    :param values: (list) Numbers to encode
+    :param typecode: (str) array typecode to pack values as. i.e. 'f' for 32-bit floats, 'q' for 64-bit integers
+    :return: encoded: (str) Encoded values
+    """
+    return base64.b64encode(array(typecode, values).tobytes()).decode('ascii')
+
+
+def decode_array(encoded: str, typecode: str) -> list:
+    """
+    Decode a list of numbers encoded with encode_array
+    :param encoded: (str) Encoded values
+    :param typecode: (str) array typecode the values were packed as
+    :return: values: (list) Decoded numbers
+    """
+    values = array(typecode)
+    values.frombytes(base64.b64decode(encoded))
+    return values.tolist()
+
+
+def encode_image(image: Image) -> str:
+    """
+    Encode an image as a base64 string of PNG data
+    :param image: (PIL.Image) Image to encode
+    :return: encoded: (str) Encoded image, or None if no image is provided
+    """
+    if image is None:
+        return None
+    buffer = BytesIO()
+    image.save(buffer, format='PNG')
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def decode_image(encoded: str) -> Image:
+    """
+    Decode an image encoded with encode_image
+    :param encoded: (str) Encoded image
+    :return: image: (PIL.Image) Decoded RGB image, or None if no image is provided
+    """
+    if encoded is None:
+        return None
+    with Image.open(BytesIO(base64.b64decode(encoded))) as image:
+        return image.convert('RGB')
 
 
 def convert_currency(exchange_rate: float, amount: float) -> float:
@@ -225,6 +394,26 @@ def convert_currency(exchange_rate: float, amount: float) -> float:
         return 0.0
 
 
+def chunks(lst: list, size: int) -> Iterator[list]:
+    """
+    Split a list into consecutive chunks of at most the given size
+    :param lst: (list) List to split
+    :param size: (int) Maximum chunk size
+    :return: chunks: (Iterator[list]) Chunks of the list, in order
+    """
+    for i in range(0, len(lst), size):
+        yield lst[i:i + size]
+
+
+def expired(deadline: float) -> bool:
+    """
+    Determine if a deadline has passed
+    :param deadline: (float) Deadline (monotonic). None if there is none.
+    :return: expired: (bool)
+    """
+    return deadline is not None and time.monotonic() >= deadline
+
+
 def args() -> argparse.Namespace:
     """
     CLI argument parser to configure matrix.
@@ -342,6 +531,29 @@ def args() -> argparse.Namespace:
                         help='Switch if your matrix has led colors swapped. (Default: RGB)',
                         type=str,
                         default='RGB')
+    parser.add_argument('--record',
+                        action='store',
+                        help='Record market data responses to this file, to be replayed with --replay.',
+                        type=str,
+                        default=None)
+    parser.add_argument('--replay',
+                        action='store',
+                        help='Replay market data responses recorded to this file, instead of fetching them.',
+                        type=str,
+                        default=None)
+    parser.add_argument('--replay-latency',
+                        action='store',
+                        help='Time each replayed request takes (in seconds). (Default: 0)',
+                        type=float,
+                        default=0.0)
+    parser.add_argument('--emulator',
+                        action='store_true',
+                        help='Render to an emulated matrix in memory, instead of the LED matrix.')
+    parser.add_argument('--emulator-dump',
+                        action='store',
+                        help='Save each frame rendered to the emulated matrix to this directory, as PNG images.',
+                        type=str,
+                        default=None)
 
     return parser.parse_args()
 